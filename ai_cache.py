@@ -0,0 +1,223 @@
+"""
+File: ai_cache.py
+Description:
+    Two-tier cache for AI generated content. An in-memory LRU answers
+    repeat requests within a worker; a SQLite table shares results
+    between workers and restarts. Entries expire after a TTL, the table
+    is trimmed to a maximum row count, and every entry records which
+    assignments it was built from so editing an assignment drops them.
+    Writes are upserts, so workers caching the same prompt at once on a
+    server database don't collide on the primary key.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import Column, Float, Index, Integer, String, Table, Text, delete, func, insert, select
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+
+class PromptCache:
+    """
+    Prompt/response cache keyed on a hash of the normalized inputs.
+
+    Args:
+        metadata (MetaData): Metadata the cache tables are registered on
+        get_engine (callable): Returns the engine to use (called per operation)
+        ttl (float): Seconds an entry stays valid
+        memory_items (int): Entries kept in the in-process LRU
+        max_rows (int): Entries kept in the database table
+        on_lookup (callable): Called with True/False for every hit/miss
+    """
+
+    def __init__(self, metadata, get_engine, ttl=21600, memory_items=256, max_rows=5000, clock=time.time,
+                 on_lookup=None):
+        self.get_engine = get_engine
+        self.on_lookup = on_lookup
+        self.ttl = ttl
+        self.memory_items = memory_items
+        self.max_rows = max_rows
+        self.enabled = True
+        self._clock = clock
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._counts = {"memory_hits": 0, "db_hits": 0, "misses": 0, "evictions": 0}
+
+        self.entries = Table(
+            "ai_response_cache", metadata,
+            Column("key", String(64), primary_key=True),
+            Column("value", Text, nullable=False),
+            Column("created_at", Float, nullable=False, index=True),
+            Column("expires_at", Float, nullable=False, index=True),
+        )
+        self.refs = Table(
+            "ai_response_cache_ref", metadata,
+            Column("key", String(64), primary_key=True),
+            Column("assignment_id", Integer, primary_key=True),
+            Index("ix_ai_response_cache_ref_assignment", "assignment_id"),
+        )
+
+    @staticmethod
+    def make_key(kind, inputs, model, params):
+        """
+        Hashes everything that affects the generated text.
+
+        Args:
+            kind (str): What is being generated (study_plan, summary)
+            inputs: JSON-serializable prompt inputs (ids, titles, dates, ...)
+            model (str): Model identifier
+            params (dict): Generation parameters
+        """
+        normalized = json.dumps(
+            {"kind": kind, "inputs": inputs, "model": model, "params": params},
+            sort_keys=True, separators=(",", ":"), default=str
+        )
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """
+        Returns the cached value or None.
+        """
+        if not self.enabled:
+            return None
+        now = self._clock()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and entry[1] > now:
+                self._memory.move_to_end(key)
+                self._counts["memory_hits"] += 1
+                value = entry[0]
+            else:
+                value = None
+                self._memory.pop(key, None)
+        if value is not None:
+            self._lookup(True)
+            return value
+
+        with self.get_engine().connect() as connection:
+            row = connection.execute(
+                select(self.entries.c.value, self.entries.c.expires_at).where(
+                    self.entries.c.key == key, self.entries.c.expires_at > now
+                )
+            ).first()
+
+        with self._lock:
+            if row is None:
+                self._counts["misses"] += 1
+            else:
+                self._counts["db_hits"] += 1
+                self._remember(key, row.value, row.expires_at)
+        self._lookup(row is not None)
+        return row.value if row is not None else None
+
+    def set(self, key, value, assignment_ids=()):
+        """
+        Stores a value and the assignments it depends on.
+        """
+        if not self.enabled:
+            return
+        now = self._clock()
+        expires_at = now + self.ttl
+        with self._lock:
+            self._remember(key, value, expires_at)
+
+        with self.get_engine().begin() as connection:
+            connection.execute(delete(self.refs).where(self.refs.c.key == key))
+            _upsert(connection, self.entries, [{"key": key, "value": value, "created_at": now, "expires_at": expires_at}],
+                    update=("value", "created_at", "expires_at"))
+            if assignment_ids:
+                _upsert(connection, self.refs, [
+                    {"key": key, "assignment_id": assignment_id} for assignment_id in set(assignment_ids)
+                ])
+            self._evict(connection, now)
+
+    def invalidate_assignment(self, assignment_id):
+        """
+        Drops every entry built from the given assignment.
+        """
+        with self.get_engine().begin() as connection:
+            keys = connection.execute(
+                select(self.refs.c.key).where(self.refs.c.assignment_id == assignment_id)
+            ).scalars().all()
+            if keys:
+                self._delete_keys(connection, keys)
+        with self._lock:
+            for key in keys:
+                self._memory.pop(key, None)
+        return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        with self.get_engine().begin() as connection:
+            connection.execute(delete(self.refs))
+            connection.execute(delete(self.entries))
+
+    def stats(self):
+        """
+        Returns hit/miss counters and the hit ratio for sizing the cache.
+        """
+        with self._lock:
+            counts = dict(self._counts)
+            counts["memory_items"] = len(self._memory)
+        lookups = counts["memory_hits"] + counts["db_hits"] + counts["misses"]
+        counts["hit_ratio"] = round((counts["memory_hits"] + counts["db_hits"]) / lookups, 4) if lookups else 0.0
+        return counts
+
+    def _lookup(self, hit):
+        if self.on_lookup is not None:
+            self.on_lookup(hit)
+
+    def _remember(self, key, value, expires_at):
+        # caller holds the lock
+        self._memory[key] = (value, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _evict(self, connection, now):
+        expired = connection.execute(
+            select(self.entries.c.key).where(self.entries.c.expires_at <= now)
+        ).scalars().all()
+        overflow = connection.execute(select(func.count()).select_from(self.entries)).scalar() - len(expired) - self.max_rows
+        if overflow > 0:
+            expired += connection.execute(
+                select(self.entries.c.key).where(self.entries.c.expires_at > now)
+                .order_by(self.entries.c.created_at.asc()).limit(overflow)
+            ).scalars().all()
+        if expired:
+            self._delete_keys(connection, expired)
+            with self._lock:
+                self._counts["evictions"] += len(expired)
+
+    def _delete_keys(self, connection, keys):
+        connection.execute(delete(self.refs).where(self.refs.c.key.in_(keys)))
+        connection.execute(delete(self.entries).where(self.entries.c.key.in_(keys)))
+
+
+def _upsert(connection, table, rows, update=()):
+    """
+    Inserts rows, replacing the update columns of (or, with none, keeping)
+    a row whose primary key already exists.
+    """
+    primary_key = [column.name for column in table.primary_key]
+    dialect = connection.dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        statement = (sqlite if dialect == "sqlite" else postgresql).insert(table)
+        if update:
+            statement = statement.on_conflict_do_update(
+                index_elements=primary_key, set_={name: statement.excluded[name] for name in update})
+        else:
+            statement = statement.on_conflict_do_nothing(index_elements=primary_key)
+    elif dialect in ("mysql", "mariadb"):
+        statement = mysql.insert(table)
+        # assigning a key column to itself is MySQL's way to ignore the duplicate
+        statement = statement.on_duplicate_key_update(
+            {name: statement.inserted[name] for name in update or primary_key[:1]})
+    else:
+        connection.execute(delete(table).where(table.c[primary_key[0]].in_([row[primary_key[0]] for row in rows])))
+        statement = insert(table)
+    connection.execute(statement, rows)
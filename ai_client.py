@@ -0,0 +1,258 @@
+"""
+File: ai_client.py
+Description:
+    Pooled, resilient HTTP client for the Hugging Face inference API.
+    One shared requests.Session keeps connections alive between calls,
+    transient upstream errors (503 "model loading", 429, timeouts) are
+    retried with jittered exponential backoff, and a circuit breaker
+    stops calling the upstream while it is unhealthy so callers can go
+    straight to their fallback.
+
+    requests (with urllib3) is imported when the first InferenceClient
+    is built, not with this module, because it is a large share of the
+    app's startup and many workers never call the model.
+"""
+
+import json
+import random
+import threading
+import time
+
+# upstream responses worth retrying
+RETRY_STATUSES = (429, 502, 503, 504)
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of calling the upstream while the breaker is open.
+    """
+
+
+class UpstreamError(Exception):
+    """
+    Raised when the upstream keeps failing after all retries.
+    """
+
+
+class CircuitBreaker:
+    """
+    Opens after consecutive failures and lets one trial call through
+    once reset_timeout seconds have passed (half-open).
+
+    Args:
+        failure_threshold (int): Consecutive failures that open the breaker
+        reset_timeout (float): Seconds to stay open before a trial call
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self.opened_total = 0
+        self.rejected_total = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def allow_request(self):
+        """
+        Returns True if a call may go to the upstream right now.
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self.rejected_total += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._state = "closed"
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                if self._state != "open":
+                    self.opened_total += 1
+                self._state = "open"
+                self._opened_at = self._clock()
+            self._trial_in_flight = False
+
+    def _current_state(self):
+        if self._state == "open" and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = "half_open"
+        return self._state
+
+
+class InferenceClient:
+    """
+    Thread-safe client for one inference endpoint.
+
+    Args:
+        url (str): Model endpoint URL
+        token (str): API token sent as a bearer token
+        connect_timeout (float): Seconds to wait for a connection
+        read_timeout (float): Seconds to wait for the response
+        max_retries (int): Extra attempts for retryable failures
+        backoff (float): Base delay in seconds for the retry backoff
+        max_backoff (float): Upper bound for a single retry delay
+        pool_size (int): Keep-alive connections kept per host
+        breaker (CircuitBreaker): Shared breaker (a default one is created)
+    """
+
+    def __init__(self, url, token="", connect_timeout=3.05, read_timeout=30.0, max_retries=2,
+                 backoff=0.5, max_backoff=8.0, pool_size=10, breaker=None):
+        self.url = url
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.breaker = breaker or CircuitBreaker()
+
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self._connection_errors = (requests.ConnectionError, requests.Timeout)
+        self._http_error = requests.HTTPError
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+
+        self._lock = threading.Lock()
+        self.requests_total = 0
+        self.retries_total = 0
+        self.failures_total = 0
+
+    def post(self, payload, timeout=None):
+        """
+        Sends a JSON payload and returns the decoded JSON response.
+
+        Args:
+            payload (dict): Request body
+            timeout (float): Read timeout for this call (defaults to read_timeout)
+
+        Raises:
+            CircuitOpenError: If the breaker is open
+            UpstreamError: If every attempt failed with a retryable error
+            requests.HTTPError: For non-retryable error responses
+        """
+        self._enter_breaker()
+        try:
+            result = self._send(payload, timeout).json()
+        except BaseException as e:
+            self._record_outcome(e)
+            raise
+        self.breaker.record_success()
+        return result
+
+    def stream(self, payload, timeout=None):
+        """
+        Sends a streaming request and yields generated text as it arrives.
+
+        The endpoint answers with server-sent events whose data is JSON
+        like {"token": {"text": "...", "special": false}}. Retries only
+        happen before the first byte; errors mid-stream are raised.
+
+        Raises:
+            CircuitOpenError: If the breaker is open
+            UpstreamError: If every attempt failed with a retryable error
+        """
+        self._enter_breaker()
+        try:
+            response = self._send(dict(payload, stream=True), timeout, stream=True)
+            with response:
+                for line in response.iter_lines(decode_unicode=True):
+                    if not line or not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    token = json.loads(data).get("token") or {}
+                    if token.get("text") and not token.get("special"):
+                        yield token["text"]
+        except BaseException as e:
+            self._record_outcome(e)
+            raise
+        self.breaker.record_success()
+
+    def metrics(self):
+        """
+        Returns counters and breaker state for monitoring.
+        """
+        with self._lock:
+            counters = {
+                "requests_total": self.requests_total,
+                "retries_total": self.retries_total,
+                "failures_total": self.failures_total,
+            }
+        counters.update({
+            "breaker_state": self.breaker.state,
+            "breaker_opened_total": self.breaker.opened_total,
+            "breaker_rejected_total": self.breaker.rejected_total,
+        })
+        return counters
+
+    def _enter_breaker(self):
+        if not self.breaker.allow_request():
+            raise CircuitOpenError("inference upstream is unavailable")
+
+    def _record_outcome(self, error):
+        # every call let through must close or fail the breaker, or a
+        # half-open trial that raised would block all later calls
+        if isinstance(error, (self._http_error, GeneratorExit)):
+            # a bad request is our problem, and a reader that stops early
+            # is not a sign the upstream is down
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+
+    def _send(self, payload, timeout=None, stream=False):
+        # the caller has passed the breaker and records the call's outcome
+        timeouts = (self.connect_timeout, timeout or self.read_timeout)
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self._count("retries_total")
+                time.sleep(self._retry_delay(attempt))
+            self._count("requests_total")
+            try:
+                response = self.session.post(self.url, json=payload, timeout=timeouts, stream=stream)
+            except self._connection_errors as e:
+                last_error = e
+                continue
+
+            if response.status_code in RETRY_STATUSES:
+                response.close()
+                last_error = UpstreamError(f"upstream returned {response.status_code}")
+                continue
+            if response.status_code >= 400:
+                response.raise_for_status()
+            return response
+
+        self._count("failures_total")
+        raise UpstreamError(str(last_error)) from last_error
+
+    def _retry_delay(self, attempt):
+        # full jitter: anywhere between 0 and the exponential backoff
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
@@ -1,12 +1,37 @@
 # imports
-from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify
+from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify, abort, Response, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
-from werkzeug.security import generate_password_hash, check_password_hash
+from markupsafe import escape
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import load_only, undefer
 from datetime import datetime, timedelta
 import os
+import re
+import json
+import csv
+import hashlib
+import hmac
+import io
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-import requests
+import migrations
+from ai_client import InferenceClient, CircuitBreaker, CircuitOpenError
+from ai_cache import PromptCache
+from markdown_renderer import MarkdownRenderer, render_markdown, html_excerpt, EXCERPT_LENGTH
+from jobs import JobQueue, QueueFullError
+from identity_cache import IdentityCache
+from passwords import PasswordHasher
+from db_config import load_database_config, install_sqlite_pragmas
+import assignment_io
+from fragment_cache import FragmentCache, make_backend as make_fragment_backend
+from request_metrics import MetricsRegistry
+from query_budget import QueryTracker
+from static_assets import StaticAssets, build as build_static_assets
+from response_compression import ResponseCompressor, DEFAULT_MIMETYPES as COMPRESSIBLE_MIMETYPES
 
 # load environment variables from .env file
 load_dotenv()
@@ -14,12 +39,89 @@ load_dotenv()
 # initialize Flask app
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///study_assistant.db'
+# DATABASE_URL, pool sizes and SQLite tuning come from the environment (see db_config.py)
+load_database_config(app.config, 'sqlite:///study_assistant.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# how often (seconds) a user's past-due assignments get flagged as overdue
+app.config['OVERDUE_SWEEP_INTERVAL'] = int(os.getenv('OVERDUE_SWEEP_INTERVAL', '60'))
+# list sizes for the assignments page and the dashboard's upcoming list
+app.config['ASSIGNMENTS_PER_PAGE'] = int(os.getenv('ASSIGNMENTS_PER_PAGE', '25'))
+app.config['DASHBOARD_UPCOMING_LIMIT'] = 10
+# background workers for AI generation (JOB_QUEUE_EAGER runs jobs inline)
+app.config['JOB_WORKERS'] = int(os.getenv('JOB_WORKERS', '4'))
+app.config['JOB_QUEUE_SIZE'] = int(os.getenv('JOB_QUEUE_SIZE', '100'))
+app.config['JOB_QUEUE_EAGER'] = os.getenv('JOB_QUEUE_EAGER', '') == '1'
+# jobs still queued/running after this many seconds were lost (e.g. a restart)
+app.config['JOB_STALE_AFTER'] = int(os.getenv('JOB_STALE_AFTER', '300'))
+# password hashing cost; existing hashes are upgraded at login when these change
+app.config['PASSWORD_HASH_METHOD'] = os.getenv('PASSWORD_HASH_METHOD', 'scrypt')
+app.config['PASSWORD_SALT_LENGTH'] = int(os.getenv('PASSWORD_SALT_LENGTH', '16'))
+# worker processes for password hashing (0 hashes on the request thread)
+app.config['PASSWORD_HASH_WORKERS'] = int(os.getenv('PASSWORD_HASH_WORKERS', '0'))
+# seconds a logged-in user's row is reused between requests (0 disables)
+app.config['USER_CACHE_TTL'] = int(os.getenv('USER_CACHE_TTL', '30'))
+# rendered page fragments: "memory" (per process), "disk" (shared by workers on a host) or "none"
+app.config['FRAGMENT_CACHE'] = os.getenv('FRAGMENT_CACHE', 'memory')
+app.config['FRAGMENT_CACHE_DIR'] = os.getenv('FRAGMENT_CACHE_DIR') or os.path.join(app.instance_path, 'fragments')
+app.config['FRAGMENT_CACHE_MAX_BYTES'] = int(os.getenv('FRAGMENT_CACHE_MAX_BYTES', str(32 * 1024 * 1024)))
+app.config['FRAGMENT_CACHE_TTL'] = int(os.getenv('FRAGMENT_CACHE_TTL', '3600'))
+# rows per INSERT batch for assignment imports, and rows fetched per round trip on export
+app.config['IMPORT_BATCH_SIZE'] = int(os.getenv('IMPORT_BATCH_SIZE', '500'))
+app.config['EXPORT_FETCH_SIZE'] = int(os.getenv('EXPORT_FETCH_SIZE', '500'))
+# bulk study plan API for advisors (disabled unless BATCH_API_TOKEN is set)
+app.config['BATCH_API_TOKEN'] = os.getenv('BATCH_API_TOKEN', '')
+app.config['BATCH_MAX_WORKERS'] = int(os.getenv('BATCH_MAX_WORKERS', '8'))
+app.config['BATCH_MAX_ITEMS'] = int(os.getenv('BATCH_MAX_ITEMS', '500'))
+# per-request timing, SQL and cache metrics served at /metrics
+app.config['METRICS_ENABLED'] = os.getenv('METRICS_ENABLED', '1') == '1'
+# share of requests run under cProfile; profiles are kept only for requests slower than the threshold
+app.config['PROFILE_SAMPLE_RATE'] = float(os.getenv('PROFILE_SAMPLE_RATE', '0'))
+app.config['PROFILE_THRESHOLD_MS'] = float(os.getenv('PROFILE_THRESHOLD_MS', '500'))
+app.config['PROFILE_DIR'] = os.getenv('PROFILE_DIR') or os.path.join(app.instance_path, 'profiles')
+# views over their query budget: "raise", "log" or "off" (default: raise when testing or debugging, else off)
+app.config['QUERY_BUDGET_MODE'] = os.getenv('QUERY_BUDGET_MODE', '')
+# cache lifetime (seconds) of fingerprinted static files built by: flask --app wsgi build-assets
+app.config['STATIC_MAX_AGE'] = int(os.getenv('STATIC_MAX_AGE', str(365 * 24 * 3600)))
+# gzip/brotli for dynamic responses (turn off when a proxy in front already compresses)
+app.config['COMPRESS_RESPONSES'] = os.getenv('COMPRESS_RESPONSES', '1') == '1'
+app.config['COMPRESS_MIN_SIZE'] = int(os.getenv('COMPRESS_MIN_SIZE', '500'))
+app.config['COMPRESS_MIMETYPES'] = os.getenv('COMPRESS_MIMETYPES', ','.join(COMPRESSIBLE_MIMETYPES)).split(',')
+app.config['COMPRESS_LEVEL'] = int(os.getenv('COMPRESS_LEVEL', '6'))
 
 # setup database
 db = SQLAlchemy(app)
 
+# request metrics (see request_metrics.py); SQL is counted through engine events
+metrics_registry = MetricsRegistry(
+    profile_sample_rate=app.config['PROFILE_SAMPLE_RATE'],
+    profile_threshold_ms=app.config['PROFILE_THRESHOLD_MS'],
+    profile_dir=app.config['PROFILE_DIR']
+)
+
+# per-view query budgets (see query_budget.py); @query_budget(n) goes under @app.route
+query_tracker = QueryTracker(
+    mode=lambda: app.config['QUERY_BUDGET_MODE'] or ('raise' if app.testing or app.debug else 'off')
+)
+query_budget = query_tracker.limit
+
+# url_for('static', ...) points at the fingerprinted build when there is one (see static_assets.py)
+static_assets = StaticAssets(app, max_age=app.config['STATIC_MAX_AGE'])
+
+# compresses HTML/JSON/CSV/SSE responses; streamed bodies are flushed chunk by chunk (see response_compression.py)
+response_compressor = ResponseCompressor(
+    min_size=app.config['COMPRESS_MIN_SIZE'],
+    mimetypes=app.config['COMPRESS_MIMETYPES'],
+    level=app.config['COMPRESS_LEVEL']
+)
+if app.config['COMPRESS_RESPONSES']:
+    response_compressor.init_app(app)
+
+with app.app_context():
+    install_sqlite_pragmas(db.engine, app.config['SQLITE_PRAGMAS'])
+    if app.config['METRICS_ENABLED']:
+        metrics_registry.install_sql_hooks(db.engine)
+    query_tracker.install(db.engine)
+
 # setup login manager for user authentication
 login_manager = LoginManager()
 login_manager.init_app(app)
@@ -27,8 +129,19 @@ login_manager.login_view = 'login'
 login_manager.login_message = 'Please log in to access this page.'
 
 # Hugging Face API setup for AI features
+# AI_BACKEND=stub uses a local stand-in model so AI pages work offline
+app.config['AI_BACKEND'] = os.getenv('AI_BACKEND', 'huggingface')
+# AI_STREAMING=1 streams generated text to the result page as it arrives
+app.config['AI_STREAMING'] = os.getenv('AI_STREAMING', '') == '1'
 HF_API_TOKEN = os.getenv('HUGGINGFACE_API_TOKEN', '')
-HF_API_URL = "https://api-inference.huggingface.co/models/mistralai/Mistral-7B-Instruct-v0.2"
+HF_API_URL = os.getenv('HUGGINGFACE_API_URL', "https://api-inference.huggingface.co/models/mistralai/Mistral-7B-Instruct-v0.2")
+
+# shared keep-alive client with retries and a circuit breaker, built by get_ai_client()
+# on the first model call (loading the HTTP stack slows every worker's startup otherwise)
+_ai_client = None
+_ai_client_lock = threading.Lock()
+# sampling parameters sent with every generation request
+HF_GENERATION_PARAMS = {"temperature": 0.7, "top_p": 0.95, "do_sample": True}
 
 # Database Models - tables for storing data
 
@@ -38,6 +151,8 @@ class User(UserMixin, db.Model):
     username = db.Column(db.String(80), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
     password_hash = db.Column(db.String(200), nullable=False)  # hashed password for security
+    # bumped whenever the user's assignments or study plans change (used for ETags)
+    data_version = db.Column(db.Integer, nullable=False, default=0)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     # relationships to other tables
     assignments = db.relationship('Assignment', backref='user', lazy=True, cascade='all, delete-orphan')
@@ -54,24 +169,148 @@ class Assignment(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)  # links to user
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # indexes matching the per-user list, filter and overdue queries
+    __table_args__ = (
+        db.Index('ix_assignment_user_due', 'user_id', 'due_date'),
+        db.Index('ix_assignment_user_status_due', 'user_id', 'status', 'due_date'),
+        db.Index('ix_assignment_user_priority_due', 'user_id', 'priority', 'due_date'),
+    )
+
+# StudyPlan <-> Assignment links (indexed both ways: by plan via the key, by assignment via the index)
+study_plan_assignment = db.Table(
+    'study_plan_assignment',
+    db.Column('study_plan_id', db.Integer, db.ForeignKey('study_plan.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('assignment_id', db.Integer, db.ForeignKey('assignment.id', ondelete='CASCADE'), primary_key=True),
+    db.Index('ix_study_plan_assignment_assignment', 'assignment_id')
+)
 
 # StudyPlan table - stores AI-generated study plans
 class StudyPlan(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    content = db.Column(db.Text, nullable=False)  # the actual study plan text
-    assignment_ids = db.Column(db.String(500), nullable=True)  # which assignments are in this plan
+    # the actual study plan HTML - deferred so listings only load it when asked
+    content = db.deferred(db.Column(db.Text, nullable=False))
+    # plain-text preview for listings, kept in sync with content on write
+    excerpt = db.Column(db.String(EXCERPT_LENGTH + 3), nullable=False, default='')
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # set when an assignment in the plan changes; cleared when the plan is refreshed
+    is_stale = db.Column(db.Boolean, nullable=False, default=False)
+    # which assignments are in this plan
+    assignments = db.relationship('Assignment', secondary=study_plan_assignment, order_by='Assignment.due_date')
+    
+    @db.validates('content')
+    def update_excerpt(self, key, content):
+        self.excerpt = html_excerpt(content)
+        return content
+    # recent plans are listed per user, newest first
+    __table_args__ = (
+        db.Index('ix_study_plan_user_created', 'user_id', 'created_at'),
+    )
+
+# AI response cache - in-memory LRU backed by the ai_response_cache table
+ai_cache = PromptCache(
+    db.metadata,
+    lambda: db.engine,
+    ttl=int(os.getenv('AI_CACHE_TTL', '21600')),
+    memory_items=int(os.getenv('AI_CACHE_MEMORY_ITEMS', '256')),
+    max_rows=int(os.getenv('AI_CACHE_MAX_ROWS', '5000')),
+    on_lookup=metrics_registry.cache_listener('ai')
+)
+ai_cache.enabled = os.getenv('AI_CACHE_ENABLED', '1') == '1'
+
+# GenerationJob table - tracks background AI generation requests
+class GenerationJob(db.Model):
+    id = db.Column(db.String(32), primary_key=True, default=lambda: uuid.uuid4().hex)
+    kind = db.Column(db.String(20), nullable=False)  # can be: study_plan, summary
+    status = db.Column(db.String(20), default='queued')  # can be: queued, running, finished, failed
+    params = db.Column(db.Text, nullable=False)  # JSON inputs for the generator
+    result = db.Column(db.Text, nullable=True)  # generated summary HTML
+    error = db.Column(db.String(500), nullable=True)
+    study_plan_id = db.Column(db.Integer, db.ForeignKey('study_plan.id'), nullable=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+# worker pool that runs the generation jobs
+job_queue = JobQueue(
+    max_workers=app.config['JOB_WORKERS'],
+    max_pending=app.config['JOB_QUEUE_SIZE'],
+    eager=app.config['JOB_QUEUE_EAGER']
+)
+
+# hashes passwords for login and registration (optionally on a process pool)
+password_hasher = PasswordHasher(
+    method=app.config['PASSWORD_HASH_METHOD'],
+    salt_length=app.config['PASSWORD_SALT_LENGTH'],
+    pool_size=app.config['PASSWORD_HASH_WORKERS']
+)
+
+# rendered dashboard/progress fragments per user and data version
+fragment_cache = FragmentCache(make_fragment_backend(
+    app.config['FRAGMENT_CACHE'],
+    directory=app.config['FRAGMENT_CACHE_DIR'],
+    max_bytes=app.config['FRAGMENT_CACHE_MAX_BYTES'],
+    ttl=app.config['FRAGMENT_CACHE_TTL']
+), on_lookup=metrics_registry.cache_listener('fragment'))
+
+# recently loaded users, so authenticated requests skip the user SELECT
+user_cache = IdentityCache(ttl=app.config['USER_CACHE_TTL'], on_lookup=metrics_registry.cache_listener('user'))
+
+# drop a cached user as soon as this process changes or deletes the row
+@db.event.listens_for(User, 'after_update')
+@db.event.listens_for(User, 'after_delete')
+def invalidate_cached_user(mapper, connection, target):
+    user_cache.invalidate(target.id)
 
 # this is required by Flask-Login to load users
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    user = user_cache.get(int(user_id), load_detached_user)
+    # attach a copy to this request's session without querying (the cached one stays detached)
+    return db.session.merge(user, load=False) if user else None
+
+# cache miss: read the user row and detach it so it can outlive the request
+def load_detached_user(user_id):
+    user = db.session.get(User, user_id)
+    if user is not None:
+        db.session.expunge(user)
+    return user
+
+# Request Instrumentation - timing, SQL and cache counts per endpoint for /metrics
+
+@app.before_request
+def start_request_metrics():
+    if app.config['METRICS_ENABLED']:
+        metrics_registry.start_request()
+
+@app.after_request
+def record_response_status(response):
+    stats = metrics_registry.current()
+    if stats is not None:
+        stats.status = response.status_code
+    return response
+
+# runs once the response is sent (after the last chunk for streamed responses)
+@app.teardown_request
+def finish_request_metrics(exc):
+    metrics_registry.finish_request(request.endpoint or 'unmatched', request.method)
+
+# sizes and upstream state, read when /metrics is scraped
+metrics_registry.add_gauge('cache_items', 'Entries held per cache.', ('cache',), lambda: {
+    ('fragment',): fragment_cache.stats().get('items', 0),
+    ('user',): user_cache.stats()['items'],
+    ('ai',): ai_cache.stats()['memory_items']
+})
+metrics_registry.add_gauge('ai_circuit_open', 'Whether calls to the AI upstream are being refused.', (), lambda: {
+    (): int(ai_client_metrics()['breaker_state'] != 'closed')
+})
 
 # Routes - these handle different pages/URLs
 
 # home page
 @app.route('/')
+@query_budget(1)
 def index():
     # if already logged in, go straight to dashboard
     if current_user.is_authenticated:
@@ -80,6 +319,7 @@ def index():
 
 # registration page
 @app.route('/register', methods=['GET', 'POST'])
+@query_budget(3)
 def register():
     if current_user.is_authenticated:
         return redirect(url_for('dashboard'))
@@ -114,7 +354,7 @@ def register():
         new_user = User(
             username=username,
             email=email,
-            password_hash=generate_password_hash(password)  # hash password for security
+            password_hash=password_hasher.hash(password)  # hash password for security
         )
         db.session.add(new_user)
         db.session.commit()
@@ -126,6 +366,7 @@ def register():
 
 # login page
 @app.route('/login', methods=['GET', 'POST'])
+@query_budget(3)
 def login():
     if current_user.is_authenticated:
         return redirect(url_for('dashboard'))
@@ -143,7 +384,11 @@ def login():
         user = User.query.filter_by(username=username).first()
         
         # check if user exists and password matches
-        if user and check_password_hash(user.password_hash, password):
+        if user and password_hasher.verify(user.password_hash, password):
+            # upgrade hashes made with older cost settings while we know the password
+            if password_hasher.needs_rehash(user.password_hash):
+                user.password_hash = password_hasher.hash(password)
+                db.session.commit()
             login_user(user)
             flash('Login successful!', 'success')
             # redirect to where they were trying to go, or dashboard
@@ -156,6 +401,7 @@ def login():
 
 # logout
 @app.route('/logout')
+@query_budget(1)
 @login_required
 def logout():
     logout_user()
@@ -164,57 +410,72 @@ def logout():
 
 # main dashboard page
 @app.route('/dashboard')
+@query_budget(8)
 @login_required
 def dashboard():
-    # get all assignments for logged in user
-    assignments = Assignment.query.filter_by(user_id=current_user.id).order_by(Assignment.due_date.asc()).all()
+    # flag overdue assignments (a single UPDATE, at most once per interval)
+    sweep_overdue_if_due(current_user.id)
     
-    # check if any assignments are overdue and update them
-    for assignment in assignments:
-        if assignment.status != 'completed' and assignment.due_date < datetime.now():
-            assignment.status = 'overdue'
-    db.session.commit()
-    
-    # calculate some stats to display
-    total_assignments = len(assignments)
-    completed_assignments = len([a for a in assignments if a.status == 'completed'])
-    pending_assignments = len([a for a in assignments if a.status == 'pending'])
-    overdue_assignments = len([a for a in assignments if a.status == 'overdue'])
+    # "days left" depends on the clock, so the key also changes every hour
+    now = datetime.now()
+    key = fragment_cache_key('dashboard', current_user.id, now.strftime('%Y%m%d%H'))
+    content = fragment_cache.get_or_render(key, lambda: render_dashboard_content(current_user.id, now))
     
-    return render_template('dashboard.html', 
-                         assignments=assignments,
-                         total=total_assignments,
-                         completed=completed_assignments,
-                         pending=pending_assignments,
-                         overdue=overdue_assignments,
-                         now=datetime.now())
+    return render_template('dashboard.html', content=content, now=now)
 
 # assignments page - shows all assignments with filtering
 @app.route('/assignments')
+@query_budget(2)
 @login_required
 def assignments():
     priority_filter = request.args.get('priority', 'all')
     status_filter = request.args.get('status', 'all')
     
-    query = Assignment.query.filter_by(user_id=current_user.id)
-    
-    # apply filters if selected
-    if priority_filter != 'all':
-        query = query.filter_by(priority=priority_filter)
-    
-    if status_filter != 'all':
-        query = query.filter_by(status=status_filter)
+    query = filter_assignments(current_user.id, priority_filter, status_filter)
     
-    assignments = query.order_by(Assignment.due_date.asc()).all()
+    # one page at a time, continuing after the cursor's (due_date, id)
+    cursor = request.args.get('after')
+    assignments, next_cursor = paginate_assignments(query, cursor, app.config['ASSIGNMENTS_PER_PAGE'])
     
     return render_template('assignments.html', 
                          assignments=assignments,
                          priority_filter=priority_filter,
                          status_filter=status_filter,
+                         next_cursor=next_cursor,
+                         is_first_page=not cursor,
                          now=datetime.now())
 
+# JSON version of the assignments page; unchanged polls get a 304 after one version lookup
+@app.route('/api/assignments')
+@query_budget(3)
+def api_assignments():
+    if not current_user.is_authenticated:
+        return jsonify({'error': 'Authentication required'}), 401
+    
+    # the ETag covers the user's data version and everything that shapes the response
+    version = get_data_version(current_user.id)
+    etag = make_data_etag(current_user.id, version, sorted(request.args.items(multi=True)))
+    # compressed responses carry the tag with their encoding appended
+    if any(request.if_none_match.contains_weak(tag) for tag in response_compressor.etag_variants(etag)):
+        response = Response(status=304)
+    else:
+        per_page = min(request.args.get('per_page', app.config['ASSIGNMENTS_PER_PAGE'], type=int) or 1, 100)
+        query = filter_assignments(current_user.id, request.args.get('priority', 'all'), request.args.get('status', 'all'))
+        page, next_cursor = paginate_assignments(query, request.args.get('after'), max(per_page, 1))
+        response = jsonify({
+            'assignments': [assignment_to_dict(a) for a in page],
+            'next_cursor': next_cursor,
+            'version': version
+        })
+    
+    response.set_etag(etag)
+    # clients must revalidate, but may keep the body
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
 # add new assignment
 @app.route('/assignment/add', methods=['GET', 'POST'])
+@query_budget(3)
 @login_required
 def add_assignment():
     if request.method == 'POST':
@@ -248,15 +509,63 @@ def add_assignment():
             user_id=current_user.id
         )
         db.session.add(new_assignment)
+        # read before commit, which expires the loaded user (reading after would reload it)
+        user_id = current_user.id
         db.session.commit()
+        reset_overdue_sweep(user_id)
         
         flash('Assignment created successfully!', 'success')
         return redirect(url_for('dashboard'))
     
     return render_template('add_assignment.html')
 
+# import assignments from an uploaded CSV or iCalendar file
+@app.route('/assignments/import', methods=['GET', 'POST'])
+@query_budget(lambda: 3 + import_batch_count())
+@login_required
+def import_assignments():
+    if request.method == 'POST':
+        upload = request.files.get('file')
+        if not upload or not upload.filename:
+            flash('Please choose a CSV or iCalendar file to import!', 'error')
+            return redirect(url_for('import_assignments'))
+        
+        fmt = request.form.get('format') or assignment_io.detect_format(upload.filename)
+        if fmt not in assignment_io.FORMATS:
+            flash('Unsupported file format!', 'error')
+            return redirect(url_for('import_assignments'))
+        
+        # read the upload line by line instead of loading it into memory
+        lines = io.TextIOWrapper(upload.stream, encoding='utf-8-sig', newline='')
+        report = import_assignment_rows(current_user.id, lines, fmt)
+        
+        flash(f"Imported {report['imported']} assignments.", 'success' if report['imported'] else 'error')
+        for error in report['errors'][:5]:
+            flash(f"Line {error['line']}: {error['error']}", 'error')
+        if report['failed'] > 5:
+            flash(f"...and {report['failed'] - 5} more rows were skipped.", 'error')
+        return redirect(url_for('assignments'))
+    
+    return render_template('import_assignments.html')
+
+# download all assignments as CSV or iCalendar, streamed as rows are read
+@app.route('/assignments/export.<fmt>')
+@query_budget(1)
+@login_required
+def export_assignments(fmt):
+    if fmt not in assignment_io.FORMATS:
+        abort(404)
+    
+    rows = stream_assignment_rows(current_user.id)
+    body = assignment_io.export_ics(rows) if fmt == 'ics' else assignment_io.export_csv(rows)
+    mimetype = 'text/calendar' if fmt == 'ics' else 'text/csv'
+    return Response(stream_with_context(body), mimetype=mimetype, headers={
+        'Content-Disposition': f'attachment; filename=assignments.{fmt}'
+    })
+
 # edit existing assignment
 @app.route('/assignment/edit/<int:assignment_id>', methods=['GET', 'POST'])
+@query_budget(8)
 @login_required
 def edit_assignment(assignment_id):
     assignment = Assignment.query.get_or_404(assignment_id)
@@ -282,14 +591,24 @@ def edit_assignment(assignment_id):
             flash('Invalid date format!', 'error')
             return render_template('edit_assignment.html', assignment=assignment)
         
+        # plans only need refreshing if something they were built from changed
+        plan_inputs_changed = (assignment.title, assignment.due_date, assignment.priority) != (title, due_date, priority)
+        
         # update assignment details
         assignment.title = title
         assignment.description = description
         assignment.due_date = due_date
         assignment.priority = priority
         assignment.updated_at = datetime.utcnow()
+        if plan_inputs_changed:
+            mark_study_plans_stale(assignment.id)
         
+        # read before commit, which expires the loaded user (reading after would reload it)
+        user_id = current_user.id
         db.session.commit()
+        reset_overdue_sweep(user_id)
+        # cached AI output built from the old details is no longer valid
+        ai_cache.invalidate_assignment(assignment_id)
         
         flash('Assignment updated successfully!', 'success')
         return redirect(url_for('dashboard'))
@@ -298,6 +617,7 @@ def edit_assignment(assignment_id):
 
 # delete an assignment
 @app.route('/assignment/delete/<int:assignment_id>', methods=['POST'])
+@query_budget(7)
 @login_required
 def delete_assignment(assignment_id):
     assignment = Assignment.query.get_or_404(assignment_id)
@@ -307,14 +627,18 @@ def delete_assignment(assignment_id):
         flash('Unauthorized access!', 'error')
         return redirect(url_for('dashboard'))
     
+    mark_study_plans_stale(assignment_id)
+    db.session.execute(study_plan_assignment.delete().where(study_plan_assignment.c.assignment_id == assignment_id))
     db.session.delete(assignment)
     db.session.commit()
+    ai_cache.invalidate_assignment(assignment_id)
     
     flash('Assignment deleted successfully!', 'success')
     return redirect(url_for('dashboard'))
 
 # mark assignment as complete/incomplete
 @app.route('/assignment/complete/<int:assignment_id>', methods=['POST'])
+@query_budget(5)
 @login_required
 def complete_assignment(assignment_id):
     assignment = Assignment.query.get_or_404(assignment_id)
@@ -324,12 +648,14 @@ def complete_assignment(assignment_id):
     
     # mark it as done
     assignment.status = 'completed'
+    mark_study_plans_stale(assignment.id)
     db.session.commit()
     
     return jsonify({'success': True, 'message': 'Assignment marked as completed!'})
 
 # AI study plan page - generates personalized study plans
 @app.route('/ai-study-plan', methods=['GET', 'POST'])
+@query_budget(4)
 @login_required
 def ai_study_plan():
     if request.method == 'POST':
@@ -340,36 +666,22 @@ def ai_study_plan():
             flash('Please select at least one assignment!', 'error')
             return redirect(url_for('ai_study_plan'))
         
-        # grab the selected assignments from database
-        assignments = Assignment.query.filter(
+        # keep only the selected assignments that belong to this user
+        assignment_ids = [row.id for row in Assignment.query.with_entities(Assignment.id).filter(
             Assignment.id.in_(selected_assignment_ids),
             Assignment.user_id == current_user.id
-        ).all()
+        ).order_by(Assignment.id).all()]
         
-        if not assignments:
+        if not assignment_ids:
             flash('No valid assignments selected!', 'error')
             return redirect(url_for('ai_study_plan'))
         
-        # use AI to generate study plan
-        try:
-            study_plan_content = generate_study_plan(assignments)
-            
-            # save the study plan to database
-            study_plan = StudyPlan(
-                content=study_plan_content,
-                assignment_ids=','.join(selected_assignment_ids),
-                user_id=current_user.id
-            )
-            db.session.add(study_plan)
-            db.session.commit()
-            
-            return render_template('study_plan_result.html', 
-                                 study_plan=study_plan_content,
-                                 assignments=assignments,
-                                 now=datetime.now())
-        except Exception as e:
-            flash(f'Error generating study plan: {str(e)}', 'error')
+        # generate in the background and send the user to the result page
+        job = enqueue_generation_job('study_plan', {'assignment_ids': assignment_ids})
+        if not job:
+            flash('The study assistant is busy right now. Please try again in a moment.', 'error')
             return redirect(url_for('ai_study_plan'))
+        return redirect(url_for('job_result', job_id=job.id))
     
     # show form with pending assignments
     assignments = Assignment.query.filter_by(
@@ -379,8 +691,40 @@ def ai_study_plan():
     
     return render_template('ai_study_plan.html', assignments=assignments, now=datetime.now())
 
+# full view of one saved study plan (the only place its content is loaded)
+@app.route('/study-plans/<int:plan_id>')
+@query_budget(3)
+@login_required
+def view_study_plan(plan_id):
+    study_plan = StudyPlan.query.options(undefer(StudyPlan.content)).filter_by(
+        id=plan_id, user_id=current_user.id
+    ).first_or_404()
+    return render_template('study_plan_result.html',
+                         study_plan=study_plan.content,
+                         assignments=study_plan.assignments,
+                         now=study_plan.created_at)
+
+# regenerate one stale study plan in place from its remaining open assignments
+@app.route('/study-plans/<int:plan_id>/refresh', methods=['POST'])
+@query_budget(5)
+@login_required
+def refresh_study_plan(plan_id):
+    study_plan = StudyPlan.query.filter_by(id=plan_id, user_id=current_user.id).first_or_404()
+    
+    assignment_ids = [a.id for a in study_plan.assignments if a.status != 'completed']
+    if not assignment_ids:
+        flash('Every assignment in this plan is completed. Nothing left to plan!', 'info')
+        return redirect(url_for('progress'))
+    
+    job = enqueue_generation_job('study_plan', {'assignment_ids': assignment_ids, 'study_plan_id': study_plan.id})
+    if not job:
+        flash('The study assistant is busy right now. Please try again in a moment.', 'error')
+        return redirect(url_for('progress'))
+    return redirect(url_for('job_result', job_id=job.id))
+
 # AI summary page - generates summaries for assignments
 @app.route('/ai-summary', methods=['GET', 'POST'])
+@query_budget(4)
 @login_required
 def ai_summary():
     if request.method == 'POST':
@@ -400,138 +744,775 @@ def ai_summary():
                 flash('Invalid assignment!', 'error')
                 return redirect(url_for('ai_summary'))
         
-        # generate the AI summary
-        try:
-            summary = generate_summary(assignment, notes)
-            return render_template('summary_result.html', 
-                                 summary=summary,
-                                 assignment=assignment)
-        except Exception as e:
-            flash(f'Error generating summary: {str(e)}', 'error')
+        # generate in the background and send the user to the result page
+        job = enqueue_generation_job('summary', {
+            'assignment_id': assignment.id if assignment else None,
+            'notes': notes
+        })
+        if not job:
+            flash('The study assistant is busy right now. Please try again in a moment.', 'error')
             return redirect(url_for('ai_summary'))
+        return redirect(url_for('job_result', job_id=job.id))
     
     # show form with all assignments
     assignments = Assignment.query.filter_by(user_id=current_user.id).order_by(Assignment.due_date.asc()).all()
     return render_template('ai_summary.html', assignments=assignments)
 
+# result page for a background AI job - shows progress until it finishes
+@app.route('/jobs/<job_id>')
+@query_budget(4)
+@login_required
+def job_result(job_id):
+    job = get_user_job_or_404(job_id)
+    status = job_display_status(job)
+    
+    if status == 'failed':
+        error = job.error or 'Job was interrupted. Please try again.'
+        flash(f'Error generating {job.kind.replace("_", " ")}: {error}', 'error')
+        return redirect(url_for('ai_study_plan' if job.kind == 'study_plan' else 'ai_summary'))
+    
+    if status != 'finished':
+        return render_template('job_pending.html', job=job,
+                             streaming=app.config['AI_STREAMING'] and job.status == 'queued')
+    
+    if job.kind == 'study_plan':
+        study_plan = db.session.get(StudyPlan, job.study_plan_id, options=[undefer(StudyPlan.content)])
+        return render_template('study_plan_result.html', 
+                             study_plan=study_plan.content,
+                             assignments=study_plan.assignments,
+                             now=datetime.now())
+    
+    assignment_id = json.loads(job.params)['assignment_id']
+    assignment = db.session.get(Assignment, assignment_id) if assignment_id else None
+    return render_template('summary_result.html', 
+                         summary=job.result,
+                         assignment=assignment)
+
+# streaming mode: run the job here and send the output as server-sent events
+@app.route('/jobs/<job_id>/stream')
+@query_budget(3)
+@login_required
+def job_stream(job_id):
+    job = get_user_job_or_404(job_id)
+    result_url = url_for('job_result', job_id=job.id)
+    claimed = claim_generation_job(job.id)
+    
+    def events():
+        if claimed is None:
+            # another request or worker has it - the page falls back to polling
+            yield sse_event('waiting', {'result_url': result_url})
+            return
+        
+        try:
+            args = job_generation_args(claimed)
+            stream = stream_study_plan if claimed.kind == 'study_plan' else stream_summary
+            content = None
+            for kind, html in stream(*args):
+                if kind == 'chunk':
+                    yield sse_event('chunk', {'html': html})
+                else:
+                    content = html
+            finish_generation_job(claimed, content, args)
+            yield sse_event('done', {'result_url': result_url})
+        except GeneratorExit:
+            # the browser went away mid-stream
+            fail_generation_job(job_id, 'Stream was interrupted. Please try again.')
+            raise
+        except Exception as e:
+            fail_generation_job(job_id, e)
+            yield sse_event('failed', {'result_url': result_url})
+    
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+# JSON status for the result page to poll
+@app.route('/jobs/<job_id>/status')
+@query_budget(2)
+@login_required
+def job_status(job_id):
+    job = get_user_job_or_404(job_id)
+    status = job_display_status(job)
+    return jsonify({
+        'id': job.id,
+        'kind': job.kind,
+        'status': status,
+        'error': (job.error or 'Job was interrupted. Please try again.') if status == 'failed' else None,
+        'result_url': url_for('job_result', job_id=job.id)
+    })
+
+# health of the AI upstream (request counters, circuit breaker, cache hit ratio)
+@app.route('/ai/status')
+@query_budget(0)
+def ai_status():
+    return jsonify(dict(ai_client_metrics(), cache=ai_cache.stats()))
+
+# bulk study plans: {"items": [{"user_id": 1, "assignment_ids": [1, 2]}, ...], "concurrency": 8} or just the items list
+@app.route('/api/study-plans/batch', methods=['POST'])
+@query_budget(lambda: 3 + batch_item_count())
+def batch_study_plans():
+    token = app.config['BATCH_API_TOKEN']
+    if not token:
+        abort(404)
+    supplied = request.headers.get('Authorization', '').removeprefix('Bearer ')
+    if not hmac.compare_digest(supplied.encode(), token.encode()):
+        abort(401)
+    
+    data = batch_request_body()
+    if not isinstance(data, dict):
+        return jsonify({'error': 'body must be a JSON object or a list of items'}), 400
+    try:
+        items = parse_batch_items(data.get('items'))
+        concurrency = int(data.get('concurrency') or app.config['BATCH_MAX_WORKERS'])
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify(generate_study_plans_batch(items, concurrency))
+
 # progress tracking page
 @app.route('/progress')
+@query_budget(5)
 @login_required
 def progress():
-    assignments = Assignment.query.filter_by(user_id=current_user.id).all()
-    
-    # calculate statistics
-    total = len(assignments)
-    completed = len([a for a in assignments if a.status == 'completed'])
-    pending = len([a for a in assignments if a.status == 'pending'])
-    overdue = len([a for a in assignments if a.status == 'overdue'])
-    
-    completion_rate = (completed / total * 100) if total > 0 else 0
-    
-    # breakdown by priority
-    high_priority = len([a for a in assignments if a.priority == 'high'])
-    medium_priority = len([a for a in assignments if a.priority == 'medium'])
-    low_priority = len([a for a in assignments if a.priority == 'low'])
-    
-    # get recent study plans
-    study_plans = StudyPlan.query.filter_by(user_id=current_user.id).order_by(StudyPlan.created_at.desc()).limit(5).all()
-    
-    return render_template('progress.html',
-                         total=total,
-                         completed=completed,
-                         pending=pending,
-                         overdue=overdue,
-                         completion_rate=round(completion_rate, 1),
-                         high_priority=high_priority,
-                         medium_priority=medium_priority,
-                         low_priority=low_priority,
+    key = fragment_cache_key('progress', current_user.id)
+    content = fragment_cache.get_or_render(key, lambda: render_progress_content(current_user.id))
+    return render_template('progress.html', content=content)
+
+# Prometheus metrics for this process
+@app.route('/metrics')
+@query_budget(0)
+def metrics():
+    if not app.config['METRICS_ENABLED']:
+        abort(404)
+    return Response(metrics_registry.render(), mimetype='text/plain; version=0.0.4')
+
+# cache health (fragment, identity and AI response caches)
+@app.route('/cache/status')
+@query_budget(0)
+def cache_status():
+    return jsonify({
+        'fragments': fragment_cache.stats(),
+        'users': user_cache.stats(),
+        'ai': ai_cache.stats()
+    })
+
+# Fragment Helpers - the data-dependent parts of the dashboard and progress pages
+
+# fragments are keyed by the user's data version, so any write moves readers to a new key
+def fragment_cache_key(page, user_id, *extra):
+    return ':'.join(str(part) for part in (page, user_id, get_data_version(user_id)) + extra)
+
+def render_dashboard_content(user_id, now):
+    # only fetch the upcoming assignments the dashboard actually shows
+    assignments = Assignment.query.filter_by(user_id=user_id).order_by(
+        Assignment.due_date.asc(), Assignment.id.asc()
+    ).limit(app.config['DASHBOARD_UPCOMING_LIMIT']).all()
+    
+    # stats are counted by the database instead of scanning the list
+    stats = get_assignment_stats(user_id)
+    
+    return render_template('_dashboard_content.html',
+                         assignments=assignments,
+                         total=stats['total'],
+                         completed=stats['completed'],
+                         pending=stats['pending'],
+                         overdue=stats['overdue'],
+                         now=now)
+
+def render_progress_content(user_id):
+    # calculate statistics with one grouped query
+    stats = get_assignment_stats(user_id)
+    
+    # the timeline only shows these columns, so skip loading descriptions
+    assignments = Assignment.query.options(
+        load_only(Assignment.id, Assignment.title, Assignment.due_date, Assignment.priority, Assignment.status)
+    ).filter_by(user_id=user_id).order_by(Assignment.due_date.asc()).all()
+    
+    # get recent study plans (excerpts only, content stays deferred)
+    study_plans = StudyPlan.query.filter_by(user_id=user_id).order_by(StudyPlan.created_at.desc()).limit(5).all()
+    
+    return render_template('_progress_content.html',
+                         total=stats['total'],
+                         completed=stats['completed'],
+                         pending=stats['pending'],
+                         overdue=stats['overdue'],
+                         completion_rate=stats['completion_rate'],
+                         high_priority=stats['high_priority'],
+                         medium_priority=stats['medium_priority'],
+                         low_priority=stats['low_priority'],
                          study_plans=study_plans,
                          assignments=assignments)
 
-# AI Helper Functions - these handle the AI features
+# Stats Helpers - counts are computed by the database
 
-# convert markdown text to HTML
-def markdown_to_html(text):
-    # Replace headers
-    text = text.replace('### ', '<h4>').replace('\n##', '</h4>\n<h3>').replace('\n#', '</h3>\n<h2>')
-    
-    # Handle bold text with regex
-    import re
-    text = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', text)
-    
-    # Handle lists - convert markdown lists to HTML
-    lines = text.split('\n')
-    html_lines = []
-    in_list = False
-    
-    for line in lines:
-        stripped = line.strip()
-        if stripped.startswith('- ') or stripped.startswith('* '):
-            if not in_list:
-                html_lines.append('<ul>')
-                in_list = True
-            html_lines.append(f'<li>{stripped[2:]}</li>')
-        elif stripped and stripped[0].isdigit() and '. ' in stripped[:5]:
-            # handle numbered lists
-            if not in_list:
-                html_lines.append('<ol>')
-                in_list = 'ol'
-            content = stripped.split('. ', 1)[1] if '. ' in stripped else stripped
-            html_lines.append(f'<li>{content}</li>')
+# count a user's assignments by status and priority in a single grouped query
+def get_assignment_stats(user_id):
+    rows = db.session.query(
+        Assignment.status,
+        Assignment.priority,
+        db.func.count(Assignment.id)
+    ).filter(Assignment.user_id == user_id).group_by(Assignment.status, Assignment.priority).all()
+    
+    stats = {
+        'total': 0,
+        'completed': 0,
+        'pending': 0,
+        'overdue': 0,
+        'high_priority': 0,
+        'medium_priority': 0,
+        'low_priority': 0,
+    }
+    for status, priority, count in rows:
+        stats['total'] += count
+        if status in ('completed', 'pending', 'overdue'):
+            stats[status] += count
+        if priority in ('high', 'medium', 'low'):
+            stats[f'{priority}_priority'] += count
+    
+    completion_rate = (stats['completed'] / stats['total'] * 100) if stats['total'] > 0 else 0
+    stats['completion_rate'] = round(completion_rate, 1)
+    return stats
+
+# a user's assignments with the list page's priority/status filters ("all" skips a filter)
+def filter_assignments(user_id, priority_filter='all', status_filter='all'):
+    query = Assignment.query.filter_by(user_id=user_id)
+    
+    # apply filters if selected
+    if priority_filter != 'all':
+        query = query.filter_by(priority=priority_filter)
+    
+    if status_filter != 'all':
+        query = query.filter_by(status=status_filter)
+    return query
+
+def assignment_to_dict(assignment):
+    return {
+        'id': assignment.id,
+        'title': assignment.title,
+        'description': assignment.description,
+        'due_date': assignment.due_date.isoformat(),
+        'priority': assignment.priority,
+        'status': assignment.status,
+        'created_at': assignment.created_at.isoformat() if assignment.created_at else None,
+        'updated_at': assignment.updated_at.isoformat() if assignment.updated_at else None
+    }
+
+# Data Versions - one counter per user, bumped in the same transaction as the change
+
+def get_data_version(user_id):
+    return db.session.execute(
+        db.select(User.data_version).where(User.id == user_id)
+    ).scalar() or 0
+
+def bump_data_version(connection, user_ids):
+    if user_ids:
+        connection.execute(
+            db.update(User.__table__).where(User.__table__.c.id.in_(user_ids))
+            .values(data_version=User.__table__.c.data_version + 1)
+        )
+
+# strong ETag for one representation of a user's data at a version
+def make_data_etag(user_id, version, variant=()):
+    digest = hashlib.sha1(json.dumps([user_id, variant], separators=(',', ':')).encode()).hexdigest()[:16]
+    return f"v{version}-{digest}"
+
+# ORM writes to assignments and study plans bump their owners' versions automatically
+@db.event.listens_for(db.session, 'after_flush')
+def bump_versions_after_flush(session, flush_context):
+    user_ids = set()
+    for obj in list(session.new) + list(session.deleted):
+        if isinstance(obj, (Assignment, StudyPlan)):
+            user_ids.add(obj.user_id)
+    for obj in session.dirty:
+        if isinstance(obj, (Assignment, StudyPlan)) and session.is_modified(obj):
+            user_ids.add(obj.user_id)
+    user_ids.discard(None)
+    bump_data_version(session.connection(), user_ids)
+
+# Pagination Helpers - keyset pagination on (due_date, id)
+
+# cursors look like "2026-03-01T00:00:00_42"
+def encode_assignment_cursor(assignment):
+    return f"{assignment.due_date.isoformat()}_{assignment.id}"
+
+def decode_assignment_cursor(cursor):
+    try:
+        due_date_str, assignment_id = cursor.rsplit('_', 1)
+        return datetime.fromisoformat(due_date_str), int(assignment_id)
+    except (AttributeError, ValueError):
+        return None
+
+# return one page of a filtered assignment query plus the cursor for the next page
+def paginate_assignments(query, cursor, per_page):
+    query = query.order_by(Assignment.due_date.asc(), Assignment.id.asc())
+    
+    position = decode_assignment_cursor(cursor) if cursor else None
+    if position:
+        due_date, assignment_id = position
+        query = query.filter(or_(
+            Assignment.due_date > due_date,
+            and_(Assignment.due_date == due_date, Assignment.id > assignment_id)
+        ))
+    
+    # fetch one extra row to know whether another page exists
+    rows = query.limit(per_page + 1).all()
+    next_cursor = encode_assignment_cursor(rows[per_page - 1]) if len(rows) > per_page else None
+    return rows[:per_page], next_cursor
+
+# Import/Export Helpers - streamed through assignment_io
+
+# most INSERT batches the current upload can need, bounded by its size since rows are only counted as they stream
+def import_batch_count():
+    rows = (request.content_length or 0) // assignment_io.MIN_ROW_BYTES
+    return -(-rows // app.config['IMPORT_BATCH_SIZE'])
+
+# validate rows as they stream in and insert them in batches; returns counts and row errors
+def import_assignment_rows(user_id, lines, fmt, batch_size=None):
+    batch_size = batch_size or app.config['IMPORT_BATCH_SIZE']
+    report = {'imported': 0, 'failed': 0, 'errors': []}
+    batch = []
+    
+    def flush():
+        # one executemany INSERT per batch instead of one ORM object per row
+        db.session.execute(db.insert(Assignment), batch)
+        report['imported'] += len(batch)
+        batch.clear()
+    
+    try:
+        for row in assignment_io.iter_rows(lines, fmt):
+            if isinstance(row, assignment_io.RowError):
+                report['failed'] += 1
+                if len(report['errors']) < 100:
+                    report['errors'].append({'line': row.line, 'error': str(row)})
+                continue
+            batch.append(dict(row[1], user_id=user_id))
+            if len(batch) >= batch_size:
+                flush()
+        if batch:
+            flush()
+        # bulk INSERTs skip the flush hook, so bump the version here
+        if report['imported']:
+            bump_data_version(db.session.connection(), [user_id])
+    except (assignment_io.RowError, csv.Error, UnicodeDecodeError) as e:
+        # the file itself is unreadable, so nothing from it is kept
+        db.session.rollback()
+        return {'imported': 0, 'failed': report['failed'] + 1,
+                'errors': [{'line': getattr(e, 'line', None), 'error': f'Could not read file: {e}'}]}
+    
+    db.session.commit()
+    reset_overdue_sweep(user_id)
+    return report
+
+# yield a user's assignments in due date order, fetched from the cursor in chunks
+def stream_assignment_rows(user_id):
+    query = db.select(
+        Assignment.id, Assignment.title, Assignment.description, Assignment.due_date,
+        Assignment.priority, Assignment.status
+    ).where(Assignment.user_id == user_id).order_by(Assignment.due_date.asc(), Assignment.id.asc())
+    result = db.session.execute(query.execution_options(yield_per=app.config['EXPORT_FETCH_SIZE']))
+    try:
+        yield from result
+    finally:
+        result.close()
+
+# Study Plan Helpers - plans track the assignments they were built from
+
+# flag only the plans that include this assignment (one UPDATE through the link index)
+def mark_study_plans_stale(assignment_id):
+    plan_ids = db.select(study_plan_assignment.c.study_plan_id).where(
+        study_plan_assignment.c.assignment_id == assignment_id
+    )
+    return StudyPlan.query.filter(
+        StudyPlan.id.in_(plan_ids),
+        StudyPlan.is_stale.is_(False)
+    ).update({StudyPlan.is_stale: True}, synchronize_session=False)
+
+# Overdue Sweeper - keeps assignment status in sync with due dates
+
+# when each user's overdue sweep last ran in this process
+_overdue_swept_at = {}
+_overdue_lock = threading.Lock()
+
+# flag every unfinished, past-due assignment as overdue with one UPDATE
+def sweep_overdue_assignments(user_id=None, now=None):
+    query = Assignment.query.filter(
+        Assignment.status.notin_(('completed', 'overdue')),
+        Assignment.due_date < (now or datetime.now())
+    )
+    if user_id is not None:
+        query = query.filter(Assignment.user_id == user_id)
+    
+    # check with a read first so a no-op sweep never takes the write lock
+    if not db.session.query(query.exists()).scalar():
+        return 0
+    
+    updated = query.update({Assignment.status: 'overdue'}, synchronize_session=False)
+    # bulk UPDATEs skip the flush hook, so bump versions here
+    if user_id is not None:
+        bump_data_version(db.session.connection(), [user_id])
+    else:
+        db.session.execute(db.update(User).values(data_version=User.data_version + 1))
+    db.session.commit()
+    return updated
+
+# run the sweep for a user unless it already ran within the interval
+def sweep_overdue_if_due(user_id):
+    interval = app.config['OVERDUE_SWEEP_INTERVAL']
+    checked_at = time.monotonic()
+    with _overdue_lock:
+        last_run = _overdue_swept_at.get(user_id)
+        if last_run is not None and checked_at - last_run < interval:
+            return 0
+        _overdue_swept_at[user_id] = checked_at
+    return sweep_overdue_assignments(user_id)
+
+# make the next dashboard visit sweep again (after due dates change)
+def reset_overdue_sweep(user_id):
+    with _overdue_lock:
+        _overdue_swept_at.pop(user_id, None)
+
+# Batch Study Plan Helpers - many (user, assignments) pairs in one call
+
+# the batch request's JSON, with a bare list taken as the items (as generate_plans.py accepts)
+def batch_request_body():
+    data = request.get_json(silent=True)
+    return {'items': data} if isinstance(data, list) else data
+
+# items in the current batch request: SQLite needs one INSERT per new plan, so the budget grows with it
+def batch_item_count():
+    data = batch_request_body()
+    items = data.get('items') if isinstance(data, dict) else None
+    return len(items) if isinstance(items, list) else 0
+
+# validate batch items into (user_id, [assignment ids]) pairs
+def parse_batch_items(items):
+    if not isinstance(items, list) or not items:
+        raise ValueError('items must be a non-empty list')
+    if len(items) > app.config['BATCH_MAX_ITEMS']:
+        raise ValueError(f"at most {app.config['BATCH_MAX_ITEMS']} items per batch")
+    
+    parsed = []
+    for item in items:
+        if not isinstance(item, dict) or 'user_id' not in item or not isinstance(item.get('assignment_ids'), list):
+            raise ValueError('each item needs a user_id and an assignment_ids list')
+        parsed.append((int(item['user_id']), [int(i) for i in item['assignment_ids']]))
+    return parsed
+
+# generate one study plan per item on a bounded thread pool, then save them in one transaction
+def generate_study_plans_batch(items, concurrency):
+    started = time.perf_counter()
+    concurrency = max(1, min(concurrency, app.config['BATCH_MAX_WORKERS'], len(items)))
+    
+    # load every requested assignment with one query, then keep each item's own ones
+    requested_ids = {i for _, assignment_ids in items for i in assignment_ids}
+    by_id = {a.id: a for a in Assignment.query.filter(Assignment.id.in_(requested_ids)).all()}
+    results = []
+    work = []
+    for index, (user_id, assignment_ids) in enumerate(items):
+        assignments = [by_id[i] for i in dict.fromkeys(assignment_ids) if i in by_id and by_id[i].user_id == user_id]
+        result = {'index': index, 'user_id': user_id, 'status': 'failed', 'study_plan_id': None,
+                  'latency_ms': 0.0, 'error': None}
+        results.append(result)
+        if assignments:
+            work.append((result, assignments))
         else:
-            if in_list:
-                html_lines.append('</ol>' if in_list == 'ol' else '</ul>')
-                in_list = False
-            if stripped:
-                html_lines.append(f'<p>{line}</p>')
-            else:
-                html_lines.append('')
+            result['error'] = 'No valid assignments selected'
+    
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='batch-plan') as executor:
+        outcomes = list(executor.map(lambda entry: run_batch_item(entry[1]), work))
+    
+    plans = []
+    for (result, assignments), (content, latency, error) in zip(work, outcomes):
+        result['latency_ms'] = round(latency * 1000, 1)
+        if error:
+            result['error'] = error
+            continue
+        plan = StudyPlan(content=content, assignments=assignments, user_id=result['user_id'])
+        plans.append((result, plan))
     
-    if in_list:
-        html_lines.append('</ol>' if in_list == 'ol' else '</ul>')
+    # one transaction for every plan in the batch
+    db.session.add_all(plan for _, plan in plans)
+    db.session.flush()
+    # read the new ids before commit expires the plans (reading after would reload each one)
+    for result, plan in plans:
+        result['status'] = 'finished'
+        result['study_plan_id'] = plan.id
+    db.session.commit()
+    
+    succeeded = len(plans)
+    return {
+        'items': results,
+        'succeeded': succeeded,
+        'failed': len(results) - succeeded,
+        'concurrency': concurrency,
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 1)
+    }
+
+# runs on a batch worker thread: (content, seconds, error message)
+def run_batch_item(assignments):
+    started = time.perf_counter()
+    with app.app_context():
+        try:
+            content = generate_study_plan(assignments)
+            return content, time.perf_counter() - started, None
+        except Exception as e:
+            return None, time.perf_counter() - started, str(e)[:500]
+
+# Background Job Helpers - AI generation runs outside the request
+
+# save a queued job and hand it to the worker pool (None if the queue is full)
+def enqueue_generation_job(kind, params):
+    job = GenerationJob(kind=kind, params=json.dumps(params), user_id=current_user.id)
+    db.session.add(job)
+    db.session.commit()
     
-    return '\n'.join(html_lines)
+    # in streaming mode the result page's event stream runs the job instead
+    if app.config['AI_STREAMING']:
+        return job
+    
+    try:
+        # in eager mode the job runs inline, but it is background work, not part of the view's budget
+        with query_tracker.paused():
+            job_queue.submit(run_generation_job, job.id)
+    except QueueFullError:
+        job.status = 'failed'
+        job.error = 'Job queue is full'
+        db.session.commit()
+        return None
+    return job
+
+# runs on a worker thread: generate the content and store the outcome
+def run_generation_job(job_id):
+    with app.app_context():
+        job = claim_generation_job(job_id)
+        if job is None:
+            return
+        
+        try:
+            args = job_generation_args(job)
+            generate = generate_study_plan if job.kind == 'study_plan' else generate_summary
+            finish_generation_job(job, generate(*args), args)
+        except Exception as e:
+            fail_generation_job(job_id, e)
+
+# move a queued job to running in one UPDATE so only one runner gets it
+def claim_generation_job(job_id):
+    claimed = GenerationJob.query.filter_by(id=job_id, status='queued').update(
+        {GenerationJob.status: 'running', GenerationJob.started_at: datetime.utcnow()},
+        synchronize_session=False
+    )
+    db.session.commit()
+    return db.session.get(GenerationJob, job_id) if claimed else None
+
+# arguments for generate_study_plan / generate_summary, loaded from the job's params
+def job_generation_args(job):
+    params = json.loads(job.params)
+    if job.kind == 'study_plan':
+        assignments = Assignment.query.filter(
+            Assignment.id.in_(params['assignment_ids']),
+            Assignment.user_id == job.user_id
+        ).all()
+        return (assignments,)
+    
+    assignment = None
+    if params['assignment_id']:
+        assignment = Assignment.query.filter_by(id=params['assignment_id'], user_id=job.user_id).first()
+    return (assignment, params['notes'])
+
+# store the generated content (study plans also get a StudyPlan row)
+def finish_generation_job(job, content, args):
+    if job.kind == 'study_plan':
+        # a refresh rewrites its existing plan, anything else creates one
+        plan_id = json.loads(job.params).get('study_plan_id')
+        study_plan = db.session.get(StudyPlan, plan_id) if plan_id else None
+        if study_plan is None:
+            study_plan = StudyPlan(user_id=job.user_id)
+            db.session.add(study_plan)
+        study_plan.content = content
+        study_plan.assignments = list(args[0])
+        study_plan.is_stale = False
+        db.session.flush()
+        job.study_plan_id = study_plan.id
+    else:
+        job.result = content
+    job.status = 'finished'
+    job.finished_at = datetime.utcnow()
+    db.session.commit()
+
+def fail_generation_job(job_id, error):
+    db.session.rollback()
+    job = db.session.get(GenerationJob, job_id)
+    job.status = 'failed'
+    job.error = str(error)[:500]
+    job.finished_at = datetime.utcnow()
+    db.session.commit()
+
+# format one server-sent event
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def get_user_job_or_404(job_id):
+    job = db.session.get(GenerationJob, job_id)
+    if job is None or job.user_id != current_user.id:
+        abort(404)
+    return job
+
+# jobs that never finished before a restart are reported as failed
+def job_display_status(job):
+    if job.status in ('queued', 'running'):
+        age = (datetime.utcnow() - job.created_at).total_seconds()
+        if age > app.config['JOB_STALE_AFTER']:
+            return 'failed'
+    return job.status
+
+# AI Helper Functions - these handle the AI features
+
+# convert markdown text to escaped HTML (single pass, see markdown_renderer.py)
+def markdown_to_html(text):
+    return render_markdown(text)
+
+# the shared AI client, created (and requests imported) on first use
+def get_ai_client():
+    global _ai_client
+    if _ai_client is None:
+        with _ai_client_lock:
+            if _ai_client is None:
+                _ai_client = InferenceClient(
+                    HF_API_URL,
+                    token=HF_API_TOKEN,
+                    connect_timeout=float(os.getenv('HF_CONNECT_TIMEOUT', '3.05')),
+                    read_timeout=float(os.getenv('HF_READ_TIMEOUT', '30')),
+                    max_retries=int(os.getenv('HF_MAX_RETRIES', '2')),
+                    pool_size=int(os.getenv('HF_POOL_SIZE', '10')),
+                    breaker=CircuitBreaker(
+                        failure_threshold=int(os.getenv('HF_BREAKER_THRESHOLD', '5')),
+                        reset_timeout=float(os.getenv('HF_BREAKER_RESET', '30'))
+                    )
+                )
+    return _ai_client
+
+# upstream counters for the status pages, without building the client just to report on it
+def ai_client_metrics():
+    if _ai_client is None:
+        return {'client_loaded': False, 'breaker_state': 'closed'}
+    return dict(_ai_client.metrics(), client_loaded=True)
 
 # call Hugging Face API to get AI response
-def call_huggingface_api(prompt, max_new_tokens=800):
+@metrics_registry.timed_ai('generate')
+def call_huggingface_api(prompt, max_new_tokens=800, timeout=None):
+    if app.config['AI_BACKEND'] == 'stub':
+        return generate_stub_response(prompt)
+    
     if not HF_API_TOKEN:
         return None
     
-    headers = {"Authorization": f"Bearer {HF_API_TOKEN}"}
-    
     payload = {
         "inputs": prompt,
-        "parameters": {
-            "max_new_tokens": max_new_tokens,
-            "temperature": 0.7,
-            "top_p": 0.95,
-            "do_sample": True
-        }
+        "parameters": dict(HF_GENERATION_PARAMS, max_new_tokens=max_new_tokens)
     }
     
     try:
-        response = requests.post(HF_API_URL, headers=headers, json=payload, timeout=30)
-        response.raise_for_status()
-        result = response.json()
+        result = get_ai_client().post(payload, timeout=timeout)
         
         if isinstance(result, list) and len(result) > 0:
             return result[0].get('generated_text', '')
         elif isinstance(result, dict):
             return result.get('generated_text', '')
         return None
+    except CircuitOpenError:
+        # upstream is known to be down, go straight to the fallback
+        return None
     except Exception as e:
-        print(f"Hugging Face API Error: {e}")
+        app.logger.warning("Hugging Face API Error: %s", e)
         return None
 
-# generate study plan using AI
-def generate_study_plan(assignments):
+# local stand-in for the model - echoes the prompt like the real API does
+def generate_stub_response(prompt):
+    return prompt + "\n" + generate_stub_completion(prompt)
+
+# the stand-in model's answer: a few markdown blocks built from the prompt
+def generate_stub_completion(prompt):
+    items = [line[2:] for line in prompt.splitlines() if line.startswith('- ')]
+    response = ["### Suggested Approach", "**Focus on the earliest due dates first.**", ""]
+    response.extend(f"- Work on {item}" for item in items)
+    response.extend(["", "1. Review your progress at the end of each day"])
+    return "\n".join(response)
+
+# stream generated text token by token (yields nothing if the model is unavailable)
+@metrics_registry.timed_ai('stream')
+def stream_huggingface_api(prompt, max_new_tokens=800):
+    if app.config['AI_BACKEND'] == 'stub':
+        yield from re.findall(r'\s*\S+', generate_stub_completion(prompt))
+        return
+    
+    if not HF_API_TOKEN:
+        return
+    
+    payload = {
+        "inputs": prompt,
+        "parameters": dict(HF_GENERATION_PARAMS, max_new_tokens=max_new_tokens)
+    }
+    
+    tokens = get_ai_client().stream(payload)
+    try:
+        first_token = next(tokens, None)
+    except CircuitOpenError:
+        # upstream is known to be down, go straight to the fallback
+        return
+    except Exception as e:
+        app.logger.warning("Hugging Face API Error: %s", e)
+        return
+    
+    # once text has been sent to the browser, errors are raised instead of falling back
+    if first_token is not None:
+        yield first_token
+        yield from tokens
+
+# stream a generation as ('chunk', html) pieces, then ('done', full html)
+def stream_generation(prompt, cache_key, max_new_tokens, assignment_ids, fallback):
+    cached = ai_cache.get(cache_key)
+    if cached is not None:
+        yield 'chunk', cached
+        yield 'done', cached
+        return
+    
+    rendered = []
+    renderer = MarkdownRenderer()
+    for token in stream_huggingface_api(prompt, max_new_tokens):
+        # the renderer returns HTML for each line as soon as it is complete
+        html = renderer.feed(token)
+        if html:
+            rendered.append(html)
+            yield 'chunk', html
+    
+    tail = renderer.close()
+    if tail:
+        rendered.append(tail)
+        yield 'chunk', tail
+    
+    if not rendered:
+        html = fallback()
+        yield 'chunk', html
+        yield 'done', html
+        return
+    
+    html = ''.join(rendered)
+    ai_cache.set(cache_key, html, assignment_ids)
+    yield 'done', html
+
+# cache key for a generation request (inputs + model + sampling parameters)
+def ai_cache_key(kind, inputs, max_new_tokens):
+    model = f"{app.config['AI_BACKEND']}:{HF_API_URL}"
+    return ai_cache.make_key(kind, inputs, model, dict(HF_GENERATION_PARAMS, max_new_tokens=max_new_tokens))
+
+# build the model prompt for a study plan
+def build_study_plan_prompt(assignments):
     # prepare assignment info for the AI
     assignment_info = []
     for a in assignments:
         days_until_due = (a.due_date - datetime.now()).days
         assignment_info.append(f"- {a.title} (Due: {a.due_date.strftime('%Y-%m-%d')}, Priority: {a.priority}, Days remaining: {days_until_due})")
     
-    prompt = f"""[INST] You are a helpful academic study assistant. Create a personalized study plan for these assignments:
+    return f"""[INST] You are a helpful academic study assistant. Create a personalized study plan for these assignments:
 
 {chr(10).join(assignment_info)}
 
@@ -543,60 +1524,107 @@ Provide:
 
 Format the response clearly. [/INST]"""
 
+def study_plan_cache_key(assignments):
+    return ai_cache_key('study_plan', [
+        [a.id, a.title, a.due_date.isoformat(), a.priority] for a in sorted(assignments, key=lambda a: a.id)
+    ], max_new_tokens=800)
+
+# generate study plan using AI
+def generate_study_plan(assignments):
+    # reuse an earlier answer for the same assignments if we have one
+    cache_key = study_plan_cache_key(assignments)
+    cached = ai_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
     # try using Hugging Face AI first
-    ai_response = call_huggingface_api(prompt, max_new_tokens=800)
+    ai_response = call_huggingface_api(build_study_plan_prompt(assignments), max_new_tokens=800)
     
     if ai_response:
         # extract only the response part (after [/INST])
         if '[/INST]' in ai_response:
             ai_response = ai_response.split('[/INST]')[-1].strip()
         # convert from markdown to HTML
-        return markdown_to_html(ai_response)
+        html = markdown_to_html(ai_response)
+        ai_cache.set(cache_key, html, [a.id for a in assignments])
+        return html
     
     # if AI fails, use basic fallback
     return generate_fallback_study_plan(assignments)
 
+# streaming version of generate_study_plan
+def stream_study_plan(assignments):
+    return stream_generation(
+        build_study_plan_prompt(assignments),
+        study_plan_cache_key(assignments),
+        800,
+        [a.id for a in assignments],
+        lambda: generate_fallback_study_plan(assignments)
+    )
+
+# static tail of the fallback study plan
+FALLBACK_STUDY_TIPS = (
+    "<h3>Study Tips</h3>"
+    "<ul>"
+    "<li>Break large assignments into smaller tasks</li>"
+    "<li>Schedule regular study sessions</li>"
+    "<li>Take short breaks every 50 minutes</li>"
+    "<li>Start with high-priority items</li>"
+    "<li>Review completed work before submission</li>"
+    "</ul>"
+)
+
 # backup study plan generator (no AI needed)
+# builds a list of parts and joins once; titles are HTML-escaped
 def generate_fallback_study_plan(assignments):
-    plan = "<h2>Personalized Study Plan</h2>"
-    plan += "<h3>Your Assignments</h3>"
+    now = datetime.now()
+    parts = ["<h2>Personalized Study Plan</h2>", "<h3>Your Assignments</h3>"]
+    append = parts.append
+    # assignments share due days and priorities, so each is formatted once
+    due_dates = {}
+    priorities = {}
     
     # sort by due date and priority
-    sorted_assignments = sorted(assignments, key=lambda x: (x.due_date, {'high': 1, 'medium': 2, 'low': 3}[x.priority]))
+    priority_order = {'high': 1, 'medium': 2, 'low': 3}
+    sorted_assignments = sorted(assignments, key=lambda x: (x.due_date, priority_order.get(x.priority, 2)))
     
     for i, assignment in enumerate(sorted_assignments, 1):
-        days_until_due = (assignment.due_date - datetime.now()).days
-        plan += f"<h4>{i}. {assignment.title}</h4>"
-        plan += "<ul>"
-        plan += f"<li><strong>Due Date:</strong> {assignment.due_date.strftime('%B %d, %Y')}</li>"
-        plan += f"<li><strong>Priority:</strong> {assignment.priority.capitalize()}</li>"
-        plan += f"<li><strong>Days Remaining:</strong> {days_until_due}</li>"
+        days_until_due = (assignment.due_date - now).days
         
         # give recommendations based on time left
         if days_until_due <= 3:
-            plan += f"<li><strong>Recommendation:</strong> This assignment is due soon! Prioritize completing this today.</li>"
+            recommendation = "This assignment is due soon! Prioritize completing this today."
         elif days_until_due <= 7:
-            plan += f"<li><strong>Recommendation:</strong> Allocate 1-2 hours daily to complete this assignment.</li>"
+            recommendation = "Allocate 1-2 hours daily to complete this assignment."
         else:
-            plan += f"<li><strong>Recommendation:</strong> Plan to work on this assignment regularly over the next {days_until_due} days.</li>"
+            recommendation = f"Plan to work on this assignment regularly over the next {days_until_due} days."
         
-        plan += "</ul>"
-    
-    plan += "<h3>Study Tips</h3>"
-    plan += "<ul>"
-    plan += "<li>Break large assignments into smaller tasks</li>"
-    plan += "<li>Schedule regular study sessions</li>"
-    plan += "<li>Take short breaks every 50 minutes</li>"
-    plan += "<li>Start with high-priority items</li>"
-    plan += "<li>Review completed work before submission</li>"
-    plan += "</ul>"
+        day = assignment.due_date.date()
+        due_date = due_dates.get(day)
+        if due_date is None:
+            due_date = due_dates[day] = assignment.due_date.strftime('%B %d, %Y')
+        priority = priorities.get(assignment.priority)
+        if priority is None:
+            priority = priorities[assignment.priority] = str(escape(assignment.priority.capitalize()))
+        
+        # str() first: formatting a Markup into an f-string is several times slower
+        append(
+            f"<h4>{i}. {str(escape(assignment.title))}</h4>"
+            "<ul>"
+            f"<li><strong>Due Date:</strong> {due_date}</li>"
+            f"<li><strong>Priority:</strong> {priority}</li>"
+            f"<li><strong>Days Remaining:</strong> {days_until_due}</li>"
+            f"<li><strong>Recommendation:</strong> {recommendation}</li>"
+            "</ul>"
+        )
     
-    return plan
+    append(FALLBACK_STUDY_TIPS)
+    return "".join(parts)
 
-# generate summary for assignment or notes using AI
-def generate_summary(assignment, notes):
+# build the model prompt for a summary
+def build_summary_prompt(assignment, notes):
     if assignment:
-        prompt = f"""[INST] You are a helpful academic study assistant. Provide a concise study summary for this assignment:
+        return f"""[INST] You are a helpful academic study assistant. Provide a concise study summary for this assignment:
 
 Title: {assignment.title}
 Description: {assignment.description or 'No description provided'}
@@ -608,74 +1636,84 @@ Provide:
 1. Key points to focus on
 2. Suggested approach
 3. Time management tips [/INST]"""
-    else:
-        prompt = f"""[INST] You are a helpful study assistant. Provide a study summary and key takeaways for these notes:
+    
+    return f"""[INST] You are a helpful study assistant. Provide a study summary and key takeaways for these notes:
 
 {notes}
 
 Organize the information clearly and highlight important points. [/INST]"""
 
+def summary_cache_key(assignment, notes):
+    inputs = {'notes': notes}
+    if assignment:
+        inputs['assignment'] = [assignment.id, assignment.title, assignment.description,
+                                assignment.due_date.isoformat(), assignment.priority]
+    return ai_cache_key('summary', inputs, max_new_tokens=600)
+
+# generate summary for assignment or notes using AI
+def generate_summary(assignment, notes):
+    # reuse an earlier answer for the same assignment and notes if we have one
+    cache_key = summary_cache_key(assignment, notes)
+    cached = ai_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
     # try using Hugging Face AI first
-    ai_response = call_huggingface_api(prompt, max_new_tokens=600)
+    ai_response = call_huggingface_api(build_summary_prompt(assignment, notes), max_new_tokens=600)
     
     if ai_response:
         # extract the response (after [/INST])
         if '[/INST]' in ai_response:
             ai_response = ai_response.split('[/INST]')[-1].strip()
         # convert markdown to HTML
-        return markdown_to_html(ai_response)
+        html = markdown_to_html(ai_response)
+        ai_cache.set(cache_key, html, [assignment.id] if assignment else [])
+        return html
     
     # fallback if AI isn't working
     return generate_fallback_summary(assignment, notes)
 
+# streaming version of generate_summary
+def stream_summary(assignment, notes):
+    return stream_generation(
+        build_summary_prompt(assignment, notes),
+        summary_cache_key(assignment, notes),
+        600,
+        [assignment.id] if assignment else [],
+        lambda: generate_fallback_summary(assignment, notes)
+    )
+
 # backup summary generator (no AI needed)
+# rendered from an autoescaped template so titles and notes can't inject HTML
 def generate_fallback_summary(assignment, notes):
-    summary = "<h2>Study Summary</h2>"
-    
-    if assignment:
-        summary += f"<h3>Assignment: {assignment.title}</h3>"
-        days_until_due = (assignment.due_date - datetime.now()).days
-        
-        summary += "<h4>Key Information</h4>"
-        summary += "<ul>"
-        summary += f"<li><strong>Due Date:</strong> {assignment.due_date.strftime('%B %d, %Y')} ({days_until_due} days remaining)</li>"
-        summary += f"<li><strong>Priority Level:</strong> {assignment.priority.capitalize()}</li>"
-        summary += "</ul>"
-        
-        if assignment.description:
-            summary += f"<h4>Description</h4><p>{assignment.description}</p>"
-        
-        summary += "<h4>Suggested Approach</h4>"
-        summary += "<ol>"
-        summary += "<li>Review all assignment requirements carefully</li>"
-        summary += "<li>Break down the assignment into manageable tasks</li>"
-        summary += "<li>Create a timeline for completion</li>"
-        summary += "<li>Gather necessary resources and materials</li>"
-        summary += "<li>Start with the most challenging parts first</li>"
-        summary += "</ol>"
-        
-        # urgent warning if due soon
-        if days_until_due <= 3:
-            summary += '<div class="alert alert-warning">⚠️ <strong>Urgent:</strong> This assignment is due very soon. Focus your efforts on completing it as soon as possible.</div>'
-    
-    if notes:
-        summary += f"<h4>Additional Notes</h4><p>{notes}</p>"
-    
-    summary += "<h4>Study Tips</h4>"
-    summary += "<ul>"
-    summary += "<li>Stay organized and keep track of your progress</li>"
-    summary += "<li>Take regular breaks to maintain focus</li>"
-    summary += "<li>Seek help if you encounter difficulties</li>"
-    summary += "<li>Review your work before final submission</li>"
-    summary += "</ul>"
-    
-    return summary
+    return app.jinja_env.get_template('fallback_summary.html').render(
+        assignment=assignment,
+        notes=notes,
+        now=datetime.now()
+    )
 
 # setup database tables
 def init_db():
     with app.app_context():
         db.create_all()
-        print("Database initialized successfully!")
+        # bring existing databases up to date (indexes, new columns)
+        version = migrations.upgrade(db.engine)
+        # a recreated database restarts data versions, so drop fragments keyed by old ones
+        fragment_cache.clear()
+        print(f"Database initialized successfully! (schema version {version})")
+
+# explicit schema setup and migrations for deployments: flask --app wsgi init-db
+@app.cli.command('init-db')
+def init_db_command():
+    init_db()
+
+# fingerprint and precompress static/ into static/dist (run on deploy and after editing CSS/JS)
+@app.cli.command('build-assets')
+def build_assets_command():
+    manifest = build_static_assets(app.static_folder)
+    static_assets.load()
+    for name, entry in manifest['files'].items():
+        print(f"{name} -> {entry['path']} ({', '.join(entry['encodings']) or 'uncompressed'})")
 
 # run the app
 if __name__ == '__main__':
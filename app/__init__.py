@@ -3,24 +3,55 @@ File: app/__init__.py
 Description:
     Application factory for the AI Study & Productivity Assistant.
     Initializes Flask, database connections, and authentication.
+    Tables are not created at startup; run ``flask --app run init-db``
+    once per database instead.
 """
 
+import click
 from flask import Flask
+from flask.cli import with_appcontext
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
 from dotenv import load_dotenv
 import os
 
+from db_config import load_database_config, install_sqlite_pragmas
+from identity_cache import IdentityCache
+
 db = SQLAlchemy()
 login_manager = LoginManager()
 
+# users loaded recently by this process, reused for USER_CACHE_TTL seconds
+user_cache = IdentityCache(ttl=int(os.getenv("USER_CACHE_TTL", "30")))
+
 
 # REQUIRED for Flask-Login
 from app.models import User
 
+@db.event.listens_for(User, "after_update")
+@db.event.listens_for(User, "after_delete")
+def invalidate_cached_user(mapper, connection, target):
+    """
+    Drops a user from the cache as soon as this process changes it.
+    """
+    user_cache.invalidate(target.id)
+
+
+def _load_detached_user(user_id):
+    user = db.session.get(User, user_id)
+    if user is not None:
+        db.session.expunge(user)
+    return user
+
+
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    """
+    Loads the session's user, reading the database only on a cache miss.
+    The cached instance stays detached; each request gets a merged copy.
+    """
+    user = user_cache.get(int(user_id), _load_detached_user)
+    return db.session.merge(user, load=False) if user else None
 
 
 def create_app():
@@ -34,7 +65,8 @@ def create_app():
 
     app = Flask(__name__)
     app.config["SECRET_KEY"] = os.getenv("SECRET_KEY", "dev-secret-key")
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///site.db"
+    # app.py owns DATABASE_URL; its tables don't match app/models.py
+    load_database_config(app.config, "sqlite:///site.db", url_variable="FACTORY_DATABASE_URL")
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
     db.init_app(app)
@@ -45,6 +77,18 @@ def create_app():
     app.register_blueprint(main)
 
     with app.app_context():
-        db.create_all()
+        install_sqlite_pragmas(db.engine, app.config["SQLITE_PRAGMAS"])
+
+    app.cli.add_command(init_db_command)
+
+    return app
 
-    return app
\ No newline at end of file
+
+@click.command("init-db")
+@with_appcontext
+def init_db_command():
+    """
+    Creates any missing database tables.
+    """
+    db.create_all()
+    click.echo("Database initialized.")
\ No newline at end of file
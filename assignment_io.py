@@ -0,0 +1,261 @@
+"""
+File: assignment_io.py
+Description:
+    Streaming import and export of assignments as CSV and iCalendar.
+    Parsers read one line at a time and yield one validated row at a
+    time, and exporters yield one chunk per assignment, so neither side
+    ever holds a whole file in memory.
+
+    CSV columns: title, description, due_date, priority, status (header
+    names are case-insensitive; only title and due_date are required).
+    iCalendar: every VTODO or VEVENT becomes an assignment (SUMMARY,
+    DESCRIPTION, DUE/DTSTART/DTEND, PRIORITY, STATUS).
+"""
+
+import csv
+import io
+from datetime import datetime
+
+FORMATS = ("csv", "ics")
+CSV_COLUMNS = ("title", "description", "due_date", "priority", "status")
+PRIORITIES = ("low", "medium", "high")
+STATUSES = ("pending", "completed", "overdue")
+TITLE_MAX_LENGTH = 200
+# shortest valid row in either format: "x,1/1/2024" in a title,due_date CSV
+MIN_ROW_BYTES = 10
+
+_DATE_FORMATS = ("%Y-%m-%d", "%Y-%m-%d %H:%M", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M", "%Y-%m-%dT%H:%M:%S",
+                 "%m/%d/%Y")
+_ICS_DATE_FORMATS = ("%Y%m%dT%H%M%S", "%Y%m%d")
+_ICS_ESCAPES = {"n": "\n", "N": "\n", ",": ",", ";": ";", "\\": "\\"}
+
+
+class RowError(ValueError):
+    """
+    A row that failed validation; line is where it started in the input.
+    """
+
+    def __init__(self, line, message):
+        super().__init__(message)
+        self.line = line
+
+
+def detect_format(filename, default="csv"):
+    """
+    Picks the format from a file name's extension.
+    """
+    extension = (filename or "").rsplit(".", 1)[-1].lower()
+    if extension in ("ics", "ical", "ifb", "icalendar"):
+        return "ics"
+    return "csv" if extension == "csv" else default
+
+
+def iter_rows(lines, fmt):
+    """
+    Yields (line number, values) for every valid row, or a RowError
+    instance for every invalid one, so callers can report and carry on.
+
+    Args:
+        lines: Iterable of text lines (an open text file works)
+        fmt (str): "csv" or "ics"
+    """
+    parse = parse_ics if fmt == "ics" else parse_csv
+    for line, raw in parse(lines):
+        try:
+            yield line, validate_row(raw)
+        except ValueError as e:
+            yield RowError(line, str(e))
+
+
+def parse_csv(lines):
+    """
+    Yields (line number, raw dict) for each CSV record.
+    """
+    reader = csv.DictReader(lines)
+    if reader.fieldnames is None:
+        return
+    names = [(name or "").strip().lower() for name in reader.fieldnames]
+    if "title" not in names or "due_date" not in names:
+        raise RowError(1, "CSV header must include title and due_date columns")
+    reader.fieldnames = names
+    for record in reader:
+        yield reader.line_num, record
+
+
+def parse_ics(lines):
+    """
+    Yields (line number, raw dict) for each VTODO/VEVENT, unfolding
+    continuation lines as they stream past.
+    """
+    component = None
+    start_line = 0
+    pending, pending_line = None, 0
+
+    def handle(content, line):
+        nonlocal component, start_line
+        name, _, value = content.partition(":")
+        name = name.split(";", 1)[0].upper()
+        if name == "BEGIN" and value.upper() in ("VTODO", "VEVENT"):
+            component, start_line = {}, line
+        elif name == "END" and value.upper() in ("VTODO", "VEVENT") and component is not None:
+            finished, component = component, None
+            return finished
+        elif component is not None and name in ("SUMMARY", "DESCRIPTION", "DUE", "DTSTART", "DTEND",
+                                                "PRIORITY", "STATUS"):
+            component.setdefault(name, _ics_unescape(value))
+        return None
+
+    for number, line in enumerate(lines, 1):
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and pending is not None:
+            pending += line[1:]
+            continue
+        if pending is not None:
+            finished = handle(pending, pending_line)
+            if finished is not None:
+                yield start_line, _ics_to_raw(finished)
+        pending, pending_line = line, number
+    if pending is not None:
+        finished = handle(pending, pending_line)
+        if finished is not None:
+            yield start_line, _ics_to_raw(finished)
+
+
+def validate_row(raw):
+    """
+    Checks and normalizes one raw row into Assignment column values.
+
+    Raises:
+        ValueError: With a message describing the first problem found
+    """
+    title = (raw.get("title") or "").strip()
+    if not title:
+        raise ValueError("title is required")
+    if len(title) > TITLE_MAX_LENGTH:
+        raise ValueError(f"title is longer than {TITLE_MAX_LENGTH} characters")
+
+    due_date = raw.get("due_date")
+    if not isinstance(due_date, datetime):
+        due_date = _parse_date((due_date or "").strip())
+
+    priority = (raw.get("priority") or "medium").strip().lower()
+    if priority not in PRIORITIES:
+        raise ValueError(f"priority must be one of {', '.join(PRIORITIES)}")
+    status = (raw.get("status") or "pending").strip().lower()
+    if status not in STATUSES:
+        raise ValueError(f"status must be one of {', '.join(STATUSES)}")
+
+    return {
+        "title": title,
+        "description": (raw.get("description") or "").strip(),
+        "due_date": due_date,
+        "priority": priority,
+        "status": status,
+    }
+
+
+def export_csv(rows):
+    """
+    Yields a CSV document one line at a time.
+
+    Args:
+        rows: Iterable of objects/rows with the CSV_COLUMNS attributes
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+    for row in rows:
+        writer.writerow((row.title, row.description or "", row.due_date.strftime("%Y-%m-%d %H:%M"),
+                         row.priority, row.status))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # the header alone, for an empty export
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def export_ics(rows, stamp=None):
+    """
+    Yields an iCalendar document with one VTODO per assignment.
+    """
+    stamp = (stamp or datetime.utcnow()).strftime("%Y%m%dT%H%M%SZ")
+    yield "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//AI Study Assistant//Assignments//EN\r\n"
+    for row in rows:
+        priority = {"high": 1, "medium": 5, "low": 9}.get(row.priority, 5)
+        status = "COMPLETED" if row.status == "completed" else "NEEDS-ACTION"
+        lines = [
+            "BEGIN:VTODO",
+            f"UID:assignment-{row.id}@study-assistant",
+            f"DTSTAMP:{stamp}",
+            f"SUMMARY:{_ics_escape(row.title)}",
+            f"DUE:{row.due_date.strftime('%Y%m%dT%H%M%S')}",
+            f"PRIORITY:{priority}",
+            f"STATUS:{status}",
+        ]
+        if row.description:
+            lines.append(f"DESCRIPTION:{_ics_escape(row.description)}")
+        lines.append("END:VTODO")
+        yield "".join(_ics_fold(line) + "\r\n" for line in lines)
+    yield "END:VCALENDAR\r\n"
+
+
+def _parse_date(value):
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    raise ValueError(f"due_date {value!r} is not a date (use YYYY-MM-DD)")
+
+
+def _ics_to_raw(component):
+    due = component.get("DUE") or component.get("DTSTART") or component.get("DTEND") or ""
+    raw = {
+        "title": component.get("SUMMARY", ""),
+        "description": component.get("DESCRIPTION", ""),
+        "due_date": _parse_ics_date(due),
+        "status": "completed" if component.get("STATUS", "").upper() == "COMPLETED" else "pending",
+    }
+    # RFC 5545: 1-4 high, 5 medium, 6-9 low, 0 undefined
+    priority = component.get("PRIORITY", "").strip()
+    if priority.isdigit() and int(priority):
+        raw["priority"] = "high" if int(priority) <= 4 else "medium" if int(priority) == 5 else "low"
+    return raw
+
+
+def _parse_ics_date(value):
+    value = value.strip().rstrip("Z")
+    for fmt in _ICS_DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    # validate_row reports the bad value
+    return value
+
+
+def _ics_unescape(value):
+    out = []
+    chars = iter(value)
+    for char in chars:
+        if char == "\\":
+            following = next(chars, "")
+            out.append(_ICS_ESCAPES.get(following, following))
+        else:
+            out.append(char)
+    return "".join(out)
+
+
+def _ics_escape(value):
+    return (value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\r\n", "\\n").replace("\n", "\\n"))
+
+
+def _ics_fold(line, limit=75):
+    # RFC 5545 folds lines longer than 75 octets; characters are close enough here
+    if len(line) <= limit:
+        return line
+    parts = [line[:limit]]
+    parts += [" " + line[i:i + limit - 1] for i in range(limit, len(line), limit - 1)]
+    return "\r\n".join(parts)
@@ -0,0 +1,127 @@
+"""
+File: bench_compression.py
+Description:
+    Bytes on the wire and CPU cost of response compression, per route.
+    Every GET route from bench_routes.py, plus a live server-sent event
+    stream of AI output, is requested without Accept-Encoding, with gzip
+    and (when the brotli package is installed) with br. Reports the
+    average body size, the ratio to the uncompressed body, the CPU time
+    of the whole request on the serving thread, and the part of it the
+    compressor itself used.
+
+Usage:
+    python benchmarks/bench_compression.py --assignments 200 --requests 20
+    python benchmarks/bench_compression.py --routes assignments,progress --level 1 --output compression.json
+"""
+
+import argparse
+import json
+import sys
+import time
+import uuid
+
+from bench_routes import ROUTES, Route, Worker, app, seed, study_app
+
+from response_compression import brotli
+
+
+def _streamed_summary(worker):
+    # a queued job that the event stream runs, so the output really arrives in chunks
+    app.config["AI_STREAMING"] = True
+    try:
+        response = worker.client.post("/ai-summary", data={"assignment_id": str(worker.assignment_id),
+                                                           # unique notes miss the AI cache every time
+                                                           "notes": uuid.uuid4().hex})
+    finally:
+        app.config["AI_STREAMING"] = False
+    worker.stream_job_id = response.headers["Location"].rstrip("/").rsplit("/", 1)[-1]
+    return {}
+
+
+ROUTES = [route for route in ROUTES if route.method == "GET" and route.name != "logout"] + [
+    Route("ai stream (sse)", "GET", "/jobs/{stream_job_id}/stream", "job_stream", _streamed_summary),
+]
+
+
+def measure(worker, route, encoding, requests):
+    """
+    Returns average body bytes, request CPU ms and compressor CPU ms for
+    one route and Accept-Encoding value.
+    """
+    headers = {"Accept-Encoding": encoding} if encoding else {}
+    client = worker.anonymous if route.anonymous else worker.client
+    body = request_cpu = 0.0
+    study_app.response_compressor.reset()
+    for _ in range(requests):
+        kwargs = route.prepare(worker) if route.prepare else {}
+        url = route.path.format(assignment_id=worker.assignment_id, plan_id=worker.plan_id, job_id=worker.job_id,
+                                stream_job_id=getattr(worker, "stream_job_id", None))
+        # the test client serves the request on this thread, so thread CPU time is the request's
+        started = time.thread_time()
+        response = client.open(url, method=route.method, headers=headers, **kwargs)
+        data = response.get_data()
+        request_cpu += time.thread_time() - started
+        response.close()
+        if response.status_code >= 400:
+            raise RuntimeError(f"{route.name}: HTTP {response.status_code}")
+        body += len(data)
+    compressor = study_app.response_compressor.stats().get(encoding, {})
+    return {
+        "bytes": round(body / requests),
+        "request_cpu_ms": round(request_cpu / requests * 1000, 3),
+        "compress_cpu_ms": round(compressor.get("cpu_seconds", 0.0) / requests * 1000, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--assignments", type=int, default=200, help="assignments for the requesting user")
+    parser.add_argument("--requests", type=int, default=20, help="requests per route and encoding")
+    parser.add_argument("--level", type=int, default=None, help="gzip level (default: COMPRESS_LEVEL)")
+    parser.add_argument("--min-size", type=int, default=None, help="minimum body size (default: COMPRESS_MIN_SIZE)")
+    parser.add_argument("--routes", default="", help="comma-separated route name filters")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    compressor = study_app.response_compressor
+    if not app.config["COMPRESS_RESPONSES"]:
+        sys.exit("COMPRESS_RESPONSES is off; nothing to measure")
+    if args.level is not None:
+        compressor.level = args.level
+    if args.min_size is not None:
+        compressor.min_size = args.min_size
+
+    filters = [part.strip() for part in args.routes.split(",") if part.strip()]
+    routes = [r for r in ROUTES if not filters or any(f in r.name for f in filters)]
+    encodings = [""] + (["gzip", "br"] if brotli is not None else ["gzip"])
+
+    study_app.job_queue.eager = True
+    user_id, username, ids = seed(1, args.assignments, 1, 0)[0]
+    worker = Worker(0, user_id, username, ids)
+    worker.setup()
+
+    print(f"{args.assignments} assignments, {args.requests} requests per route and encoding, "
+          f"gzip level {compressor.level}, min size {compressor.min_size} B")
+    print(f"{'route':<22} {'encoding':<9} {'bytes':>9} {'ratio':>7} {'request cpu ms':>15} {'compress cpu ms':>16}")
+    results = []
+    for route in routes:
+        # one untimed request warms caches and lazy imports
+        measure(worker, route, "", 1)
+        identity = None
+        for encoding in encodings:
+            result = measure(worker, route, encoding, args.requests)
+            identity = identity or result["bytes"]
+            result.update(route=route.name, encoding=encoding or "identity",
+                          ratio=round(result["bytes"] / identity, 3) if identity else 1.0)
+            results.append(result)
+            print(f"{route.name:<22} {result['encoding']:<9} {result['bytes']:>9} {result['ratio']:>7.2f} "
+                  f"{result['request_cpu_ms']:>15.3f} {result['compress_cpu_ms']:>16.3f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"assignments": args.assignments, "requests": args.requests, "level": compressor.level,
+                       "min_size": compressor.min_size, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+File: bench_dashboard_overdue.py
+Description:
+    Benchmarks /dashboard latency under concurrent readers, comparing the
+    old per-request overdue rewrite (load every row, flip status in
+    Python, commit) with the throttled set-based sweep.
+
+Usage:
+    python benchmarks/bench_dashboard_overdue.py --readers 8 --requests 50 --assignments 500
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db"))
+
+from wsgi import study_app  # noqa: E402
+
+app, db = study_app.app, study_app.db
+Assignment, User = study_app.Assignment, study_app.User
+
+
+def legacy_overdue_rewrite(user_id):
+    """
+    The dashboard's original behaviour: rewrite every row on every GET.
+    """
+    for assignment in Assignment.query.filter_by(user_id=user_id).all():
+        if assignment.status != "completed" and assignment.due_date < datetime.now():
+            assignment.status = "overdue"
+    db.session.commit()
+
+
+def seed(readers, assignments_per_user):
+    """
+    Creates one user per reader, each with a mix of past and future due dates.
+    """
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        password_hash = study_app.password_hasher.hash("benchmark")
+        now = datetime.now()
+        for i in range(readers):
+            user = User(username=f"reader{i}", email=f"reader{i}@example.com", password_hash=password_hash)
+            db.session.add(user)
+            db.session.flush()
+            db.session.add_all(
+                Assignment(
+                    title=f"Assignment {n}",
+                    due_date=now + timedelta(days=n % 30 - 10),
+                    priority=("low", "medium", "high")[n % 3],
+                    status="completed" if n % 4 == 0 else "pending",
+                    user_id=user.id,
+                )
+                for n in range(assignments_per_user)
+            )
+        db.session.commit()
+
+
+def run(readers, requests_per_reader):
+    """
+    Runs the readers concurrently and returns per-request latencies (ms) and error count.
+    """
+    latencies, errors = [], []
+    lock = threading.Lock()
+    start = threading.Barrier(readers)
+
+    def reader(i):
+        client = app.test_client()
+        client.post("/login", data={"username": f"reader{i}", "password": "benchmark"})
+        start.wait()
+        for _ in range(requests_per_reader):
+            started = time.perf_counter()
+            try:
+                response = client.get("/dashboard")
+                failed = response.status_code != 200
+            except Exception:
+                failed = True
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                latencies.append(elapsed)
+                if failed:
+                    errors.append(i)
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, len(errors)
+
+
+def report(label, latencies, errors, wall):
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(f"{label:<8} requests={len(ordered):<5} errors={errors:<3} "
+          f"p50={statistics.median(ordered):7.2f}ms p95={p95:7.2f}ms "
+          f"throughput={len(ordered) / wall:7.1f} req/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--assignments", type=int, default=500)
+    args = parser.parse_args()
+
+    sweep = study_app.sweep_overdue_if_due
+    for label, overdue_hook in (("before", legacy_overdue_rewrite), ("after", sweep)):
+        seed(args.readers, args.assignments)
+        study_app._overdue_swept_at.clear()
+        study_app.sweep_overdue_if_due = overdue_hook
+        started = time.perf_counter()
+        latencies, errors = run(args.readers, args.requests)
+        report(label, latencies, errors, time.perf_counter() - started)
+    study_app.sweep_overdue_if_due = sweep
+
+
+if __name__ == "__main__":
+    main()
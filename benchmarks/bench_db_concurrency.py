@@ -0,0 +1,141 @@
+"""
+File: bench_db_concurrency.py
+Description:
+    Mixed read/write load against a SQLite file with the default journal
+    settings and with the tuned settings from db_config.py. Reader threads
+    run the dashboard's queries while writer threads add and update
+    assignments; reports throughput, read latency and "database is
+    locked" errors for each profile.
+
+Usage:
+    python benchmarks/bench_db_concurrency.py --readers 8 --writers 2 --seconds 5
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db"))
+os.environ.setdefault("AI_BACKEND", "stub")
+
+from sqlalchemy import create_engine, text  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+
+from db_config import install_sqlite_pragmas  # noqa: E402
+from wsgi import study_app  # noqa: E402
+
+PROFILES = {
+    # what SQLite does out of the box (pysqlite waits up to 5s on a lock)
+    "default": {"journal_mode": "DELETE", "synchronous": "FULL", "busy_timeout": 5000},
+    "tuned": None,  # filled from the app config
+}
+
+READ_STATS = text("SELECT status, priority, count(id) FROM assignment WHERE user_id = :u GROUP BY status, priority")
+READ_UPCOMING = text("SELECT id, title, due_date FROM assignment WHERE user_id = :u AND status = 'pending' "
+                     "ORDER BY due_date, id LIMIT 10")
+WRITE_INSERT = text("INSERT INTO assignment (title, description, due_date, priority, status, user_id, created_at, "
+                    "updated_at) VALUES ('New', '', :d, 'medium', 'pending', :u, :d, :d)")
+WRITE_UPDATE = text("UPDATE assignment SET status = 'completed' WHERE id = (SELECT MIN(id) FROM assignment "
+                    "WHERE user_id = :u AND status = 'pending')")
+
+
+def make_engine(path, pragmas):
+    engine = create_engine(f"sqlite:///{path}", pool_size=32, max_overflow=0)
+    install_sqlite_pragmas(engine, pragmas)
+    return engine
+
+
+def seed(engine, users, per_user):
+    study_app.db.metadata.create_all(engine)
+    now = datetime.now()
+    with engine.begin() as connection:
+        connection.execute(text("INSERT INTO user (id, username, email, password_hash, created_at) "
+                                "VALUES (:id, :n, :e, 'x', :d)"),
+                           [{"id": u, "n": f"u{u}", "e": f"u{u}@example.com", "d": now} for u in range(1, users + 1)])
+        connection.execute(WRITE_INSERT, [{"u": u, "d": now + timedelta(days=n % 30)}
+                                          for u in range(1, users + 1) for n in range(per_user)])
+
+
+def run(engine, readers, writers, seconds, users):
+    stop = time.perf_counter() + seconds
+    read_latencies, counts, lock = [], {"reads": 0, "writes": 0, "locked": 0}, threading.Lock()
+
+    def reader(index):
+        user_id = index % users + 1
+        while time.perf_counter() < stop:
+            started = time.perf_counter()
+            try:
+                with engine.connect() as connection:
+                    connection.execute(READ_STATS, {"u": user_id}).all()
+                    connection.execute(READ_UPCOMING, {"u": user_id}).all()
+            except OperationalError:
+                with lock:
+                    counts["locked"] += 1
+                continue
+            with lock:
+                counts["reads"] += 1
+                read_latencies.append(time.perf_counter() - started)
+
+    def writer(index):
+        user_id = index % users + 1
+        while time.perf_counter() < stop:
+            try:
+                with engine.begin() as connection:
+                    connection.execute(WRITE_INSERT, {"u": user_id, "d": datetime.now()})
+                    connection.execute(WRITE_UPDATE, {"u": user_id})
+            except OperationalError:
+                with lock:
+                    counts["locked"] += 1
+                continue
+            with lock:
+                counts["writes"] += 1
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads += [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    read_latencies.sort()
+    p95 = read_latencies[int(len(read_latencies) * 0.95) - 1] if read_latencies else 0.0
+    return {
+        "reads/s": counts["reads"] / seconds,
+        "writes/s": counts["writes"] / seconds,
+        "read p50 ms": statistics.median(read_latencies) * 1000 if read_latencies else 0.0,
+        "read p95 ms": p95 * 1000,
+        "locked": counts["locked"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--users", type=int, default=4)
+    parser.add_argument("--assignments", type=int, default=500, help="assignments per user")
+    args = parser.parse_args()
+
+    PROFILES["tuned"] = study_app.app.config["SQLITE_PRAGMAS"]
+    workdir = tempfile.mkdtemp()
+    print(f"{args.readers} readers, {args.writers} writers, {args.seconds}s per profile")
+    for name, pragmas in PROFILES.items():
+        engine = make_engine(os.path.join(workdir, f"{name}.db"), pragmas)
+        seed(engine, args.users, args.assignments)
+        result = run(engine, args.readers, args.writers, args.seconds, args.users)
+        engine.dispose()
+        print(f"{name:<8} " + "  ".join(f"{key}={value:8.1f}" if isinstance(value, float) else f"{key}={value}"
+                                        for key, value in result.items()))
+        print(f"         pragmas: {pragmas}")
+
+
+if __name__ == "__main__":
+    main()
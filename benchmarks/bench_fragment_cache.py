@@ -0,0 +1,95 @@
+"""
+File: bench_fragment_cache.py
+Description:
+    Compares dashboard and progress latency with the rendered-fragment
+    cache off, in memory and on disk, for a read-heavy mix where one in
+    every --write-every requests completes an assignment (which moves the
+    user to a new data version). Reports latency, hit ratio and the
+    memory or disk the cache uses.
+
+Usage:
+    python benchmarks/bench_fragment_cache.py --assignments 200 --requests 300
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db"))
+os.environ.setdefault("AI_BACKEND", "stub")
+
+from fragment_cache import FragmentCache, make_backend  # noqa: E402
+from wsgi import study_app  # noqa: E402
+
+app, db = study_app.app, study_app.db
+
+
+def seed(count):
+    """
+    Creates one user with count assignments and returns their ids.
+    """
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        user = study_app.User(username="bench", email="bench@example.com",
+                              password_hash=study_app.password_hasher.hash("benchmark"))
+        db.session.add(user)
+        db.session.flush()
+        assignments = [
+            study_app.Assignment(title=f"Assignment {n}", description="Read chapter and take notes",
+                                 due_date=datetime.now() + timedelta(days=n % 30 - 5), user_id=user.id,
+                                 priority=("low", "medium", "high")[n % 3])
+            for n in range(count)
+        ]
+        db.session.add_all(assignments)
+        db.session.commit()
+        return [a.id for a in assignments]
+
+
+def run(client, assignment_ids, requests, write_every):
+    """
+    Returns ms per page view for the read/write mix.
+    """
+    pages = ("/dashboard", "/progress")
+    elapsed = 0.0
+    views = 0
+    for n in range(requests):
+        if write_every and n and n % write_every == 0:
+            client.post(f"/assignment/complete/{assignment_ids[n % len(assignment_ids)]}")
+            continue
+        started = time.perf_counter()
+        client.get(pages[n % 2])
+        elapsed += time.perf_counter() - started
+        views += 1
+    return elapsed * 1000 / views
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--assignments", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--write-every", type=int, default=20, help="one write per N requests (0 = read only)")
+    args = parser.parse_args()
+
+    print(f"{'backend':<8} {'ms/view':>8} {'hit ratio':>10} {'items':>6} {'bytes':>10}")
+    for kind in ("none", "memory", "disk"):
+        assignment_ids = seed(args.assignments)
+        study_app.user_cache.clear()
+        directory = tempfile.mkdtemp() if kind == "disk" else None
+        study_app.fragment_cache = FragmentCache(make_backend(kind, directory=directory))
+        client = app.test_client()
+        client.post("/login", data={"username": "bench", "password": "benchmark"})
+
+        ms = run(client, assignment_ids, args.requests, args.write_every)
+        stats = study_app.fragment_cache.stats()
+        size = stats.get("disk_bytes", stats.get("memory_bytes", 0))
+        print(f"{kind:<8} {ms:>8.2f} {stats.get('hit_ratio', 0.0):>10.2%} {stats.get('items', 0):>6} {size:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+File: bench_login.py
+Description:
+    Measures logins per second during a simulated login storm: many
+    threads POST /login at once while password hashing runs either on
+    the request threads (pool size 0) or on a process pool of the given
+    size.
+
+Usage:
+    python benchmarks/bench_login.py --threads 16 --logins 64 --pool-sizes 0 1 2 4
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db"))
+os.environ.setdefault("AI_BACKEND", "stub")
+
+from wsgi import study_app  # noqa: E402
+
+from passwords import PasswordHasher  # noqa: E402
+
+app, db = study_app.app, study_app.db
+
+
+def seed(users):
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        pwhash = study_app.password_hasher.hash("benchmark")
+        db.session.add_all(
+            study_app.User(username=f"student{i}", email=f"student{i}@example.com", password_hash=pwhash)
+            for i in range(users)
+        )
+        db.session.commit()
+
+
+def storm(threads, logins):
+    """
+    Runs `logins` logins spread over `threads` threads; returns logins/sec.
+    """
+    barrier = threading.Barrier(threads + 1)
+    failures = []
+
+    def worker(index):
+        client = app.test_client()
+        barrier.wait()
+        for n in range(index, logins, threads):
+            response = client.post("/login", data={"username": f"student{n % threads}", "password": "benchmark"})
+            if response.status_code != 302:
+                failures.append(n)
+            client.get("/logout")
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for t in workers:
+        t.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - started
+    if failures:
+        raise SystemExit(f"{len(failures)} logins failed")
+    return logins / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--pool-sizes", type=int, nargs="+", default=[0, 1, 2, 4])
+    args = parser.parse_args()
+
+    seed(args.threads)
+    print(f"hash method: {app.config['PASSWORD_HASH_METHOD']}, cpus: {os.cpu_count()}, threads: {args.threads}")
+    for pool_size in args.pool_sizes:
+        hasher = PasswordHasher(app.config['PASSWORD_HASH_METHOD'], app.config['PASSWORD_SALT_LENGTH'], pool_size)
+        study_app.password_hasher = hasher
+        if pool_size:
+            hasher.verify(hasher.hash("warm up"), "warm up")  # start the workers outside the timing
+        rate = storm(args.threads, args.logins)
+        hasher.shutdown()
+        print(f"pool size {pool_size}: {rate:7.1f} logins/sec")
+
+
+if __name__ == "__main__":
+    main()
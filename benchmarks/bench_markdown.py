@@ -0,0 +1,153 @@
+"""
+File: bench_markdown.py
+Description:
+    Micro-benchmark for markdown rendering of large model outputs.
+    Compares the original multi-pass markdown_to_html with the
+    single-pass renderer on whole documents, and on streamed output as
+    the app handled it before: each blank-line-separated block rendered
+    when it completed, then the whole text rendered again for the final
+    result. MarkdownRenderer is fed token by token and its chunks are
+    joined for the final result.
+
+Usage:
+    python benchmarks/bench_markdown.py --size-kb 200 --stream-kb 50 --repeat 5
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from markdown_renderer import MarkdownRenderer, render_markdown  # noqa: E402
+
+
+def legacy_markdown_to_html(text):
+    """
+    The original markdown_to_html from app.py, kept for comparison.
+    """
+    text = text.replace('### ', '<h4>').replace('\n##', '</h4>\n<h3>').replace('\n#', '</h3>\n<h2>')
+    import re
+    text = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', text)
+    lines = text.split('\n')
+    html_lines = []
+    in_list = False
+    for line in lines:
+        stripped = line.strip()
+        if stripped.startswith('- ') or stripped.startswith('* '):
+            if not in_list:
+                html_lines.append('<ul>')
+                in_list = True
+            html_lines.append(f'<li>{stripped[2:]}</li>')
+        elif stripped and stripped[0].isdigit() and '. ' in stripped[:5]:
+            if not in_list:
+                html_lines.append('<ol>')
+                in_list = 'ol'
+            content = stripped.split('. ', 1)[1] if '. ' in stripped else stripped
+            html_lines.append(f'<li>{content}</li>')
+        else:
+            if in_list:
+                html_lines.append('</ol>' if in_list == 'ol' else '</ul>')
+                in_list = False
+            if stripped:
+                html_lines.append(f'<p>{line}</p>')
+            else:
+                html_lines.append('')
+    if in_list:
+        html_lines.append('</ol>' if in_list == 'ol' else '</ul>')
+    return '\n'.join(html_lines)
+
+
+SECTION = """## Week {n} Schedule
+**Goal:** finish the draft for assignment {n} before the weekend.
+
+### Daily Plan
+- Monday: review the **rubric** and outline the main sections
+- Tuesday: research sources and take notes (2 hours)
+- Wednesday: write the introduction & first section
+1. Check progress against the milestone
+2. Adjust the time allocation if you are behind
+3. Ask the instructor about anything unclear
+
+Remember to take short breaks every 50 minutes and keep notes < 1 page.
+
+"""
+
+
+def make_document(size_kb):
+    parts, size, n = [], 0, 1
+    while size < size_kb * 1024:
+        parts.append(SECTION.format(n=n))
+        size += len(parts[-1])
+        n += 1
+    return "".join(parts)
+
+
+def time_it(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def stream_tokens(tokens):
+    renderer = MarkdownRenderer()
+    out = [renderer.feed(token) for token in tokens]
+    out.append(renderer.close())
+    return "".join(out)
+
+
+def legacy_stream(tokens):
+    """
+    The previous stream_generation: render each block once a blank line
+    ends it, then render the accumulated text again for the result.
+    """
+    parts, block = [], ""
+    for token in tokens:
+        parts.append(token)
+        block += token
+        if "\n\n" in block:
+            complete, block = block.rsplit("\n\n", 1)
+            if complete.strip():
+                legacy_markdown_to_html(complete.strip())
+    if block.strip():
+        legacy_markdown_to_html(block.strip())
+    return legacy_markdown_to_html("".join(parts).strip())
+
+
+def report(title, document, results):
+    megabytes = len(document.encode()) / 1_000_000
+    print(f"{title}: {megabytes * 1000:.0f} KB, {document.count(chr(10))} lines")
+    baseline = results[0][1]
+    for label, seconds in results:
+        print(f"  {label:<34} {seconds * 1000:9.2f} ms  {megabytes / seconds:7.1f} MB/s  "
+              f"{baseline / seconds:6.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-kb", type=int, default=200)
+    parser.add_argument("--stream-kb", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    document = make_document(args.size_kb)
+    report("whole document", document, [
+        ("legacy markdown_to_html", time_it(lambda: legacy_markdown_to_html(document), args.repeat)),
+        ("render_markdown", time_it(lambda: render_markdown(document), args.repeat)),
+    ])
+
+    streamed = make_document(args.stream_kb)
+    tokens = re.findall(r"\s*\S+", streamed)
+    report(f"streamed ({len(tokens)} tokens)", streamed, [
+        ("legacy per block + final render", time_it(lambda: legacy_stream(tokens), args.repeat)),
+        ("MarkdownRenderer.feed per token", time_it(lambda: stream_tokens(tokens), args.repeat)),
+    ])
+
+
+if __name__ == "__main__":
+    main()
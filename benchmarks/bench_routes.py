@@ -0,0 +1,484 @@
+"""
+File: bench_routes.py
+Description:
+    Route-level load benchmark. Seeds synthetic data at every requested
+    scale (users x assignments per user), then drives each route in
+    app.py through the Flask test client from --concurrency threads, each
+    logged in as its own user. Reports p50/p95/p99 latency, throughput,
+    SQL statements per request and peak Python memory per request, and
+    writes everything as JSON so runs can be compared.
+
+    Only the users doing the requests (one per thread) get the full
+    --assignments; the rest get --background-assignments each, so large
+    user counts stay cheap to seed while still filling the tables.
+
+Usage:
+    python benchmarks/bench_routes.py --users 1,1000 --assignments 10,1000,100000 \
+        --concurrency 1,8 --requests 50 --output results.json
+    python benchmarks/bench_routes.py --routes dashboard,progress --compare results.json
+"""
+
+import argparse
+import io
+import json
+import math
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db"))
+os.environ.setdefault("AI_BACKEND", "stub")
+
+from sqlalchemy import event  # noqa: E402
+
+from wsgi import study_app  # noqa: E402
+
+app, db = study_app.app, study_app.db
+
+PASSWORD = "benchmark"
+BATCH_TOKEN = "bench-token"
+SEED_BATCH = 5000
+
+
+class Route:
+    """
+    One benchmarked request.
+
+    Args:
+        name (str): Label used in reports and for --routes filtering
+        method (str): HTTP method
+        path (str): URL template, formatted with the worker's context
+        endpoint (str): Flask endpoint it exercises (for coverage checks)
+        prepare (callable): Untimed setup run before each request; gets
+            the worker and returns extra request kwargs (data, headers...)
+        anonymous (bool): Send the request without the login cookie
+    """
+
+    def __init__(self, name, method, path, endpoint, prepare=None, anonymous=False):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.endpoint = endpoint
+        self.prepare = prepare
+        self.anonymous = anonymous
+
+
+def _new_assignment(worker):
+    # a throwaway assignment for the routes that delete or edit one
+    with app.app_context():
+        assignment = study_app.Assignment(title="Scratch", due_date=datetime.now() + timedelta(days=3),
+                                          user_id=worker.user_id)
+        db.session.add(assignment)
+        db.session.commit()
+        worker.scratch_id = assignment.id
+    return {}
+
+
+def _register_form(worker):
+    worker.counter += 1
+    name = f"new{worker.index}x{worker.counter}x{time.monotonic_ns()}"
+    return {"data": {"username": name, "email": f"{name}@example.com", "password": PASSWORD}}
+
+
+def _login_form(worker):
+    return {"data": {"username": worker.username, "password": PASSWORD}}
+
+
+def _relogin(worker):
+    worker.client.post("/login", data=_login_form(worker)["data"])
+    return {}
+
+
+def _add_form(worker):
+    due = (datetime.now() + timedelta(days=7)).strftime("%Y-%m-%d")
+    return {"data": {"title": "Benchmark essay", "description": "Draft", "due_date": due, "priority": "high"}}
+
+
+def _edit_form(worker):
+    due = (datetime.now() + timedelta(days=9)).strftime("%Y-%m-%d")
+    return {"data": {"title": "Edited essay", "description": "Revised", "due_date": due, "priority": "low",
+                     "status": "pending"}}
+
+
+def _import_file(worker):
+    rows = "".join(f"Imported {n},,{(datetime.now() + timedelta(days=n)).strftime('%Y-%m-%d')},medium,pending\n"
+                   for n in range(1, 21))
+    upload = (io.BytesIO(("title,description,due_date,priority,status\n" + rows).encode()), "bench.csv")
+    return {"data": {"file": upload}, "content_type": "multipart/form-data"}
+
+
+def _plan_form(worker):
+    return {"data": {"assignment_ids": [str(i) for i in worker.assignment_ids[:5]]}}
+
+
+def _summary_form(worker):
+    return {"data": {"assignment_id": str(worker.assignment_ids[0]), "notes": ""}}
+
+
+def _batch_body(worker):
+    return {"json": {"items": [{"user_id": worker.user_id, "assignment_ids": worker.assignment_ids[:5]}]},
+            "headers": {"Authorization": f"Bearer {BATCH_TOKEN}"}}
+
+
+ROUTES = [
+    Route("index", "GET", "/", "index", anonymous=True),
+    Route("register form", "GET", "/register", "register", anonymous=True),
+    Route("register", "POST", "/register", "register", _register_form, anonymous=True),
+    Route("login form", "GET", "/login", "login", anonymous=True),
+    Route("login", "POST", "/login", "login", _login_form, anonymous=True),
+    Route("dashboard", "GET", "/dashboard", "dashboard"),
+    Route("assignments", "GET", "/assignments", "assignments"),
+    Route("assignments filtered", "GET", "/assignments?priority=high&status=pending", "assignments"),
+    Route("api assignments", "GET", "/api/assignments", "api_assignments"),
+    Route("add form", "GET", "/assignment/add", "add_assignment"),
+    Route("add", "POST", "/assignment/add", "add_assignment", _add_form),
+    Route("import form", "GET", "/assignments/import", "import_assignments"),
+    Route("import csv", "POST", "/assignments/import", "import_assignments", _import_file),
+    Route("export csv", "GET", "/assignments/export.csv", "export_assignments"),
+    Route("export ics", "GET", "/assignments/export.ics", "export_assignments"),
+    Route("edit form", "GET", "/assignment/edit/{assignment_id}", "edit_assignment"),
+    Route("edit", "POST", "/assignment/edit/{scratch_id}", "edit_assignment",
+          lambda w: dict(_new_assignment(w), **_edit_form(w))),
+    Route("complete", "POST", "/assignment/complete/{scratch_id}", "complete_assignment", _new_assignment),
+    Route("delete", "POST", "/assignment/delete/{scratch_id}", "delete_assignment", _new_assignment),
+    Route("study plan form", "GET", "/ai-study-plan", "ai_study_plan"),
+    Route("study plan", "POST", "/ai-study-plan", "ai_study_plan", _plan_form),
+    Route("study plan view", "GET", "/study-plans/{plan_id}", "view_study_plan"),
+    Route("study plan refresh", "POST", "/study-plans/{plan_id}/refresh", "refresh_study_plan"),
+    Route("summary form", "GET", "/ai-summary", "ai_summary"),
+    Route("summary", "POST", "/ai-summary", "ai_summary", _summary_form),
+    Route("job result", "GET", "/jobs/{job_id}", "job_result"),
+    Route("job stream", "GET", "/jobs/{job_id}/stream", "job_stream"),
+    Route("job status", "GET", "/jobs/{job_id}/status", "job_status"),
+    Route("progress", "GET", "/progress", "progress"),
+    Route("batch api", "POST", "/api/study-plans/batch", "batch_study_plans", _batch_body, anonymous=True),
+    Route("ai status", "GET", "/ai/status", "ai_status", anonymous=True),
+    Route("cache status", "GET", "/cache/status", "cache_status", anonymous=True),
+    Route("metrics", "GET", "/metrics", "metrics", anonymous=True),
+    Route("logout", "GET", "/logout", "logout", _relogin),
+]
+
+
+class Worker:
+    """
+    One simulated user: a logged-in client, an anonymous client and the
+    ids its routes need.
+    """
+
+    def __init__(self, index, user_id, username, assignment_ids):
+        self.index = index
+        self.user_id = user_id
+        self.username = username
+        self.assignment_ids = assignment_ids
+        self.assignment_id = assignment_ids[0]
+        self.scratch_id = None
+        self.plan_id = None
+        self.job_id = None
+        self.counter = 0
+        self.client = app.test_client()
+        # no cookie jar, so logging in through it never sticks
+        self.anonymous = app.test_client(use_cookies=False)
+
+    def setup(self):
+        """
+        Logs in and creates the study plan and job the job routes read.
+        """
+        self.client.post("/login", data=_login_form(self)["data"])
+        response = self.client.post("/ai-summary", data=_summary_form(self)["data"])
+        self.job_id = response.headers["Location"].rstrip("/").rsplit("/", 1)[-1]
+        self.client.post("/ai-study-plan", data=_plan_form(self)["data"])
+        with app.app_context():
+            self.plan_id = db.session.execute(
+                db.select(study_app.StudyPlan.id).filter_by(user_id=self.user_id)
+                .order_by(study_app.StudyPlan.id.desc())
+            ).scalars().first()
+
+    def request(self, route, kwargs=None):
+        """
+        Runs one request and returns (seconds, status code, SQL statements);
+        setup is neither timed nor counted.
+        """
+        if kwargs is None:
+            kwargs = route.prepare(self) if route.prepare else {}
+        url = route.path.format(assignment_id=self.assignment_id, scratch_id=self.scratch_id,
+                                plan_id=self.plan_id, job_id=self.job_id)
+        client = self.anonymous if route.anonymous else self.client
+        statements = getattr(_local, "statements", 0)
+        started = time.perf_counter()
+        response = client.open(url, method=route.method, **kwargs)
+        # streamed bodies only run when consumed
+        response.get_data()
+        elapsed = time.perf_counter() - started
+        response.close()
+        return elapsed, response.status_code, getattr(_local, "statements", 0) - statements
+
+
+# statements issued by the current thread, counted per request
+_local = threading.local()
+
+
+def _count_statement(*args):
+    _local.statements = getattr(_local, "statements", 0) + 1
+
+
+def seed(users, assignments, active, background):
+    """
+    Creates users (the first `active` with `assignments` each, the rest
+    with `background` each) using bulk inserts; returns the active users
+    as (id, username, assignment ids).
+    """
+    User, Assignment = study_app.User, study_app.Assignment
+    password_hash = study_app.password_hasher.hash(PASSWORD)
+    now = datetime.now()
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        for start in range(0, users, SEED_BATCH):
+            db.session.execute(db.insert(User), [
+                {"username": f"user{n}", "email": f"user{n}@example.com", "password_hash": password_hash}
+                for n in range(start, min(users, start + SEED_BATCH))
+            ])
+        user_ids = db.session.execute(db.select(User.id).order_by(User.id)).scalars().all()
+
+        def rows():
+            for position, user_id in enumerate(user_ids):
+                for n in range(assignments if position < active else background):
+                    yield {"title": f"Assignment {n}", "description": "Read the chapter and take notes",
+                           "due_date": now + timedelta(days=n % 60 - 10, hours=n % 24),
+                           "priority": ("low", "medium", "high")[n % 3],
+                           "status": "completed" if n % 4 == 0 else "pending", "user_id": user_id}
+
+        batch = []
+        for row in rows():
+            batch.append(row)
+            if len(batch) == SEED_BATCH:
+                db.session.execute(db.insert(Assignment), batch)
+                batch = []
+        if batch:
+            db.session.execute(db.insert(Assignment), batch)
+        db.session.commit()
+
+        result = []
+        for position, user_id in enumerate(user_ids[:active]):
+            ids = db.session.execute(
+                db.select(Assignment.id).filter_by(user_id=user_id, status="pending").order_by(Assignment.id)
+                .limit(20)
+            ).scalars().all()
+            result.append((user_id, f"user{position}", ids))
+        study_app.ai_cache.clear()
+    study_app.user_cache.clear()
+    study_app.fragment_cache.clear()
+    return result
+
+
+def percentile(sorted_values, p):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(p / 100 * len(sorted_values)) - 1)]
+
+
+def run_route(workers, route, requests):
+    """
+    Spreads `requests` over the workers in parallel and returns the stats.
+    """
+    def work(worker, count):
+        return [worker.request(route) for _ in range(count)]
+
+    shares = [requests // len(workers) + (1 if n < requests % len(workers) else 0) for n in range(len(workers))]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(workers)) as pool:
+        results = list(pool.map(work, workers, shares))
+    wall = time.perf_counter() - started
+
+    samples = [sample for worker_samples in results for sample in worker_samples]
+    latencies = sorted(seconds * 1000 for seconds, _, _ in samples)
+    errors = sum(1 for _, status, _ in samples if status >= 500)
+    statements = sum(count for _, _, count in samples)
+    return {
+        "route": route.name,
+        "method": route.method,
+        "path": route.path,
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "mean_ms": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        "throughput_rps": round(len(latencies) / wall, 1) if wall else 0.0,
+        "queries_per_request": round(statements / len(latencies), 2) if latencies else 0.0,
+    }
+
+
+def peak_memory(worker, route, samples):
+    """
+    Largest Python allocation peak of a single request, in KiB.
+    """
+    tracemalloc.start()
+    try:
+        peak = 0
+        for _ in range(samples):
+            kwargs = route.prepare(worker) if route.prepare else {}
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            worker.request(route, kwargs)
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+    return round(peak / 1024, 1)
+
+
+def uncovered_endpoints(routes):
+    """
+    Endpoints registered on the app that no route in the suite exercises.
+    """
+    covered = {route.endpoint for route in routes}
+    return sorted(rule.endpoint for rule in app.url_map.iter_rules()
+                  if rule.endpoint != "static" and rule.endpoint not in covered)
+
+
+def run_scenario(users, assignments, concurrency, args, routes):
+    """
+    Seeds one data size and benchmarks every route at one concurrency level.
+    """
+    active = min(concurrency, users)
+    started = time.perf_counter()
+    seeded = seed(users, assignments, active, args.background_assignments)
+    seed_seconds = time.perf_counter() - started
+
+    workers = [Worker(n, user_id, username, ids or [0]) for n, (user_id, username, ids) in enumerate(seeded)]
+    for worker in workers:
+        worker.setup()
+
+    results = []
+    for route in routes:
+        # one untimed request per worker warms caches and lazy imports
+        for worker in workers:
+            worker.request(route)
+        result = run_route(workers, route, args.requests)
+        if args.memory_samples:
+            result["peak_kb"] = peak_memory(workers[0], route, args.memory_samples)
+        results.append(result)
+        print(f"  {route.method:<4} {route.name:<22} p50 {result['p50_ms']:>8.2f}  p95 {result['p95_ms']:>8.2f}  "
+              f"p99 {result['p99_ms']:>8.2f} ms  {result['queries_per_request']:>6.1f} q/req  "
+              f"{result.get('peak_kb', 0):>8.1f} KiB  {result['errors']} errors")
+    return {
+        "users": users,
+        "assignments_per_user": assignments,
+        "concurrency": concurrency,
+        "active_users": active,
+        "seed_seconds": round(seed_seconds, 2),
+        "routes": results,
+    }
+
+
+def compare(baseline_path, scenarios):
+    """
+    Prints p95 changes against an earlier JSON result file.
+    """
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    previous = {
+        (s["users"], s["assignments_per_user"], s["concurrency"], r["method"], r["route"]): r
+        for s in baseline["scenarios"] for r in s["routes"]
+    }
+    print(f"\ncompared with {baseline_path} ({baseline['meta'].get('commit', '?')}):")
+    print(f"{'scenario':<22} {'route':<28} {'p95 before':>11} {'p95 now':>9} {'change':>8} {'q/req':>12}")
+    for s in scenarios:
+        label = f"{s['users']}u x {s['assignments_per_user']}a x {s['concurrency']}c"
+        for r in s["routes"]:
+            before = previous.get((s["users"], s["assignments_per_user"], s["concurrency"], r["method"], r["route"]))
+            if before is None:
+                continue
+            change = (r["p95_ms"] / before["p95_ms"] - 1) if before["p95_ms"] else 0.0
+            print(f"{label:<22} {r['method'] + ' ' + r['route']:<28} {before['p95_ms']:>11.2f} {r['p95_ms']:>9.2f} "
+                  f"{change:>+8.0%} {before['queries_per_request']:>5.1f} -> {r['queries_per_request']:<5.1f}")
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def int_list(value):
+    return [int(part) for part in value.split(",") if part.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int_list, default=[1, 100], help="comma-separated user counts")
+    parser.add_argument("--assignments", type=int_list, default=[10, 1000],
+                        help="comma-separated assignments per active user")
+    parser.add_argument("--concurrency", type=int_list, default=[1, 4], help="comma-separated thread counts")
+    parser.add_argument("--background-assignments", type=int, default=5,
+                        help="assignments for each user that is not sending requests")
+    parser.add_argument("--requests", type=int, default=30, help="requests per route and scenario")
+    parser.add_argument("--memory-samples", type=int, default=3, help="requests traced for peak memory (0 = skip)")
+    parser.add_argument("--routes", default="", help="comma-separated route name filters")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="earlier JSON result file to compare p95 against")
+    args = parser.parse_args()
+
+    filters = [part.strip() for part in args.routes.split(",") if part.strip()]
+    routes = [r for r in ROUTES if not filters or any(f in r.name for f in filters)]
+    missing = uncovered_endpoints(ROUTES)
+    if missing:
+        print(f"warning: routes without a benchmark: {', '.join(missing)}")
+
+    # AI jobs run inline so job routes see finished results, and the batch API is enabled
+    study_app.job_queue.eager = True
+    app.config["BATCH_API_TOKEN"] = BATCH_TOKEN
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", _count_statement)
+
+    scenarios = []
+    try:
+        for users in args.users:
+            for assignments in args.assignments:
+                for concurrency in args.concurrency:
+                    print(f"\n{users} users, {assignments} assignments per active user, concurrency {concurrency}")
+                    scenarios.append(run_scenario(users, assignments, concurrency, args, routes))
+    finally:
+        event.remove(engine, "before_cursor_execute", _count_statement)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": engine.url.get_backend_name(),
+            "requests_per_route": args.requests,
+            "background_assignments": args.background_assignments,
+            # process-wide high-water mark (KiB on Linux)
+            "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        },
+        "scenarios": scenarios,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nresults written to {args.output}")
+    if args.compare:
+        compare(args.compare, scenarios)
+
+
+if __name__ == "__main__":
+    main()
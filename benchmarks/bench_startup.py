@@ -0,0 +1,152 @@
+"""
+File: bench_startup.py
+Description:
+    Measures cold start for both entry points: wsgi.py (app.py) and the
+    create_app() factory used by run.py. Every run is a fresh Python
+    process, so nothing is shared between runs. Reports the time to
+    import (and build) the app, the time to serve the first request,
+    the whole process, and whether the HTTP client stack was imported
+    before any AI call was made.
+
+Usage:
+    python benchmarks/bench_startup.py --runs 10
+    python benchmarks/bench_startup.py --runs 5 --importtime 15 --output startup.json
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# run in the child; prints one JSON line with its timings
+CHILD = """
+import json, sys, time
+started = time.perf_counter()
+{load}
+loaded = time.perf_counter()
+response = app.test_client().get("/")
+response.get_data()
+answered = time.perf_counter()
+print(json.dumps({{
+    "load_ms": (loaded - started) * 1000,
+    "first_response_ms": (answered - loaded) * 1000,
+    "status": response.status_code,
+    "requests_imported": "requests" in sys.modules,
+    "modules": len(sys.modules),
+}}))
+"""
+
+ENTRY_POINTS = {
+    "wsgi": "from wsgi import app",
+    "factory": "from app import create_app\napp = create_app()",
+}
+
+# module whose imports --importtime breaks down
+ENTRY_MODULES = {"wsgi": "wsgi", "factory": "app"}
+
+
+def child_env(database_url, factory_database_url):
+    env = dict(os.environ)
+    env.update(DATABASE_URL=database_url, FACTORY_DATABASE_URL=factory_database_url, AI_BACKEND="stub")
+    env["PYTHONPATH"] = ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    return env
+
+
+def prepare_database(env):
+    """
+    Creates both schemas once so first requests hit real tables.
+    """
+    subprocess.run([sys.executable, "-c", "from wsgi import study_app; study_app.init_db()"],
+                   cwd=ROOT, env=env, check=True, stdout=subprocess.DEVNULL)
+    subprocess.run([sys.executable, "-m", "flask", "--app", "run", "init-db"],
+                   cwd=ROOT, env=env, check=True, stdout=subprocess.DEVNULL)
+
+
+def run_once(name, env):
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", CHILD.format(load=ENTRY_POINTS[name])],
+                            cwd=ROOT, env=env, check=True, capture_output=True, text=True)
+    total = (time.perf_counter() - started) * 1000
+    sample = json.loads(result.stdout.strip().splitlines()[-1])
+    sample["process_ms"] = total
+    return sample
+
+
+def import_times(name, env, top):
+    """
+    Returns the slowest imports made by the entry point's own module
+    (cumulative microseconds, from -X importtime).
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", ENTRY_POINTS[name]],
+                            cwd=ROOT, env=env, check=True, capture_output=True, text=True)
+    rows, pending = [], []
+    # children are listed before their parent, one indent level deeper
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|( +)(\S+)", line)
+        if not match:
+            continue
+        depth = (len(match.group(2)) - 1) // 2
+        if depth == 1:
+            pending.append((int(match.group(1)), match.group(3)))
+        elif depth == 0:
+            if match.group(3) == ENTRY_MODULES[name]:
+                rows.extend(pending)
+            pending = []
+    return sorted(rows, reverse=True)[:top]
+
+
+def summarize(samples):
+    summary = {}
+    for field in ("load_ms", "first_response_ms", "process_ms"):
+        values = [s[field] for s in samples]
+        summary[field] = {"median": round(statistics.median(values), 1), "min": round(min(values), 1)}
+    summary["status"] = samples[0]["status"]
+    summary["requests_imported"] = any(s["requests_imported"] for s in samples)
+    summary["modules"] = samples[0]["modules"]
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes per entry point")
+    parser.add_argument("--entry", choices=sorted(ENTRY_POINTS), action="append",
+                        help="entry point to measure (default: all)")
+    parser.add_argument("--importtime", type=int, default=0, metavar="N",
+                        help="also list the N slowest top-level imports")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    env = child_env("sqlite:///" + os.path.join(workdir, "startup.db"),
+                    "sqlite:///" + os.path.join(workdir, "factory.db"))
+    prepare_database(env)
+
+    results = {}
+    print(f"{'entry':<8} {'load ms':>14} {'first resp ms':>14} {'process ms':>14} {'requests':>9} {'modules':>8}")
+    for name in args.entry or sorted(ENTRY_POINTS):
+        summary = summarize([run_once(name, env) for _ in range(args.runs)])
+        results[name] = summary
+        cells = [f"{summary[f]['median']:>6.1f} ({summary[f]['min']:>5.1f})"
+                 for f in ("load_ms", "first_response_ms", "process_ms")]
+        print(f"{name:<8} {cells[0]:>14} {cells[1]:>14} {cells[2]:>14} "
+              f"{'yes' if summary['requests_imported'] else 'no':>9} {summary['modules']:>8}")
+        if args.importtime:
+            summary["slowest_imports"] = import_times(name, env, args.importtime)
+            for micros, module in summary["slowest_imports"]:
+                print(f"    {micros / 1000:>8.1f} ms  {module}")
+    print("times are median (min) over", args.runs, "runs")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"runs": args.runs, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+File: bench_user_loader.py
+Description:
+    Counts SQL statements per authenticated request with the Flask-Login
+    identity cache disabled (every request reads the user row) and
+    enabled, and reports the reduction per route.
+
+Usage:
+    python benchmarks/bench_user_loader.py --requests 50
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db"))
+os.environ.setdefault("AI_BACKEND", "stub")
+
+from sqlalchemy import event  # noqa: E402
+
+from wsgi import study_app  # noqa: E402
+
+app, db = study_app.app, study_app.db
+
+ROUTES = [
+    ("GET", "/dashboard"),
+    ("GET", "/assignments"),
+    ("GET", "/progress"),
+    ("GET", "/ai-study-plan"),
+    ("POST", "/assignment/complete/{assignment_id}"),
+]
+
+
+def seed():
+    """
+    Creates one user with a few assignments and returns an assignment id.
+    """
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        user = study_app.User(username="bench", email="bench@example.com",
+                              password_hash=study_app.password_hasher.hash("benchmark"))
+        db.session.add(user)
+        db.session.flush()
+        assignments = [
+            study_app.Assignment(title=f"Assignment {n}", due_date=datetime.now() + timedelta(days=n + 1),
+                                 user_id=user.id)
+            for n in range(20)
+        ]
+        db.session.add_all(assignments)
+        db.session.commit()
+        return assignments[0].id
+
+
+def measure(client, method, url, requests):
+    """
+    Returns (statements per request, ms per request) for one route.
+    """
+    count = 0
+
+    def record(*args):
+        nonlocal count
+        count += 1
+
+    with app.app_context():
+        engine = db.engine
+    client.open(url, method=method)  # warm up
+    event.listen(engine, "before_cursor_execute", record)
+    started = time.perf_counter()
+    try:
+        for _ in range(requests):
+            client.open(url, method=method)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return count / requests, (time.perf_counter() - started) * 1000 / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    assignment_id = seed()
+    client = app.test_client()
+    client.post("/login", data={"username": "bench", "password": "benchmark"})
+
+    print(f"{'route':<40} {'queries (off)':>14} {'queries (on)':>13} {'saved':>7} {'ms (off)':>9} {'ms (on)':>8}")
+    for method, url in ROUTES:
+        url = url.format(assignment_id=assignment_id)
+        results = []
+        for ttl in (0, 30):
+            study_app.user_cache.ttl = ttl
+            study_app.user_cache.clear()
+            results.append(measure(client, method, url, args.requests))
+        (off_queries, off_ms), (on_queries, on_ms) = results
+        print(f"{method + ' ' + url:<40} {off_queries:>14.1f} {on_queries:>13.1f} "
+              f"{off_queries - on_queries:>7.1f} {off_ms:>9.2f} {on_ms:>8.2f}")
+    print(f"\nidentity cache: {study_app.user_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+File: db_config.py
+Description:
+    Database settings shared by app.py and the app package factory. The
+    URI, pool sizing and SQLite tuning come from the environment. The two
+    apps have different schemas, so the factory reads its URI from
+    FACTORY_DATABASE_URL rather than DATABASE_URL. SQLite
+    connections are switched to WAL so readers are not blocked by the
+    dashboard's writes, use synchronous=NORMAL (safe with WAL), wait on
+    locks instead of failing at once, and keep a larger page cache.
+"""
+
+import os
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+# PRAGMA names that take identifiers rather than numbers
+_TEXT_PRAGMAS = {"journal_mode", "synchronous"}
+
+
+def load_database_config(config, default_uri, environ=os.environ, url_variable="DATABASE_URL"):
+    """
+    Fills SQLALCHEMY_DATABASE_URI, SQLALCHEMY_ENGINE_OPTIONS and
+    SQLITE_PRAGMAS in a Flask config from environment variables.
+
+    Args:
+        config (Config): Flask app.config, set before the SQLAlchemy extension starts
+        default_uri (str): URI used when the URL variable is not set
+        url_variable (str): environment variable holding the database URL
+    """
+    uri = environ.get(url_variable, default_uri)
+    config["SQLALCHEMY_DATABASE_URI"] = uri
+
+    if make_url(uri).get_backend_name() == "sqlite":
+        config["SQLITE_PRAGMAS"] = {
+            "journal_mode": environ.get("SQLITE_JOURNAL_MODE", "WAL"),
+            "synchronous": environ.get("SQLITE_SYNCHRONOUS", "NORMAL"),
+            "busy_timeout": int(environ.get("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+            # negative sizes are KiB rather than pages
+            "cache_size": -int(environ.get("SQLITE_CACHE_SIZE_KB", "20000")),
+        }
+        return
+
+    # server databases (PostgreSQL, MySQL, ...) get an explicitly sized pool
+    config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", {
+        "pool_size": int(environ.get("DB_POOL_SIZE", "10")),
+        "max_overflow": int(environ.get("DB_MAX_OVERFLOW", "20")),
+        "pool_timeout": float(environ.get("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(environ.get("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": True,
+    })
+    config["SQLITE_PRAGMAS"] = {}
+
+
+def install_sqlite_pragmas(engine, pragmas):
+    """
+    Runs the given PRAGMAs on every new connection of a SQLite engine.
+    Does nothing for other databases or an empty mapping.
+    """
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    statements = []
+    for name, value in pragmas.items():
+        if name in _TEXT_PRAGMAS and not str(value).isalpha():
+            raise ValueError(f"invalid value for PRAGMA {name}: {value!r}")
+        statements.append(f"PRAGMA {name}={value if name in _TEXT_PRAGMAS else int(value)}")
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
@@ -0,0 +1,221 @@
+"""
+File: fragment_cache.py
+Description:
+    Cache for rendered page fragments. Keys include the user's data
+    version, so a change to the user's data simply moves readers to a new
+    key and old entries age out; nothing has to be deleted on write.
+    Backends are pluggable: an in-process LRU bounded by memory, or a
+    directory of files shared by every worker on the host.
+"""
+
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+
+class MemoryBackend:
+    """
+    In-process LRU bounded by the memory its strings use.
+
+    Args:
+        max_bytes (int): Memory the cached strings may take up
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        size = sys.getsizeof(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= sys.getsizeof(old)
+            self._entries[key] = value
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= sys.getsizeof(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {"backend": "memory", "items": len(self._entries), "memory_bytes": self._bytes,
+                    "max_bytes": self.max_bytes, "evictions": self.evictions}
+
+
+class DiskBackend:
+    """
+    One file per entry in a directory, for several workers on one host.
+    Writes are atomic (temp file + rename), and entries older than ttl
+    are ignored and pruned now and then. Entries are rendered pages, so
+    the directory is created private to this account and one owned by
+    another account is refused.
+
+    Args:
+        directory (str): Where entries are stored (created if missing)
+        ttl (float): Seconds an entry stays valid
+
+    Raises:
+        PermissionError: If the directory belongs to another user
+    """
+
+    PRUNE_EVERY = 200
+
+    def __init__(self, directory, ttl=3600, clock=time.time):
+        self.directory = directory
+        self.ttl = ttl
+        self._clock = clock
+        self._writes = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        if hasattr(os, "getuid") and os.stat(directory).st_uid != os.getuid():
+            raise PermissionError(f"fragment cache directory {directory!r} is owned by another user")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            if self._clock() - os.path.getmtime(path) > self.ttl:
+                return None
+            with open(path, encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def set(self, key, value):
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(value)
+            os.replace(temp_path, self._path(key))
+        except OSError:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            return
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % self.PRUNE_EVERY == 0
+        if prune:
+            self.prune()
+
+    def prune(self):
+        """
+        Deletes expired entries; returns how many were removed.
+        """
+        removed = 0
+        cutoff = self._clock() - self.ttl
+        for entry in os.scandir(self.directory):
+            try:
+                if entry.name.endswith(".html") and entry.stat().st_mtime < cutoff:
+                    os.unlink(entry.path)
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+
+    def clear(self):
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".html"):
+                try:
+                    os.unlink(entry.path)
+                except OSError:
+                    pass
+
+    def stats(self):
+        items = size = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".html"):
+                items += 1
+                size += entry.stat().st_size
+        return {"backend": "disk", "items": items, "disk_bytes": size, "memory_bytes": 0,
+                "directory": self.directory}
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".html")
+
+
+class FragmentCache:
+    """
+    Rendered-fragment cache in front of a backend.
+
+    Args:
+        backend: MemoryBackend, DiskBackend or None (caching disabled)
+        on_lookup (callable): Called with True/False for every hit/miss
+    """
+
+    def __init__(self, backend=None, on_lookup=None):
+        self.backend = backend
+        self.on_lookup = on_lookup
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_render(self, key, render):
+        """
+        Returns the cached fragment for key, or calls render() and stores it.
+        """
+        if self.backend is None:
+            return render()
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if self.on_lookup is not None:
+            self.on_lookup(value is not None)
+        if value is None:
+            value = render()
+            self.backend.set(key, value)
+        return value
+
+    def clear(self):
+        if self.backend is not None:
+            self.backend.clear()
+
+    def stats(self):
+        """
+        Returns hit/miss counters, the hit ratio and the backend's size.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            counts = {"hits": self.hits, "misses": self.misses,
+                      "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0}
+        counts.update(self.backend.stats() if self.backend is not None else {"backend": "none"})
+        return counts
+
+
+def make_backend(kind, directory=None, max_bytes=32 * 1024 * 1024, ttl=3600):
+    """
+    Builds a backend from configuration: "memory", "disk" or "none".
+    """
+    if kind == "none":
+        return None
+    if kind == "disk":
+        if not directory:
+            raise ValueError("the disk fragment cache needs a directory")
+        return DiskBackend(directory, ttl=ttl)
+    if kind == "memory":
+        return MemoryBackend(max_bytes=max_bytes)
+    raise ValueError(f"unknown fragment cache backend: {kind!r}")
@@ -0,0 +1,60 @@
+"""
+Bulk Study Plan Generator for AI Study Assistant
+Generates study plans for many students at once (e.g. a whole cohort).
+
+The input is a JSON file (or "-" for stdin) holding a list of items, or
+an object with an "items" list, in the same format the
+/api/study-plans/batch endpoint accepts:
+
+    [{"user_id": 1, "assignment_ids": [3, 4]}, {"user_id": 2, "assignment_ids": [9]}]
+
+Usage:
+    python generate_plans.py cohort.json --concurrency 8
+"""
+
+import argparse
+import json
+import sys
+
+from wsgi import study_app
+
+
+def load_items(path):
+    """Read batch items from a JSON file or stdin"""
+    if path == '-':
+        data = json.load(sys.stdin)
+    else:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    return data.get('items') if isinstance(data, dict) else data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate study plans for many users at once")
+    parser.add_argument('input', help="JSON file with batch items, or - for stdin")
+    parser.add_argument('--concurrency', type=int, default=study_app.app.config['BATCH_MAX_WORKERS'],
+                        help="plans generated at the same time (capped by BATCH_MAX_WORKERS)")
+    parser.add_argument('--json', action='store_true', help="print the full report as JSON")
+    args = parser.parse_args()
+
+    with study_app.app.app_context():
+        try:
+            items = study_app.parse_batch_items(load_items(args.input))
+        except (TypeError, ValueError) as e:
+            parser.error(str(e))
+        report = study_app.generate_study_plans_batch(items, args.concurrency)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for item in report['items']:
+            outcome = f"plan {item['study_plan_id']}" if item['status'] == 'finished' else f"FAILED: {item['error']}"
+            print(f"#{item['index']:<4} user {item['user_id']:<6} {item['latency_ms']:>9.1f} ms  {outcome}")
+        print(f"\n{report['succeeded']} succeeded, {report['failed']} failed "
+              f"in {report['elapsed_ms']:.1f} ms (concurrency {report['concurrency']})")
+
+    return 1 if report['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
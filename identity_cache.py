@@ -0,0 +1,80 @@
+"""
+File: identity_cache.py
+Description:
+    Small per-process cache for the objects Flask-Login loads on every
+    authenticated request. Entries live for a short TTL, so other
+    processes' changes are picked up quickly, and can be dropped
+    explicitly when this process changes a user.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class IdentityCache:
+    """
+    Thread-safe TTL + LRU cache keyed by user id.
+
+    Args:
+        ttl (float): Seconds an entry stays valid (0 disables caching)
+        max_items (int): Entries kept before the least recently used is dropped
+        on_lookup (callable): Called with True/False for every hit/miss
+    """
+
+    def __init__(self, ttl=30, max_items=1024, clock=time.monotonic, on_lookup=None):
+        self.ttl = ttl
+        self.on_lookup = on_lookup
+        self.max_items = max_items
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, load):
+        """
+        Returns the cached value for key, calling load(key) on a miss.
+        None results are not cached, so a deleted user is never remembered.
+        """
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            hit = bool(entry and entry[1] > now)
+            if hit:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self._entries.pop(key, None)
+                self.misses += 1
+        if self.on_lookup is not None:
+            self.on_lookup(hit)
+        if hit:
+            return entry[0]
+
+        value = load(key)
+        if value is not None and self.ttl > 0:
+            with self._lock:
+                self._entries[key] = (value, now + self.ttl)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_items:
+                    self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "items": len(self._entries),
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
@@ -0,0 +1,49 @@
+"""
+Bulk Assignment Importer for AI Study Assistant
+Imports assignments for one user from a CSV or iCalendar (.ics) file.
+The file is read and inserted in batches, so large LMS exports are fine.
+
+CSV columns: title, due_date (required), description, priority, status
+
+Usage:
+    python import_assignments.py testuser assignments.csv
+    python import_assignments.py testuser calendar.ics --batch-size 1000
+"""
+
+import argparse
+import sys
+
+import assignment_io
+from wsgi import study_app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import assignments from a CSV or iCalendar file")
+    parser.add_argument('username', help="user the assignments belong to")
+    parser.add_argument('path', help="CSV or .ics file, or - for stdin")
+    parser.add_argument('--format', choices=assignment_io.FORMATS,
+                        help="file format (default: detected from the file name, else CSV)")
+    parser.add_argument('--batch-size', type=int, default=study_app.app.config['IMPORT_BATCH_SIZE'],
+                        help="rows per INSERT batch")
+    args = parser.parse_args()
+
+    fmt = args.format or assignment_io.detect_format(args.path)
+    with study_app.app.app_context():
+        user = study_app.User.query.filter_by(username=args.username).first()
+        if user is None:
+            parser.error(f"no user named {args.username!r}")
+
+        if args.path == '-':
+            report = study_app.import_assignment_rows(user.id, sys.stdin, fmt, args.batch_size)
+        else:
+            with open(args.path, encoding='utf-8-sig', newline='') as lines:
+                report = study_app.import_assignment_rows(user.id, lines, fmt, args.batch_size)
+
+    for error in report['errors']:
+        print(f"line {error['line']}: {error['error']}", file=sys.stderr)
+    print(f"✅ Imported {report['imported']} assignments for {args.username} ({report['failed']} rows skipped)")
+    return 1 if report['failed'] and not report['imported'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
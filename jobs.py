@@ -0,0 +1,78 @@
+"""
+File: jobs.py
+Description:
+    Bounded background worker pool for slow work such as AI generation.
+    Routes hand work to the queue and return immediately; job state is
+    persisted by the caller so any worker process can report on it.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class QueueFullError(Exception):
+    """
+    Raised when the queue already holds its maximum number of jobs.
+    """
+
+
+class JobQueue:
+    """
+    Thread pool with a cap on how many jobs may be queued or running.
+
+    Args:
+        max_workers (int): Jobs that run at the same time
+        max_pending (int): Jobs that may be queued or running in total
+        eager (bool): Run jobs inline on submit (tests, debugging)
+    """
+
+    def __init__(self, max_workers=4, max_pending=100, eager=False):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.eager = eager
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args):
+        """
+        Schedules func(*args) on the pool.
+
+        Returns:
+            Future: Completes when the job finishes (None in eager mode)
+
+        Raises:
+            QueueFullError: If max_pending jobs are already waiting or running
+        """
+        if self.eager:
+            func(*args)
+            return None
+
+        if not self._slots.acquire(blocking=False):
+            raise QueueFullError(f"job queue is full ({self.max_pending} jobs)")
+        try:
+            future = self._get_executor().submit(func, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def shutdown(self, wait=True):
+        """
+        Stops the worker threads; a later submit starts a new pool.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=wait)
+
+    def _get_executor(self):
+        # created on first use so importing the app never starts threads
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="job-worker"
+                )
+            return self._executor
@@ -0,0 +1,151 @@
+"""
+File: markdown_renderer.py
+Description:
+    Single-pass renderer for the small markdown subset the AI model
+    produces (headers, bullet and numbered lists, bold text). Every line
+    is classified once with plain string checks, text is HTML-escaped
+    before any tags are added, and tags are always balanced. Text can be
+    fed incrementally, so the renderer works behind a token stream.
+"""
+
+import re
+from html import escape, unescape
+
+BOLD_RE = re.compile(r"\*\*(.+?)\*\*")
+TAG_RE = re.compile(r"<[^>]+>")
+
+# characters of plain text kept by html_excerpt
+EXCERPT_LENGTH = 200
+
+# the page already has an <h1>, so "#" starts at <h2>
+HEADER_OFFSET = 1
+
+
+class MarkdownRenderer:
+    """
+    Incremental markdown to HTML renderer.
+
+    feed() returns the HTML for every line completed so far; close()
+    flushes the last partial line and closes any open list. Outputs
+    end with a newline, so concatenating them gives the full document.
+    """
+
+    def __init__(self):
+        self._pending = ""
+        self._open_list = None
+
+    def feed(self, text):
+        """
+        Adds text and returns HTML for the lines it completed.
+
+        Args:
+            text (str): Next piece of markdown (any size, may split lines)
+
+        Returns:
+            str: Rendered HTML ("" if no line was completed)
+        """
+        self._pending += text
+        if "\n" not in text:
+            return ""
+        complete, _, self._pending = self._pending.rpartition("\n")
+        out = []
+        self._render_lines(complete, out)
+        return _join(out)
+
+    def close(self):
+        """
+        Renders any remaining text and closes open tags.
+
+        Returns:
+            str: The final HTML
+        """
+        out = []
+        if self._pending:
+            self._render_lines(self._pending, out)
+            self._pending = ""
+        self._close_list(out)
+        return _join(out)
+
+    def _render_lines(self, text, out):
+        # escaping and bold never cross a line break, so they run once per batch
+        text = inline(text)
+        append = out.append
+        open_list = self._open_list
+        for line in text.split("\n"):
+            stripped = line.strip()
+            first = stripped[:1]
+
+            if first == "-" or first == "*":
+                if stripped[1:2] == " ":
+                    if open_list != "ul":
+                        if open_list:
+                            append(f"</{open_list}>")
+                        append("<ul>")
+                        open_list = "ul"
+                    append(f"<li>{stripped[2:].lstrip()}</li>")
+                    continue
+            elif first.isdecimal():
+                # "12. item": one to three digits, a dot and whitespace
+                dot = stripped.find(".", 1, 4)
+                if dot > 0 and stripped[dot + 1:dot + 2].isspace() and stripped[:dot].isdecimal():
+                    if open_list != "ol":
+                        if open_list:
+                            append(f"</{open_list}>")
+                        append("<ol>")
+                        open_list = "ol"
+                    append(f"<li>{stripped[dot + 1:].lstrip()}</li>")
+                    continue
+
+            if open_list:
+                append(f"</{open_list}>")
+                open_list = None
+            if not stripped:
+                append("")
+            elif first == "#" and (hashes := len(stripped) - len(stripped.lstrip("#"))) <= 6 \
+                    and stripped[hashes:hashes + 1].isspace():
+                # "## title": one to six hashes and whitespace
+                level = min(hashes + HEADER_OFFSET, 6)
+                append(f"<h{level}>{stripped[hashes:].lstrip()}</h{level}>")
+            else:
+                append(f"<p>{stripped}</p>")
+        self._open_list = open_list
+
+    def _close_list(self, out):
+        if self._open_list:
+            out.append(f"</{self._open_list}>")
+            self._open_list = None
+
+
+def inline(text):
+    """
+    Escapes text and applies inline formatting (bold).
+    """
+    # a function is faster than a "\1" template, which re expands per match
+    return BOLD_RE.sub(_strong, escape(text, quote=False))
+
+
+def render_markdown(text):
+    """
+    Renders a complete markdown document to HTML.
+    """
+    renderer = MarkdownRenderer()
+    return renderer.feed(text) + renderer.close()
+
+
+def html_excerpt(html, length=EXCERPT_LENGTH):
+    """
+    Reduces rendered HTML to at most length characters of plain text
+    (plus "..." when cut), for previews in listings.
+    """
+    text = " ".join(unescape(TAG_RE.sub(" ", html or "")).split())
+    if len(text) > length:
+        return text[:length].rstrip() + "..."
+    return text
+
+
+def _strong(match):
+    return "<strong>" + match[1] + "</strong>"
+
+
+def _join(lines):
+    return "\n".join(lines) + "\n" if lines else ""
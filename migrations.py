@@ -0,0 +1,180 @@
+"""
+File: migrations.py
+Description:
+    Lightweight schema migrations for existing study_assistant.db files.
+    db.create_all() only creates missing tables, so indexes and columns
+    added to existing tables are applied here. Each migration runs once,
+    in version order, and the applied version is recorded in the
+    schema_version table. Migrations must be idempotent because a fresh
+    database already has everything create_all() builds, and portable
+    (SQLAlchemy DDL or plain SQL) because DATABASE_URL may point at
+    PostgreSQL or MySQL.
+
+Usage:
+    python migrations.py
+"""
+
+from sqlalchemy import (Column, ForeignKey, Index, Integer, MetaData, Table, false, insert, inspect, select,
+                        text)
+
+from markdown_renderer import html_excerpt
+
+MIGRATIONS = []
+
+
+def migration(version):
+    """
+    Registers a migration function under a schema version.
+
+    Args:
+        version (int): Version the database is at after the migration runs
+    """
+    def register(func):
+        MIGRATIONS.append((version, func))
+        MIGRATIONS.sort(key=lambda item: item[0])
+        return func
+    return register
+
+
+def current_version(connection):
+    """
+    Reads the applied schema version (0 for a database never migrated).
+    """
+    connection.execute(text("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)"))
+    return connection.execute(text("SELECT MAX(version) FROM schema_version")).scalar() or 0
+
+
+def upgrade(engine):
+    """
+    Applies every pending migration inside one transaction.
+
+    Args:
+        engine: SQLAlchemy engine for the application database
+
+    Returns:
+        int: The schema version after upgrading
+    """
+    with engine.begin() as connection:
+        version = current_version(connection)
+        for target, func in MIGRATIONS:
+            if target > version:
+                func(connection)
+                connection.execute(text("INSERT INTO schema_version (version) VALUES (:v)"), {"v": target})
+                version = target
+    return version
+
+
+def has_column(connection, table, column):
+    """
+    Returns True if the table exists and already has the column.
+    """
+    inspector = inspect(connection)
+    return inspector.has_table(table) and column in {c["name"] for c in inspector.get_columns(table)}
+
+
+@migration(1)
+def add_hot_query_indexes(connection):
+    """
+    Composite indexes for the per-user assignment and study plan queries.
+    """
+    metadata = MetaData()
+    assignment = Table("assignment", metadata, autoload_with=connection)
+    study_plan = Table("study_plan", metadata, autoload_with=connection)
+    for index in (
+        Index("ix_assignment_user_due", assignment.c.user_id, assignment.c.due_date),
+        Index("ix_assignment_user_status_due", assignment.c.user_id, assignment.c.status, assignment.c.due_date),
+        Index("ix_assignment_user_priority_due", assignment.c.user_id, assignment.c.priority, assignment.c.due_date),
+        Index("ix_study_plan_user_created", study_plan.c.user_id, study_plan.c.created_at),
+    ):
+        index.create(connection, checkfirst=True)
+
+
+@migration(2)
+def normalize_study_plan_assignments(connection):
+    """
+    Moves StudyPlan.assignment_ids ("1,2,3" strings) into the indexed
+    study_plan_assignment table and adds the is_stale flag. Ids that no
+    longer point at one of the plan owner's assignments are dropped.
+    """
+    metadata = MetaData()
+    assignment = Table("assignment", metadata, autoload_with=connection)
+    Table("study_plan", metadata, autoload_with=connection)
+    link = Table(
+        "study_plan_assignment", metadata,
+        Column("study_plan_id", Integer, ForeignKey("study_plan.id", ondelete="CASCADE"), primary_key=True),
+        Column("assignment_id", Integer, ForeignKey("assignment.id", ondelete="CASCADE"), primary_key=True),
+    )
+    link.create(connection, checkfirst=True)
+    Index("ix_study_plan_assignment_assignment", link.c.assignment_id).create(connection, checkfirst=True)
+    if not has_column(connection, "study_plan", "is_stale"):
+        # FALSE on PostgreSQL and MySQL, 0 on SQLite
+        default = false().compile(dialect=connection.dialect)
+        connection.execute(text(f"ALTER TABLE study_plan ADD COLUMN is_stale BOOLEAN NOT NULL DEFAULT {default}"))
+    if not has_column(connection, "study_plan", "assignment_ids"):
+        return
+
+    wanted = set()
+    rows = connection.execute(text(
+        "SELECT id, user_id, assignment_ids FROM study_plan WHERE assignment_ids IS NOT NULL AND assignment_ids != ''"
+    ))
+    for plan_id, user_id, assignment_ids in rows:
+        for assignment_id in assignment_ids.split(","):
+            if assignment_id.strip().isdigit():
+                wanted.add((plan_id, user_id, int(assignment_id)))
+    if not wanted:
+        return
+
+    owners = dict(connection.execute(
+        select(assignment.c.id, assignment.c.user_id)
+        .where(assignment.c.id.in_({assignment_id for _, _, assignment_id in wanted}))
+    ).all())
+    existing = set(connection.execute(select(link.c.study_plan_id, link.c.assignment_id)).all())
+    links = {(plan_id, assignment_id) for plan_id, user_id, assignment_id in wanted
+             if owners.get(assignment_id) == user_id} - existing
+    if links:
+        connection.execute(insert(link), [
+            {"study_plan_id": plan_id, "assignment_id": assignment_id} for plan_id, assignment_id in sorted(links)
+        ])
+
+
+@migration(3)
+def add_study_plan_excerpts(connection):
+    """
+    Adds study_plan.excerpt and fills it for existing plans, so listings
+    never need to load the full content.
+    """
+    if has_column(connection, "study_plan", "excerpt"):
+        return
+
+    connection.execute(text("ALTER TABLE study_plan ADD COLUMN excerpt VARCHAR(203) NOT NULL DEFAULT ''"))
+    rows = connection.execute(text("SELECT id, content FROM study_plan")).fetchall()
+    if rows:
+        connection.execute(text("UPDATE study_plan SET excerpt = :excerpt WHERE id = :id"), [
+            {"id": plan_id, "excerpt": html_excerpt(content)} for plan_id, content in rows
+        ])
+
+
+@migration(4)
+def add_user_data_version(connection):
+    """
+    Adds user.data_version, the per-user counter behind API ETags.
+    """
+    if inspect(connection).has_table("user") and not has_column(connection, "user", "data_version"):
+        connection.execute(text('ALTER TABLE "user" ADD COLUMN data_version INTEGER NOT NULL DEFAULT 0'))
+
+
+@migration(5)
+def add_ai_cache_expiry_index(connection):
+    """
+    Indexes ai_response_cache.expires_at, which every lookup and expiry
+    sweep filters on.
+    """
+    if not inspect(connection).has_table("ai_response_cache"):
+        return
+    entries = Table("ai_response_cache", MetaData(), autoload_with=connection)
+    Index("ix_ai_response_cache_expires_at", entries.c.expires_at).create(connection, checkfirst=True)
+
+
+if __name__ == "__main__":
+    from wsgi import study_app
+    study_app.init_db()
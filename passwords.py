@@ -0,0 +1,89 @@
+"""
+File: passwords.py
+Description:
+    Password hashing with configurable cost. Hashing is CPU-bound, so it
+    can optionally run on a small process pool: the request thread only
+    waits on the result, and other requests keep running while a login
+    storm is being hashed. Hashes made with older parameters are
+    reported by needs_rehash() so they can be upgraded at login.
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+class PasswordHasher:
+    """
+    Hashes and verifies passwords with werkzeug.security.
+
+    Args:
+        method (str): werkzeug hash method, e.g. "scrypt" or "pbkdf2:sha256:600000"
+        salt_length (int): Salt characters per hash
+        pool_size (int): Worker processes for hashing (0 hashes on the calling thread)
+    """
+
+    def __init__(self, method="scrypt", salt_length=16, pool_size=0):
+        self.method = method
+        self.salt_length = salt_length
+        self.pool_size = pool_size
+        self._method_prefix = None
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def hash(self, password):
+        """
+        Returns a salted hash of password using the configured parameters.
+        """
+        return self._run(generate_password_hash, password, self.method, self.salt_length)
+
+    def verify(self, pwhash, password):
+        """
+        Returns True if password matches the stored hash.
+        """
+        return self._run(check_password_hash, pwhash, password)
+
+    def needs_rehash(self, pwhash):
+        """
+        Returns True if pwhash was made with different parameters than
+        the configured ones (e.g. after the cost was raised).
+        """
+        if self._method_prefix is None:
+            # werkzeug fills in default parameters ("scrypt" -> "scrypt:32768:8:1"),
+            # so hash once to learn the full method string
+            self._method_prefix = generate_password_hash("", self.method, 1).split("$", 1)[0]
+        method, _, rest = pwhash.partition("$")
+        salt = rest.partition("$")[0]
+        return method != self._method_prefix or len(salt) != self.salt_length
+
+    def shutdown(self):
+        """
+        Stops the worker processes; a later call starts a new pool.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown()
+
+    def _run(self, func, *args):
+        if self.pool_size <= 0:
+            return func(*args)
+        try:
+            return self._get_executor().submit(func, *args).result()
+        except BrokenProcessPool:
+            # a worker died; hash here and start a fresh pool next time
+            self.shutdown()
+            return func(*args)
+
+    def _get_executor(self):
+        # created on first use; spawn avoids forking a process that runs threads
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.pool_size,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
@@ -0,0 +1,138 @@
+"""
+File: query_budget.py
+Description:
+    Query budgets: a view (or any block of code) declares the most SQL
+    statements it may run, and going over is reported while testing or
+    debugging. This catches N+1 loops and repeated lookups as soon as
+    they are written instead of when the data has grown.
+"""
+
+import functools
+import logging
+import threading
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+MODES = ("raise", "log", "off")
+
+
+class QueryBudgetExceeded(Exception):
+    """
+    Raised when a block runs more statements than its budget allows.
+    """
+
+    def __init__(self, name, limit, statements):
+        self.name = name
+        self.limit = limit
+        self.statements = statements
+        listing = "\n".join(f"  {n}. {' '.join(s.split())[:200]}" for n, s in enumerate(statements, 1))
+        super().__init__(f"{name} ran {len(statements)} queries (budget {limit}):\n{listing}")
+
+
+class QueryBudget:
+    """
+    Context manager counting the statements its thread runs.
+
+    Args:
+        tracker (QueryTracker): Tracker installed on the engine
+        limit (int or callable): Statements allowed; a callable is
+            evaluated when the block ends, for work that scales with input
+        name (str): Used in the report
+        mode (str): "raise", "log" or "off"
+    """
+
+    def __init__(self, tracker, limit, name="block", mode="raise"):
+        self.tracker = tracker
+        self.limit = limit
+        self.name = name
+        self.mode = mode
+        self.statements = []
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def __enter__(self):
+        if self.mode != "off":
+            self.tracker._push(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.mode == "off":
+            return False
+        self.tracker._pop(self)
+        limit = self.limit() if callable(self.limit) else self.limit
+        if exc_type is None and self.count > limit:
+            error = QueryBudgetExceeded(self.name, limit, self.statements)
+            if self.mode == "raise":
+                raise error
+            logger.warning("%s", error)
+        return False
+
+
+class QueryTracker:
+    """
+    Feeds an engine's statements to the budgets open on the same thread.
+
+    Args:
+        mode (callable): Returns the mode to use when a budget opens, so
+            it can follow app configuration that changes after import
+    """
+
+    def __init__(self, mode=lambda: "raise"):
+        self.mode = mode
+        self._local = threading.local()
+
+    def install(self, engine):
+        event.listen(engine, "before_cursor_execute", self._record)
+
+    def budget(self, limit, name="block"):
+        """
+        Returns a QueryBudget context manager for one block of code.
+        """
+        mode = self.mode()
+        if mode not in MODES:
+            raise ValueError(f"query budget mode must be one of {', '.join(MODES)}, not {mode!r}")
+        return QueryBudget(self, limit, name, mode)
+
+    def limit(self, max_queries):
+        """
+        Decorator declaring a view's query budget. The limit is kept on
+        the view as ``query_budget`` so tests can check every route has one.
+        """
+        def decorator(view):
+            @functools.wraps(view)
+            def wrapper(*args, **kwargs):
+                with self.budget(max_queries, view.__name__):
+                    return view(*args, **kwargs)
+            wrapper.query_budget = max_queries
+            return wrapper
+        return decorator
+
+    @contextmanager
+    def paused(self):
+        """
+        Hides this thread's open budgets, for work that runs inline but
+        is not part of the view (e.g. jobs in eager mode).
+        """
+        open_budgets = getattr(self._local, "open", [])
+        self._local.open = []
+        try:
+            yield
+        finally:
+            self._local.open = open_budgets
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        for budget in getattr(self._local, "open", ()):
+            budget.statements.append(statement)
+
+    def _push(self, budget):
+        if not hasattr(self._local, "open"):
+            self._local.open = []
+        self._local.open.append(budget)
+
+    def _pop(self, budget):
+        self._local.open.remove(budget)
@@ -0,0 +1,352 @@
+"""
+File: request_metrics.py
+Description:
+    Request-scoped instrumentation exported in the Prometheus text
+    format. Each request gets a RequestStats on its thread. SQLAlchemy
+    engine events, AI calls and cache lookups add to it, and when the
+    request ends the totals go into per-endpoint counters and latency
+    histograms. A small random sample of requests can also run under
+    cProfile; the profile is only kept when the request was slow.
+"""
+
+import cProfile
+import functools
+import inspect
+import os
+import random
+import threading
+import time
+import uuid
+
+from sqlalchemy import event
+
+# histogram upper bounds in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# label for SQL run outside any request (background jobs, startup)
+BACKGROUND = "(background)"
+
+
+class RequestStats:
+    """
+    What one request has done so far.
+    """
+
+    __slots__ = ("started", "sql_statements", "sql_seconds", "ai_calls", "ai_seconds", "cache", "status",
+                 "profiler")
+
+    def __init__(self, profiler=None):
+        self.started = time.perf_counter()
+        self.sql_statements = 0
+        self.sql_seconds = 0.0
+        self.ai_calls = 0
+        self.ai_seconds = 0.0
+        self.cache = {}
+        self.status = 500
+        self.profiler = profiler
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram as Prometheus expects it.
+    """
+
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, size):
+        self.counts = [0] * size
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, buckets, value):
+        for i, bound in enumerate(buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """
+    Collects per-endpoint request metrics and renders them for /metrics.
+
+    Args:
+        prefix (str): Prepended to every metric name
+        buckets (tuple): Latency histogram bounds in seconds
+        profile_sample_rate (float): Share of requests run under cProfile (0 disables)
+        profile_threshold_ms (float): Profiles are kept only for requests at least this slow
+        profile_dir (str): Where .prof files are written
+        profile_keep (int): Newest profiles kept in profile_dir
+    """
+
+    def __init__(self, prefix="study_assistant", buckets=DEFAULT_BUCKETS, profile_sample_rate=0.0,
+                 profile_threshold_ms=500.0, profile_dir=None, profile_keep=50, rng=random.random):
+        self.prefix = prefix
+        self.buckets = tuple(buckets)
+        self.profile_sample_rate = profile_sample_rate
+        self.profile_threshold_ms = profile_threshold_ms
+        self.profile_dir = profile_dir
+        self.profile_keep = profile_keep
+        self._rng = rng
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._gauges = []
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._requests = {}
+            self._durations = {}
+            self._sql = {}
+            self._ai_in_requests = {}
+            self._cache = {}
+            self._ai_calls = {}
+            self.profiles_written = 0
+
+    # request lifecycle
+
+    def start_request(self):
+        """
+        Starts collecting for the request running on this thread.
+        """
+        profiler = None
+        if self.profile_sample_rate and self._rng() < self.profile_sample_rate:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # another profiler is already active (only one at a time on Python 3.12+)
+                profiler = None
+        self._local.stats = RequestStats(profiler)
+        return self._local.stats
+
+    def current(self):
+        """
+        Returns this thread's RequestStats, or None outside a request.
+        """
+        return getattr(self._local, "stats", None)
+
+    def finish_request(self, endpoint, method):
+        """
+        Records the request running on this thread; returns its duration
+        in seconds (None if no request was started).
+        """
+        stats = self.current()
+        if stats is None:
+            return None
+        self._local.stats = None
+        duration = time.perf_counter() - stats.started
+        if stats.profiler is not None:
+            stats.profiler.disable()
+
+        with self._lock:
+            key = (endpoint, method, str(stats.status))
+            self._requests[key] = self._requests.get(key, 0) + 1
+            histogram = self._durations.get((endpoint,))
+            if histogram is None:
+                histogram = self._durations[(endpoint,)] = Histogram(len(self.buckets))
+            histogram.observe(self.buckets, duration)
+            self._add_sql(endpoint, stats.sql_statements, stats.sql_seconds)
+            if stats.ai_calls:
+                calls, seconds = self._ai_in_requests.get((endpoint,), (0, 0.0))
+                self._ai_in_requests[(endpoint,)] = (calls + stats.ai_calls, seconds + stats.ai_seconds)
+            for (cache, result), count in stats.cache.items():
+                key = (endpoint, cache, result)
+                self._cache[key] = self._cache.get(key, 0) + count
+
+        if stats.profiler is not None and duration * 1000 >= self.profile_threshold_ms:
+            self._dump_profile(stats.profiler, endpoint, duration)
+        return duration
+
+    # observations
+
+    def install_sql_hooks(self, engine):
+        """
+        Counts and times every statement the engine runs.
+        """
+        @event.listens_for(engine, "before_cursor_execute")
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            started = conn.info["metrics_started"].pop()
+            self.observe_sql(time.perf_counter() - started)
+
+        @event.listens_for(engine, "handle_error")
+        def handle_error(context):
+            connection = context.connection
+            if connection is not None and connection.info.get("metrics_started"):
+                connection.info["metrics_started"].pop()
+                self.observe_sql(0.0)
+
+    def observe_sql(self, seconds):
+        stats = self.current()
+        if stats is not None:
+            stats.sql_statements += 1
+            stats.sql_seconds += seconds
+        else:
+            with self._lock:
+                self._add_sql(BACKGROUND, 1, seconds)
+
+    def observe_ai(self, mode, outcome, seconds):
+        """
+        Records one AI call (mode: generate or stream; outcome: ok or failed).
+        """
+        stats = self.current()
+        if stats is not None:
+            stats.ai_calls += 1
+            stats.ai_seconds += seconds
+        with self._lock:
+            histogram = self._ai_calls.get((mode, outcome))
+            if histogram is None:
+                histogram = self._ai_calls[(mode, outcome)] = Histogram(len(self.buckets))
+            histogram.observe(self.buckets, seconds)
+
+    def observe_cache(self, cache, hit):
+        stats = self.current()
+        if stats is not None:
+            key = (cache, "hit" if hit else "miss")
+            stats.cache[key] = stats.cache.get(key, 0) + 1
+
+    def cache_listener(self, cache):
+        """
+        Returns an on_lookup callback for one of the app's caches.
+        """
+        return functools.partial(self.observe_cache, cache)
+
+    def timed_ai(self, mode):
+        """
+        Decorator recording the latency of an AI call. Plain functions
+        count as failed when they return nothing; generator functions are
+        timed until exhausted and count as failed when they yield nothing.
+        """
+        def decorator(func):
+            if inspect.isgeneratorfunction(func):
+                @functools.wraps(func)
+                def generator_wrapper(*args, **kwargs):
+                    started = time.perf_counter()
+                    produced = False
+                    try:
+                        for item in func(*args, **kwargs):
+                            produced = True
+                            yield item
+                    finally:
+                        self.observe_ai(mode, "ok" if produced else "failed", time.perf_counter() - started)
+                return generator_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                result = None
+                try:
+                    result = func(*args, **kwargs)
+                    return result
+                finally:
+                    self.observe_ai(mode, "ok" if result else "failed", time.perf_counter() - started)
+            return wrapper
+        return decorator
+
+    def add_gauge(self, name, help_text, labels, collect):
+        """
+        Adds a gauge read at scrape time; collect() returns
+        {label values tuple: value}.
+        """
+        self._gauges.append((name, help_text, tuple(labels), collect))
+
+    # export
+
+    def render(self):
+        """
+        Returns every metric in the Prometheus text exposition format.
+        """
+        with self._lock:
+            requests = dict(self._requests)
+            durations = {k: (list(h.counts), h.sum, h.count) for k, h in self._durations.items()}
+            sql = dict(self._sql)
+            ai_in_requests = dict(self._ai_in_requests)
+            cache = dict(self._cache)
+            ai_calls = {k: (list(h.counts), h.sum, h.count) for k, h in self._ai_calls.items()}
+            profiles = self.profiles_written
+
+        lines = []
+        self._family(lines, "http_requests_total", "counter", "Requests handled.",
+                     (("endpoint", "method", "status"), requests))
+        self._histogram(lines, "http_request_duration_seconds", "Request wall time.", ("endpoint",), durations)
+        self._family(lines, "sql_statements_total", "counter", "SQL statements executed.",
+                     (("endpoint",), {k: v[0] for k, v in sql.items()}))
+        self._family(lines, "sql_duration_seconds_total", "counter", "Time spent executing SQL.",
+                     (("endpoint",), {k: v[1] for k, v in sql.items()}))
+        self._family(lines, "request_ai_calls_total", "counter", "AI calls made while serving a request.",
+                     (("endpoint",), {k: v[0] for k, v in ai_in_requests.items()}))
+        self._family(lines, "request_ai_duration_seconds_total", "counter",
+                     "Time spent waiting for AI calls while serving a request.",
+                     (("endpoint",), {k: v[1] for k, v in ai_in_requests.items()}))
+        self._histogram(lines, "ai_call_duration_seconds", "AI call latency (requests and background jobs).",
+                        ("mode", "outcome"), ai_calls)
+        self._family(lines, "cache_lookups_total", "counter", "Cache lookups by result.",
+                     (("endpoint", "cache", "result"), cache))
+        self._family(lines, "profiles_written_total", "counter", "Slow-request profiles written.",
+                     ((), {(): profiles}))
+        for name, help_text, labels, collect in self._gauges:
+            self._family(lines, name, "gauge", help_text, (labels, collect()))
+        return "\n".join(lines) + "\n"
+
+    def _add_sql(self, endpoint, statements, seconds):
+        # caller holds the lock
+        if statements:
+            count, total = self._sql.get((endpoint,), (0, 0.0))
+            self._sql[(endpoint,)] = (count + statements, total + seconds)
+
+    def _family(self, lines, name, kind, help_text, series):
+        labels, values = series
+        name = f"{self.prefix}_{name}"
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for key in sorted(values):
+            lines.append(f"{name}{_labels(zip(labels, key))} {_number(values[key])}")
+
+    def _histogram(self, lines, name, help_text, labels, series):
+        name = f"{self.prefix}_{name}"
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} histogram")
+        for key in sorted(series):
+            counts, total, count = series[key]
+            pairs = list(zip(labels, key))
+            for bound, bucket in zip(self.buckets, counts):
+                lines.append(f"{name}_bucket{_labels(pairs + [('le', _number(bound))])} {bucket}")
+            lines.append(f"{name}_bucket{_labels(pairs + [('le', '+Inf')])} {count}")
+            lines.append(f"{name}_sum{_labels(pairs)} {_number(total)}")
+            lines.append(f"{name}_count{_labels(pairs)} {count}")
+
+    def _dump_profile(self, profiler, endpoint, duration):
+        directory = self.profile_dir
+        os.makedirs(directory, exist_ok=True)
+        safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in endpoint)
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{safe}-{int(duration * 1000)}ms-{uuid.uuid4().hex[:6]}.prof"
+        profiler.dump_stats(os.path.join(directory, name))
+        with self._lock:
+            self.profiles_written += 1
+        # keep only the newest profiles
+        files = sorted((e for e in os.scandir(directory) if e.name.endswith(".prof")),
+                       key=lambda e: e.stat().st_mtime)
+        for entry in files[:max(0, len(files) - self.profile_keep)]:
+            try:
+                os.unlink(entry.path)
+            except OSError:
+                pass
+
+
+def _labels(pairs):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in pairs]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value):
+    if isinstance(value, float):
+        return repr(round(value, 6))
+    return str(value)
@@ -0,0 +1,181 @@
+"""
+File: response_compression.py
+Description:
+    gzip/brotli compression of dynamic responses (HTML, JSON, CSV, event
+    streams). Buffered bodies are compressed in one go once they reach a
+    minimum size. Streamed bodies are compressed chunk by chunk with a
+    flush after each one, so every server-sent event or exported row
+    reaches the browser as soon as it is produced instead of waiting
+    for the compressor's buffer to fill. Brotli is used when the brotli
+    package is installed and the client accepts it. Strong ETags stay
+    strong: each encoding gets its own tag ("v3-ab12-gzip").
+"""
+
+import threading
+import time
+import zlib
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # optional; gzip only without it
+    brotli = None
+
+DEFAULT_MIMETYPES = (
+    "text/html", "text/plain", "text/css", "text/csv", "text/calendar", "text/event-stream",
+    "text/javascript", "application/javascript", "application/json",
+)
+
+
+class _Encoder:
+    """
+    One response's compressor: compress() for each chunk, flush() to push
+    out what is buffered, finish() to end the stream.
+    """
+
+    def __init__(self, encoding, level, brotli_quality):
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+            self.compress = self._compressor.process
+            self.flush = self._compressor.flush
+            self.finish = self._compressor.finish
+        else:
+            # wbits 31 writes the gzip header and trailer
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+            self.compress = self._compressor.compress
+            self.flush = lambda: self._compressor.flush(zlib.Z_SYNC_FLUSH)
+            self.finish = self._compressor.flush
+
+
+class ResponseCompressor:
+    """
+    after_request hook compressing responses the client can decode.
+
+    Args:
+        app (Flask): Application to install on (or call init_app later)
+        min_size (int): Smallest buffered body worth compressing, in bytes;
+            streamed bodies are always compressed
+        mimetypes (iterable): Content types that may be compressed
+        level (int): gzip level (1-9)
+        brotli_quality (int): brotli quality (0-11)
+    """
+
+    def __init__(self, app=None, min_size=500, mimetypes=DEFAULT_MIMETYPES, level=6, brotli_quality=4):
+        self.min_size = min_size
+        self.mimetypes = frozenset(m.strip().lower() for m in mimetypes if m.strip())
+        self.level = level
+        self.brotli_quality = brotli_quality
+        self.encodings = ("br", "gzip") if brotli is not None else ("gzip",)
+        self._lock = threading.Lock()
+        self.reset()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.after_request(self.compress)
+
+    def reset(self):
+        with self._lock:
+            self._totals = {}
+
+    def stats(self):
+        """
+        Returns {encoding: {"responses", "bytes_in", "bytes_out", "cpu_seconds"}}.
+        """
+        with self._lock:
+            return {encoding: dict(zip(("responses", "bytes_in", "bytes_out", "cpu_seconds"), totals))
+                    for encoding, totals in self._totals.items()}
+
+    def choose_encoding(self, accept_encodings):
+        """
+        Returns the first supported encoding the client accepts, or None.
+        """
+        for encoding in self.encodings:
+            if accept_encodings.quality(encoding) > 0:
+                return encoding
+        return None
+
+    @staticmethod
+    def etag_variants(etag):
+        """
+        Returns the tags a response with this ETag may have been sent
+        with, for comparing against If-None-Match.
+        """
+        return [etag] + [f"{etag}-{encoding}" for encoding in ("br", "gzip")]
+
+    def compress(self, response):
+        """
+        Compresses the response in place when its type, size and the
+        request's Accept-Encoding allow it.
+        """
+        if (response.direct_passthrough or "Content-Encoding" in response.headers
+                or response.cache_control.no_transform or response.mimetype not in self.mimetypes):
+            return response
+        encoding = self.choose_encoding(request.accept_encodings)
+        if response.status_code == 304:
+            # a 304 can't tell whether its 200 was compressed, so both
+            # tag the encoding whenever one is negotiated
+            if encoding is not None:
+                _tag_encoding(response, encoding)
+            return response
+        if response.status_code != 200 or "Content-Range" in response.headers:
+            return response
+
+        response.vary.add("Accept-Encoding")
+        if encoding is None:
+            return response
+        # tagged even for bodies left uncompressed below, to match the 304
+        _tag_encoding(response, encoding)
+        if response.is_streamed:
+            response.response = self._stream(response.response, encoding)
+            response.headers.pop("Content-Length", None)
+        else:
+            data = response.get_data()
+            if len(data) < self.min_size:
+                return response
+            started = time.thread_time()
+            encoder = _Encoder(encoding, self.level, self.brotli_quality)
+            compressed = encoder.compress(data) + encoder.finish()
+            self._record(encoding, len(data), len(compressed), time.thread_time() - started)
+            response.set_data(compressed)
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+    def _stream(self, chunks, encoding):
+        encoder = _Encoder(encoding, self.level, self.brotli_quality)
+        bytes_in = bytes_out = 0
+        seconds = 0.0
+        try:
+            for chunk in chunks:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode("utf-8")
+                if not chunk:
+                    continue
+                started = time.thread_time()
+                output = encoder.compress(chunk) + encoder.flush()
+                seconds += time.thread_time() - started
+                bytes_in += len(chunk)
+                bytes_out += len(output)
+                yield output
+            output = encoder.finish()
+            bytes_out += len(output)
+            yield output
+        finally:
+            # closing the original body runs its cleanup (e.g. stream_with_context)
+            if hasattr(chunks, "close"):
+                chunks.close()
+            self._record(encoding, bytes_in, bytes_out, seconds)
+
+    def _record(self, encoding, bytes_in, bytes_out, seconds):
+        with self._lock:
+            responses, total_in, total_out, total_seconds = self._totals.get(encoding, (0, 0, 0, 0.0))
+            self._totals[encoding] = (responses + 1, total_in + bytes_in, total_out + bytes_out,
+                                      total_seconds + seconds)
+
+
+def _tag_encoding(response, encoding):
+    # the compressed body is a different byte sequence, so it needs its own strong validator
+    etag, weak = response.get_etag()
+    if etag is not None and not weak:
+        response.set_etag(f"{etag}-{encoding}")
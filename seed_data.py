@@ -3,9 +3,15 @@ Test Data Seeder for AI Study Assistant
 Run this script to populate the database with sample data for testing
 """
 
-from app import app, db, User, Assignment, generate_password_hash
 from datetime import datetime, timedelta
 
+# the app/ package shadows app.py, so load it through wsgi.py
+from wsgi import study_app
+
+app, db = study_app.app, study_app.db
+User, Assignment = study_app.User, study_app.Assignment
+password_hasher = study_app.password_hasher
+
 def seed_test_data():
     """Create test user and sample assignments"""
     with app.app_context():
@@ -19,7 +25,7 @@ def seed_test_data():
             test_user = User(
                 username='testuser',
                 email='test@example.com',
-                password_hash=generate_password_hash('test123')
+                password_hash=password_hasher.hash('test123')
             )
             db.session.add(test_user)
             db.session.commit()
@@ -71,15 +77,14 @@ def seed_test_data():
             }
         ]
         
+        # Titles the test user already has (one query instead of one per assignment)
+        existing_titles = {
+            title for (title,) in db.session.query(Assignment.title).filter_by(user_id=test_user.id)
+        }
+        
         # Add assignments
         for assignment_data in assignments:
-            # Check if similar assignment exists
-            existing = Assignment.query.filter_by(
-                title=assignment_data['title'],
-                user_id=test_user.id
-            ).first()
-            
-            if not existing:
+            if assignment_data['title'] not in existing_titles:
                 assignment = Assignment(
                     title=assignment_data['title'],
                     description=assignment_data['description'],
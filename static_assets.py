@@ -0,0 +1,196 @@
+"""
+File: static_assets.py
+Description:
+    Fingerprinted, precompressed static files. build() copies every file
+    in the static folder to static/dist/ with a hash of its content in
+    the name, writes gzip (and brotli, when the brotli package is
+    installed) variants next to it, and records the mapping in a
+    manifest. StaticAssets then makes url_for('static', ...) emit the
+    fingerprinted name and serves those files with a year-long immutable
+    Cache-Control, choosing the precompressed variant the browser
+    accepts. A changed file gets a new name, so browsers never have to
+    revalidate what they already hold.
+
+Usage:
+    python static_assets.py
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import shutil
+
+from flask import request, send_from_directory
+
+try:
+    import brotli
+except ImportError:  # optional; without it only gzip variants are built
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+BUILD_DIR = "dist"
+MANIFEST = "manifest.json"
+
+# text formats worth precompressing (images and fonts are compressed already)
+COMPRESSIBLE = (".css", ".js", ".json", ".map", ".svg", ".txt", ".html", ".xml")
+
+# suffix of each precompressed variant, in order of preference
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+ONE_YEAR = 365 * 24 * 3600
+
+
+def fingerprint(data):
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def build(static_dir):
+    """
+    Writes the fingerprinted and precompressed copies of every file in
+    static_dir to static_dir/dist and replaces the previous build.
+
+    Returns:
+        dict: The manifest, {"files": {name: {"path", "hash", "encodings", "size"}}}
+    """
+    out_dir = os.path.join(static_dir, BUILD_DIR)
+    staging = out_dir + ".tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    files = {}
+    for folder, subfolders, names in os.walk(static_dir):
+        # never fingerprint a previous build
+        subfolders[:] = sorted(d for d in subfolders if os.path.join(folder, d) not in (out_dir, staging))
+        for name in sorted(names):
+            source = os.path.join(folder, name)
+            relative = os.path.relpath(source, static_dir).replace(os.sep, "/")
+            with open(source, "rb") as f:
+                data = f.read()
+            digest = fingerprint(data)
+            stem, ext = os.path.splitext(relative)
+            built = f"{stem}.{digest}{ext}"
+            target = os.path.join(staging, built)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, "wb") as f:
+                f.write(data)
+
+            encodings = []
+            if ext.lower() in COMPRESSIBLE:
+                for encoding, suffix in ENCODINGS:
+                    compressed = _compress(encoding, data)
+                    # a variant that isn't smaller is only extra bytes to send
+                    if compressed is not None and len(compressed) < len(data):
+                        with open(target + suffix, "wb") as f:
+                            f.write(compressed)
+                        encodings.append(encoding)
+            files[relative] = {"path": built, "hash": digest, "encodings": encodings,
+                               "size": len(data)}
+
+    os.makedirs(staging, exist_ok=True)
+    manifest = {"files": files}
+    with open(os.path.join(staging, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.replace(staging, out_dir)
+    return manifest
+
+
+def _compress(encoding, data):
+    if encoding == "gzip":
+        # mtime=0 keeps builds byte-for-byte reproducible
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(data, quality=11)
+    return None
+
+
+class StaticAssets:
+    """
+    Serves a static folder's build (see build()) in place of the raw files.
+
+    Args:
+        app (Flask): Application whose static folder is served
+        max_age (int): Cache lifetime of fingerprinted files in seconds
+    """
+
+    def __init__(self, app=None, max_age=ONE_YEAR):
+        self.max_age = max_age
+        self.static_dir = None
+        self.urls = {}
+        self.built = {}
+        self._send_static = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.static_dir = app.static_folder
+        self._send_static = app.view_functions["static"]
+        app.view_functions["static"] = self.send
+        app.url_defaults(self._url_defaults)
+        self.load()
+
+    def load(self):
+        """
+        Reads the manifest; files edited since the last build keep their
+        plain URL until the next build. Returns how many files are served
+        fingerprinted.
+        """
+        self.urls, self.built = {}, {}
+        try:
+            with open(os.path.join(self.static_dir, BUILD_DIR, MANIFEST)) as f:
+                files = json.load(f)["files"]
+        except (OSError, ValueError, KeyError):
+            return 0
+        for name, entry in files.items():
+            try:
+                with open(os.path.join(self.static_dir, name), "rb") as f:
+                    current = fingerprint(f.read())
+            except OSError:
+                continue
+            if current != entry["hash"]:
+                logger.warning("%s changed since the last static build; serving it unfingerprinted", name)
+                continue
+            self.urls[name] = f"{BUILD_DIR}/{entry['path']}"
+            self.built[entry["path"]] = entry
+        return len(self.urls)
+
+    def _url_defaults(self, endpoint, values):
+        if endpoint == "static":
+            built = self.urls.get(values.get("filename"))
+            if built is not None:
+                values["filename"] = built
+
+    def send(self, filename):
+        """
+        View for the static endpoint: built files are sent precompressed
+        when the client accepts it, anything else as Flask would.
+        """
+        entry = self.built.get(filename[len(BUILD_DIR) + 1:]) if filename.startswith(BUILD_DIR + "/") else None
+        if entry is None:
+            return self._send_static(filename=filename)
+
+        path, encoding = entry["path"], None
+        for candidate, suffix in ENCODINGS:
+            if candidate in entry["encodings"] and request.accept_encodings.quality(candidate) > 0:
+                path, encoding = path + suffix, candidate
+                break
+        mimetype = mimetypes.guess_type(entry["path"])[0] or "application/octet-stream"
+        response = send_from_directory(os.path.join(self.static_dir, BUILD_DIR), path,
+                                       mimetype=mimetype, max_age=self.max_age)
+        # the name on disk may end in .gz/.br; the browser should only see the content type
+        response.headers.pop("Content-Disposition", None)
+        if encoding is not None:
+            response.headers["Content-Encoding"] = encoding
+        if entry["encodings"]:
+            response.vary.add("Accept-Encoding")
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
+
+
+if __name__ == "__main__":
+    static_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+    for name, entry in build(static_dir)["files"].items():
+        print(f"{name} -> {BUILD_DIR}/{entry['path']} ({', '.join(entry['encodings']) or 'uncompressed'})")
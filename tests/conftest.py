@@ -5,6 +5,67 @@ Ensures the application package can be imported during testing.
 
 import sys
 import os
+import tempfile
+
+import pytest
 
 # Add project root to PYTHONPATH
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# point app.py at a throwaway database before it is imported
+_test_db_dir = tempfile.mkdtemp(prefix="study-assistant-tests-")
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(_test_db_dir, "test.db"))
+os.environ.setdefault("FACTORY_DATABASE_URL", "sqlite:///" + os.path.join(_test_db_dir, "factory.db"))
+# keep AI features offline
+os.environ.setdefault("AI_BACKEND", "stub")
+
+
+@pytest.fixture
+def study_app():
+    """
+    Provides the app.py module with freshly created tables.
+    """
+    from wsgi import study_app as module
+
+    module.app.config["TESTING"] = True
+    with module.app.app_context():
+        module.db.drop_all()
+        module.db.create_all()
+        module.ai_cache.clear()
+        module.user_cache.clear()
+        module.fragment_cache.clear()
+        module.metrics_registry.reset()
+    return module
+
+
+@pytest.fixture
+def client(study_app):
+    """
+    Provides a test client for the app.py application.
+    """
+    return study_app.app.test_client()
+
+
+@pytest.fixture
+def user(study_app):
+    """
+    Creates a user with the password "password123".
+    """
+    with study_app.app.app_context():
+        new_user = study_app.User(
+            username="student",
+            email="student@example.com",
+            password_hash=study_app.password_hasher.hash("password123")
+        )
+        study_app.db.session.add(new_user)
+        study_app.db.session.commit()
+        return new_user.id
+
+
+@pytest.fixture
+def logged_in_client(client, user):
+    """
+    Provides a test client logged in as the test user.
+    """
+    client.post("/login", data={"username": "student", "password": "password123"})
+    return client
@@ -0,0 +1,115 @@
+"""
+File: test_ai_cache.py
+Description:
+    Unit tests for the two-tier AI prompt/response cache.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import MetaData, create_engine, func, inspect, select
+
+from ai_cache import PromptCache
+
+
+@pytest.fixture
+def make_cache(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'cache.db'}")
+    now = [1000.0]
+
+    def make(**options):
+        metadata = MetaData()
+        cache = PromptCache(metadata, lambda: engine, clock=lambda: now[0], **options)
+        metadata.create_all(engine)
+        return cache
+
+    make.now = now
+    return make
+
+
+def test_database_tier_is_shared_between_instances(make_cache):
+    """
+    Verifies a second worker (new instance) hits the SQLite tier.
+    """
+    key = PromptCache.make_key("study_plan", [[1, "Essay"]], "model", {"t": 0.7})
+    make_cache().set(key, "<p>plan</p>", [1])
+
+    other = make_cache()
+    assert other.get(key) == "<p>plan</p>"
+    assert other.get(key) == "<p>plan</p>"
+    assert other.stats()["db_hits"] == 1
+    assert other.stats()["memory_hits"] == 1
+
+
+def test_entries_expire_and_are_trimmed(make_cache):
+    """
+    Verifies TTL expiry and max_rows eviction of the oldest entries.
+    """
+    cache = make_cache(ttl=60, max_rows=2, memory_items=1)
+    for i in range(3):
+        make_cache.now[0] += 1
+        cache.set(f"key{i}", f"value{i}")
+
+    fresh = make_cache()
+    assert fresh.get("key0") is None
+    assert fresh.get("key2") == "value2"
+
+    make_cache.now[0] += 120
+    assert make_cache().get("key2") is None
+
+
+def test_invalidate_assignment_drops_dependent_entries(make_cache):
+    """
+    Verifies only entries built from the edited assignment are removed.
+    """
+    cache = make_cache()
+    cache.set("plan-a", "a", [1, 2])
+    cache.set("plan-b", "b", [3])
+
+    assert cache.invalidate_assignment(2) == 1
+    assert cache.get("plan-a") is None
+    assert cache.get("plan-b") == "b"
+
+
+def test_rewriting_a_key_upserts_the_entry(make_cache):
+    """
+    Verifies a second worker storing the same prompt replaces the row instead of colliding.
+    """
+    first, second = make_cache(), make_cache()
+    first.set("plan", "old", [1, 2])
+    make_cache.now[0] += 5
+    second.set("plan", "new", [2, 3])
+
+    assert make_cache().get("plan") == "new"
+    with second.get_engine().connect() as connection:
+        assert connection.execute(select(func.count()).select_from(second.entries)).scalar() == 1
+        refs = connection.execute(select(second.refs.c.assignment_id).order_by(second.refs.c.assignment_id))
+        assert refs.scalars().all() == [2, 3]
+    indexes = {index["name"] for index in inspect(second.get_engine()).get_indexes("ai_response_cache")}
+    assert "ix_ai_response_cache_expires_at" in indexes
+
+
+def test_study_plan_cached_until_assignment_edited(study_app, logged_in_client, user, monkeypatch):
+    """
+    Verifies repeat plans skip the model and an edit invalidates them.
+    """
+    calls = []
+    real_call = study_app.call_huggingface_api
+    monkeypatch.setattr(study_app, "call_huggingface_api",
+                        lambda prompt, **kw: calls.append(prompt) or real_call(prompt, **kw))
+
+    with study_app.app.app_context():
+        assignment = study_app.Assignment(title="Essay", due_date=datetime.now() + timedelta(days=4), user_id=user)
+        study_app.db.session.add(assignment)
+        study_app.db.session.commit()
+        assignment_id = assignment.id
+
+        first = study_app.generate_study_plan([assignment])
+        assert study_app.generate_study_plan([assignment]) == first
+        assert len(calls) == 1
+
+    logged_in_client.post(f"/assignment/edit/{assignment_id}", data={
+        "title": "Essay", "due_date": "2031-01-01", "priority": "medium"
+    })
+    with study_app.app.app_context():
+        assert study_app.ai_cache.stats()["memory_items"] == 0
@@ -0,0 +1,199 @@
+"""
+File: test_ai_client.py
+Description:
+    Unit tests for the pooled inference client, run against a local fake server.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ai_client import CircuitBreaker, CircuitOpenError, InferenceClient, UpstreamError
+
+
+class FakeInferenceServer:
+    """
+    Local HTTP server that replies with a scripted list of status codes.
+    """
+
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.client_ports = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers["Content-Length"]))
+                server.client_ports.append(self.client_address[1])
+                status = server.statuses.pop(0) if server.statuses else 200
+                body = json.dumps([{"generated_text": "ok"}] if status == 200 else {"error": "loading"}).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/model"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    @property
+    def calls(self):
+        return len(self.client_ports)
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def fake_server():
+    servers = []
+
+    def start(statuses=()):
+        servers.append(FakeInferenceServer(statuses))
+        return servers[-1]
+
+    yield start
+    for server in servers:
+        server.close()
+
+
+def test_retries_model_loading_then_succeeds(fake_server):
+    """
+    Verifies 503 responses are retried and connections are reused.
+    """
+    server = fake_server([503, 503])
+    client = InferenceClient(server.url, max_retries=2, backoff=0)
+
+    assert client.post({"inputs": "hi"}) == [{"generated_text": "ok"}]
+    assert server.calls == 3
+    assert len(set(server.client_ports)) == 1
+    assert client.metrics()["retries_total"] == 2
+
+
+def test_breaker_opens_and_short_circuits(fake_server):
+    """
+    Verifies an open breaker rejects calls without touching the upstream.
+    """
+    server = fake_server([503] * 10)
+    client = InferenceClient(server.url, max_retries=0, backoff=0,
+                             breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60))
+
+    for _ in range(2):
+        with pytest.raises(UpstreamError):
+            client.post({"inputs": "hi"})
+    with pytest.raises(CircuitOpenError):
+        client.post({"inputs": "hi"})
+
+    assert server.calls == 2
+    metrics = client.metrics()
+    assert metrics["breaker_state"] == "open"
+    assert metrics["breaker_rejected_total"] == 1
+
+
+def test_breaker_half_open_trial_closes_on_success():
+    """
+    Verifies one trial call is allowed after the reset timeout.
+    """
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=lambda: now[0])
+    breaker.record_failure()
+    assert not breaker.allow_request()
+
+    now[0] = 11
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_half_open_trial_that_raises_reopens_the_breaker(fake_server, monkeypatch):
+    """
+    Verifies a trial call failing with a non-connection error still settles the
+    breaker, so it can close again on the next trial.
+    """
+    import requests
+
+    now = [0.0]
+    server = fake_server()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=lambda: now[0])
+    client = InferenceClient(server.url, max_retries=0, backoff=0, breaker=breaker)
+    breaker.record_failure()
+    now[0] = 11
+
+    def redirect_loop(*args, **kwargs):
+        raise requests.TooManyRedirects("redirect loop")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(client.session, "post", redirect_loop)
+        with pytest.raises(requests.TooManyRedirects):
+            client.post({"inputs": "hi"})
+    assert breaker.state == "open"
+
+    now[0] = 22
+    assert client.post({"inputs": "hi"}) == [{"generated_text": "ok"}]
+    assert breaker.state == "closed"
+
+
+def test_stream_errors_are_recorded_by_the_breaker(fake_server):
+    """
+    Verifies a response that breaks mid-stream counts as a breaker failure.
+    """
+    server = fake_server()
+    client = InferenceClient(server.url, max_retries=0, backoff=0,
+                             breaker=CircuitBreaker(failure_threshold=1, reset_timeout=60))
+
+    # the fake server's plain JSON body is not an event stream; a data: line that is not JSON breaks it
+    server.httpd.RequestHandlerClass.do_POST = _reply_with_broken_stream
+    with pytest.raises(json.JSONDecodeError):
+        list(client.stream({"inputs": "hi"}))
+    assert client.breaker.state == "open"
+
+
+def _reply_with_broken_stream(handler):
+    handler.rfile.read(int(handler.headers["Content-Length"]))
+    body = b'data: {"token": {"text": "Hel"}}\n\ndata: {broken\n\n'
+    handler.send_response(200)
+    handler.send_header("Content-Type", "text/event-stream")
+    handler.send_header("Content-Length", str(len(body)))
+    handler.end_headers()
+    handler.wfile.write(body)
+
+
+def test_open_breaker_uses_fallback_immediately(study_app, monkeypatch):
+    """
+    Verifies the API call returns None (use the fallback) while the breaker is open.
+    """
+    def reject(*args, **kwargs):
+        raise CircuitOpenError()
+
+    monkeypatch.setitem(study_app.app.config, "AI_BACKEND", "huggingface")
+    monkeypatch.setattr(study_app, "HF_API_TOKEN", "token")
+    monkeypatch.setattr(study_app.get_ai_client(), "post", reject)
+
+    assert study_app.call_huggingface_api("prompt") is None
+
+
+def test_app_import_does_not_load_http_client(tmp_path):
+    """
+    Verifies importing the app leaves requests unloaded until the AI client is first used.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, DATABASE_URL="sqlite:///" + str(tmp_path / "lazy.db"), AI_BACKEND="stub")
+    script = ("import sys; from wsgi import study_app; before = 'requests' in sys.modules; "
+              "study_app.get_ai_client(); print(before, 'requests' in sys.modules, "
+              "study_app.ai_client_metrics()['client_loaded'])")
+    result = subprocess.run([sys.executable, "-c", script], cwd=root, env=env,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.split() == ["False", "True", "True"]
@@ -0,0 +1,90 @@
+"""
+File: test_api.py
+Description:
+    Unit tests for the JSON assignments API, data versions and ETags.
+"""
+
+import io
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+
+def _add(study_app, user_id, title, days, priority="medium"):
+    with study_app.app.app_context():
+        assignment = study_app.Assignment(title=title, due_date=datetime.now() + timedelta(days=days),
+                                          priority=priority, user_id=user_id)
+        study_app.db.session.add(assignment)
+        study_app.db.session.commit()
+        return assignment.id
+
+
+def test_api_filters_and_paginates(study_app, logged_in_client, user):
+    """
+    Verifies the API mirrors the page's filters and pages with a cursor.
+    """
+    for days, priority in ((1, "high"), (2, "low"), (3, "high")):
+        _add(study_app, user, f"Task {days}", days, priority)
+
+    first = logged_in_client.get("/api/assignments?priority=high&per_page=1").get_json()
+    assert [a["title"] for a in first["assignments"]] == ["Task 1"]
+    second = logged_in_client.get(f"/api/assignments?priority=high&per_page=1&after={first['next_cursor']}").get_json()
+    assert [a["title"] for a in second["assignments"]] == ["Task 3"]
+    assert second["next_cursor"] is None
+
+
+def test_unchanged_poll_is_a_304_after_one_query(study_app, logged_in_client, user):
+    """
+    Verifies If-None-Match with the current ETag costs one version lookup.
+    """
+    _add(study_app, user, "Essay", 2)
+    response = logged_in_client.get("/api/assignments")
+    etag = response.headers["ETag"]
+    assert response.status_code == 200 and response.headers["Cache-Control"] == "private, no-cache"
+
+    statements = []
+    with study_app.app.app_context():
+        engine = study_app.db.engine
+    record = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        cached = logged_in_client.get("/api/assignments", headers={"If-None-Match": etag})
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert cached.status_code == 304 and cached.headers["ETag"] == etag and not cached.data
+    assert len(statements) == 1 and "data_version" in statements[0]
+    # a different filter is a different representation
+    assert logged_in_client.get("/api/assignments?status=pending", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_writes_change_the_etag(study_app, logged_in_client, user):
+    """
+    Verifies ORM edits, bulk imports and the overdue sweep all bump the version.
+    """
+    def etag():
+        return logged_in_client.get("/api/assignments").headers["ETag"]
+
+    seen = [etag()]
+    assignment_id = _add(study_app, user, "Essay", -1)
+    seen.append(etag())
+    logged_in_client.post(f"/assignment/complete/{assignment_id}")
+    seen.append(etag())
+    with study_app.app.app_context():
+        study_app.import_assignment_rows(user, io.StringIO("title,due_date\nLab,2001-01-01\n"), "csv")
+    seen.append(etag())
+    with study_app.app.app_context():
+        assert study_app.sweep_overdue_assignments(user) == 1
+    seen.append(etag())
+
+    assert len(set(seen)) == len(seen)
+    # nothing changed, nothing bumped
+    assert etag() == seen[-1]
+
+
+def test_api_requires_login(client):
+    """
+    Verifies anonymous API calls get a JSON 401 instead of a login redirect.
+    """
+    response = client.get("/api/assignments")
+    assert response.status_code == 401 and response.get_json()["error"]
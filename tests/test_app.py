@@ -12,3 +12,29 @@ def test_app_creation():
     """
     app = create_app()
     assert app is not None
+
+
+def test_app_creation_leaves_the_schema_to_init_db(tmp_path, monkeypatch):
+    """
+    Verifies create_app() does no schema work and the init-db command creates the tables.
+    """
+    from sqlalchemy import create_engine, inspect
+
+    url = "sqlite:///" + str(tmp_path / "factory.db")
+    monkeypatch.setenv("FACTORY_DATABASE_URL", url)
+    app = create_app()
+    assert inspect(create_engine(url)).get_table_names() == []
+
+    result = app.test_cli_runner().invoke(args=["init-db"])
+    assert "Database initialized." in result.output
+    assert "user" in inspect(create_engine(url)).get_table_names()
+
+
+def test_factory_does_not_share_the_app_py_database(tmp_path, monkeypatch):
+    """
+    Verifies DATABASE_URL (app.py's schema) does not move the factory off its own database.
+    """
+    monkeypatch.delenv("FACTORY_DATABASE_URL", raising=False)
+    monkeypatch.setenv("DATABASE_URL", "sqlite:///" + str(tmp_path / "study_assistant.db"))
+    app = create_app()
+    assert app.config["SQLALCHEMY_DATABASE_URI"] == "sqlite:///site.db"
@@ -0,0 +1,144 @@
+"""
+File: test_batch.py
+Description:
+    Unit tests for bulk study plan generation (API and helpers).
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+
+def _add_user_with_assignments(study_app, username, count):
+    with study_app.app.app_context():
+        user = study_app.User(username=username, email=f"{username}@example.com", password_hash="x")
+        study_app.db.session.add(user)
+        study_app.db.session.flush()
+        assignments = [
+            study_app.Assignment(title=f"{username} task {i}", due_date=datetime.now() + timedelta(days=i + 1),
+                                 user_id=user.id)
+            for i in range(count)
+        ]
+        study_app.db.session.add_all(assignments)
+        study_app.db.session.commit()
+        return user.id, [a.id for a in assignments]
+
+
+@pytest.fixture
+def batch_token(study_app):
+    study_app.app.config['BATCH_API_TOKEN'] = "secret"
+    yield "secret"
+    study_app.app.config['BATCH_API_TOKEN'] = ""
+
+
+def test_batch_endpoint_is_disabled_without_a_token(client):
+    """
+    Verifies the endpoint does not exist unless a token is configured.
+    """
+    assert client.post("/api/study-plans/batch", json={"items": []}).status_code == 404
+
+
+def test_batch_endpoint_requires_the_token(client, batch_token):
+    """
+    Verifies callers must send the configured bearer token.
+    """
+    response = client.post("/api/study-plans/batch", json={"items": []},
+                           headers={"Authorization": "Bearer wrong"})
+    assert response.status_code == 401
+
+
+def test_batch_generates_plans_and_reports_failures(study_app, client, batch_token):
+    """
+    Verifies each valid item gets a StudyPlan and invalid items are reported, not fatal.
+    """
+    first_user, first_ids = _add_user_with_assignments(study_app, "alice", 3)
+    second_user, second_ids = _add_user_with_assignments(study_app, "bob", 2)
+
+    response = client.post("/api/study-plans/batch", headers={"Authorization": "Bearer secret"}, json={
+        "concurrency": 2,
+        "items": [
+            {"user_id": first_user, "assignment_ids": first_ids},
+            {"user_id": second_user, "assignment_ids": second_ids},
+            # someone else's assignments are never used
+            {"user_id": second_user, "assignment_ids": first_ids},
+        ],
+    })
+
+    assert response.status_code == 200
+    report = response.get_json()
+    assert (report["succeeded"], report["failed"], report["concurrency"]) == (2, 1, 2)
+    ok, other, failed = report["items"]
+    assert ok["status"] == other["status"] == "finished"
+    assert failed["status"] == "failed" and failed["error"] == "No valid assignments selected"
+    assert all(item["latency_ms"] >= 0 for item in report["items"])
+
+    with study_app.app.app_context():
+        plan = study_app.db.session.get(study_app.StudyPlan, ok["study_plan_id"])
+        assert plan.user_id == first_user
+        assert [a.id for a in plan.assignments] == first_ids
+        assert study_app.StudyPlan.query.count() == 2
+
+
+def test_batch_accepts_a_bare_list_of_items(study_app, client, batch_token):
+    """
+    Verifies a body that is just the items list (the generate_plans.py format) is accepted.
+    """
+    user_id, assignment_ids = _add_user_with_assignments(study_app, "carol", 2)
+
+    response = client.post("/api/study-plans/batch", headers={"Authorization": "Bearer secret"},
+                           json=[{"user_id": user_id, "assignment_ids": assignment_ids}])
+
+    assert response.status_code == 200
+    assert response.get_json()["succeeded"] == 1
+
+
+@pytest.mark.parametrize("body", ["items", 42, None])
+def test_batch_rejects_bodies_that_are_not_objects(client, batch_token, body):
+    """
+    Verifies a JSON body that is neither an object nor a list is a 400.
+    """
+    response = client.post("/api/study-plans/batch", headers={"Authorization": "Bearer secret"}, json=body)
+    assert response.status_code == 400
+
+
+def test_batch_rejects_malformed_items(client, batch_token):
+    """
+    Verifies malformed input is a 400 and nothing is generated.
+    """
+    response = client.post("/api/study-plans/batch", headers={"Authorization": "Bearer secret"},
+                           json={"items": [{"user_id": 1}]})
+    assert response.status_code == 400
+
+
+def test_batch_rejects_items_without_a_user_id(study_app, client, batch_token):
+    """
+    Verifies an item missing its user_id is a 400 rather than a server error.
+    """
+    response = client.post("/api/study-plans/batch", headers={"Authorization": "Bearer secret"},
+                           json={"items": [{"assignment_ids": [1]}]})
+    assert response.status_code == 400
+    assert "user_id" in response.get_json()["error"]
+    with study_app.app.app_context():
+        assert study_app.StudyPlan.query.count() == 0
+
+
+def test_batch_isolates_generation_errors(study_app, monkeypatch):
+    """
+    Verifies one failing generation does not stop the rest of the batch.
+    """
+    user_id, assignment_ids = _add_user_with_assignments(study_app, "carol", 2)
+    real_generate = study_app.generate_study_plan
+
+    def flaky_generate(assignments):
+        if len(assignments) == 1:
+            raise RuntimeError("model exploded")
+        return real_generate(assignments)
+
+    monkeypatch.setattr(study_app, "generate_study_plan", flaky_generate)
+    with study_app.app.app_context():
+        report = study_app.generate_study_plans_batch(
+            [(user_id, assignment_ids), (user_id, assignment_ids[:1])], concurrency=4
+        )
+
+    assert [item["status"] for item in report["items"]] == ["finished", "failed"]
+    assert report["items"][1]["error"] == "model exploded"
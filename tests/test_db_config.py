@@ -0,0 +1,56 @@
+"""
+File: test_db_config.py
+Description:
+    Unit tests for database configuration and SQLite connection tuning.
+"""
+
+import pytest
+from sqlalchemy import create_engine
+
+from db_config import install_sqlite_pragmas, load_database_config
+
+
+def test_app_connections_use_wal_and_tuned_pragmas(study_app):
+    """
+    Verifies every connection of the app engine gets the configured PRAGMAs.
+    """
+    with study_app.app.app_context():
+        with study_app.db.engine.connect() as connection:
+            read = lambda name: connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+            assert read("journal_mode") == "wal"
+            assert read("synchronous") == 1  # NORMAL
+            assert read("busy_timeout") == 5000
+            assert read("cache_size") == -20000
+
+
+def test_server_databases_get_pool_settings():
+    """
+    Verifies non-SQLite URIs get pool options from the environment and no PRAGMAs.
+    """
+    config = {}
+    load_database_config(config, "sqlite:///unused.db", environ={
+        "DATABASE_URL": "postgresql://app@db/study", "DB_POOL_SIZE": "25", "DB_MAX_OVERFLOW": "5",
+    })
+
+    assert config["SQLALCHEMY_DATABASE_URI"] == "postgresql://app@db/study"
+    options = config["SQLALCHEMY_ENGINE_OPTIONS"]
+    assert (options["pool_size"], options["max_overflow"], options["pool_pre_ping"]) == (25, 5, True)
+    assert config["SQLITE_PRAGMAS"] == {}
+
+
+def test_sqlite_settings_come_from_the_environment(tmp_path):
+    """
+    Verifies the SQLite PRAGMAs can be tuned and bad identifiers are rejected.
+    """
+    config = {}
+    load_database_config(config, f"sqlite:///{tmp_path / 'app.db'}", environ={
+        "SQLITE_SYNCHRONOUS": "FULL", "SQLITE_BUSY_TIMEOUT_MS": "250",
+    })
+    engine = create_engine(config["SQLALCHEMY_DATABASE_URI"])
+    install_sqlite_pragmas(engine, config["SQLITE_PRAGMAS"])
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql("PRAGMA synchronous").scalar() == 2  # FULL
+        assert connection.exec_driver_sql("PRAGMA busy_timeout").scalar() == 250
+
+    with pytest.raises(ValueError):
+        install_sqlite_pragmas(create_engine("sqlite://"), {"journal_mode": "WAL; DROP TABLE user"})
@@ -0,0 +1,50 @@
+"""
+File: test_fallback.py
+Description:
+    Unit tests for the fallback study plans and summaries used without an AI backend.
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+
+def make_assignment(title, days, priority="high", description=""):
+    return SimpleNamespace(
+        title=title,
+        description=description,
+        due_date=datetime.now() + timedelta(days=days, hours=1),
+        priority=priority,
+    )
+
+
+def test_fallback_study_plan_escapes_titles_and_keeps_order(study_app):
+    """
+    Verifies assignment titles are escaped and the plan is ordered by due date.
+    """
+    plan = study_app.generate_fallback_study_plan([
+        make_assignment("Later essay", 10, "low"),
+        make_assignment("<script>alert(1)</script>", 1),
+    ])
+
+    assert "<script>" not in plan
+    assert "<h4>1. &lt;script&gt;alert(1)&lt;/script&gt;</h4>" in plan
+    assert "<h4>2. Later essay</h4>" in plan
+    assert "Prioritize completing this today" in plan
+    assert "over the next 10 days" in plan
+    assert plan.endswith("</ul>")
+
+
+def test_fallback_summary_escapes_user_text(study_app):
+    """
+    Verifies titles, descriptions and notes are escaped in the fallback summary.
+    """
+    with study_app.app.app_context():
+        summary = study_app.generate_fallback_summary(
+            make_assignment("Lab <b>report</b>", 2, description="Use <img src=x onerror=y>"),
+            "notes & <i>ideas</i>",
+        )
+
+    assert "<h3>Assignment: Lab &lt;b&gt;report&lt;/b&gt;</h3>" in summary
+    assert "<img" not in summary
+    assert "notes &amp; &lt;i&gt;ideas&lt;/i&gt;" in summary
+    assert "Urgent:" in summary
@@ -0,0 +1,102 @@
+"""
+File: test_fragment_cache.py
+Description:
+    Unit tests for the rendered-fragment cache and its backends.
+"""
+
+import os
+import stat
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from fragment_cache import DiskBackend, FragmentCache, MemoryBackend
+
+
+def _selects(study_app, func):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    with study_app.app.app_context():
+        engine = study_app.db.engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        func()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return statements
+
+
+def test_pages_are_served_from_cache_until_data_changes(study_app, logged_in_client, user):
+    """
+    Verifies repeat visits skip the page queries and a write shows up at once.
+    """
+    with study_app.app.app_context():
+        study_app.db.session.add(study_app.Assignment(
+            title="Essay", due_date=datetime.now() + timedelta(days=5), user_id=user
+        ))
+        study_app.db.session.commit()
+    for url in ("/dashboard", "/progress"):
+        logged_in_client.get(url)
+    hits = study_app.fragment_cache.stats()["hits"]
+
+    statements = _selects(study_app, lambda: [logged_in_client.get(url) for url in ("/dashboard", "/progress")])
+    assert not [s for s in statements if "FROM assignment" in s or "FROM study_plan" in s]
+    assert study_app.fragment_cache.stats()["hits"] == hits + 2
+
+    logged_in_client.post("/assignment/add", data={
+        "title": "Lab report", "due_date": (datetime.now() + timedelta(days=2)).strftime("%Y-%m-%d"),
+        "priority": "high"
+    })
+    assert b"Lab report" in logged_in_client.get("/dashboard").data
+    assert b"Lab report" in logged_in_client.get("/progress").data
+
+
+def test_memory_backend_is_bounded_by_bytes():
+    """
+    Verifies the LRU evicts the oldest fragments once max_bytes is reached.
+    """
+    backend = MemoryBackend(max_bytes=400)
+    cache = FragmentCache(backend)
+    for key in ("a", "b", "c"):
+        cache.get_or_render(key, lambda: "x" * 150)
+
+    assert backend.get("a") is None and backend.get("c") is not None
+    stats = cache.stats()
+    assert stats["memory_bytes"] <= 400 and stats["evictions"] == 1 and stats["misses"] == 3
+
+
+def test_disk_backend_is_shared_and_expires(tmp_path):
+    """
+    Verifies two caches on one directory share entries and old entries are ignored.
+    """
+    now = [time.time()]
+    first = DiskBackend(str(tmp_path), ttl=60, clock=lambda: now[0])
+    second = FragmentCache(DiskBackend(str(tmp_path), ttl=60, clock=lambda: now[0]))
+
+    first.set("dashboard:1:3", "<p>cached</p>")
+    assert second.get_or_render("dashboard:1:3", lambda: "<p>rendered</p>") == "<p>cached</p>"
+
+    now[0] += 3600
+    assert first.get("dashboard:1:3") is None
+    assert first.prune() == 1
+    assert first.stats()["items"] == 0
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX ownership")
+def test_disk_backend_directory_is_private(tmp_path, monkeypatch):
+    """
+    Verifies the directory is created owner-only and one owned by another user is refused.
+    """
+    directory = tmp_path / "fragments"
+    DiskBackend(str(directory))
+    assert stat.S_IMODE(directory.stat().st_mode) & 0o077 == 0
+
+    monkeypatch.setattr(os, "getuid", lambda: directory.stat().st_uid + 1)
+    with pytest.raises(PermissionError):
+        DiskBackend(str(directory))
@@ -0,0 +1,113 @@
+"""
+File: test_import_export.py
+Description:
+    Unit tests for streaming CSV/iCalendar import and export of assignments.
+"""
+
+import io
+from datetime import datetime
+
+from sqlalchemy import event
+
+import assignment_io
+
+CSV_TEXT = (
+    "Title,Due_Date,Priority,Description\n"
+    "Essay,2030-03-01,high,\"Five pages, double spaced\"\n"
+    ",2030-03-02,low,missing title\n"
+    "Lab,not a date,low,\n"
+    "Quiz,2030-03-04 09:30,,\n"
+)
+
+ICS_TEXT = (
+    "BEGIN:VCALENDAR\r\n"
+    "BEGIN:VTODO\r\n"
+    "SUMMARY:Read chapter 5\\, then\r\n"
+    "  summarize\r\n"
+    "DUE;VALUE=DATE:20300310\r\n"
+    "PRIORITY:2\r\n"
+    "DESCRIPTION:Line one\\nLine two\r\n"
+    "END:VTODO\r\n"
+    "BEGIN:VEVENT\r\n"
+    "SUMMARY:Midterm\r\n"
+    "DTSTART:20300315T140000Z\r\n"
+    "STATUS:COMPLETED\r\n"
+    "END:VEVENT\r\n"
+    "END:VCALENDAR\r\n"
+)
+
+
+def _titles(study_app, user_id):
+    with study_app.app.app_context():
+        return [a.title for a in study_app.Assignment.query.filter_by(user_id=user_id).order_by("due_date")]
+
+
+def test_csv_upload_imports_valid_rows_and_reports_the_rest(study_app, logged_in_client, user):
+    """
+    Verifies good rows are inserted and bad rows are reported by line.
+    """
+    response = logged_in_client.post("/assignments/import", data={
+        "file": (io.BytesIO(CSV_TEXT.encode()), "canvas.csv"),
+    }, content_type="multipart/form-data", follow_redirects=True)
+
+    assert b"Imported 2 assignments." in response.data
+    assert b"Line 3: title is required" in response.data
+    assert b"Line 4: due_date" in response.data
+    assert _titles(study_app, user) == ["Essay", "Quiz"]
+
+
+def test_ics_rows_are_unfolded_and_mapped():
+    """
+    Verifies folded lines, escapes, priorities and statuses from iCalendar.
+    """
+    rows = list(assignment_io.iter_rows(io.StringIO(ICS_TEXT), "ics"))
+
+    (_, todo), (_, event_row) = rows
+    assert todo["title"] == "Read chapter 5, then summarize"
+    assert todo["description"] == "Line one\nLine two"
+    assert (todo["due_date"], todo["priority"], todo["status"]) == (datetime(2030, 3, 10), "high", "pending")
+    assert (event_row["due_date"], event_row["status"]) == (datetime(2030, 3, 15, 14, 0), "completed")
+
+
+def test_import_inserts_in_batches(study_app, user):
+    """
+    Verifies rows go in as one executemany INSERT per batch.
+    """
+    lines = ["title,due_date\n"] + [f"Task {i},2030-01-{i + 1:02d}\n" for i in range(5)]
+    inserts = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO assignment"):
+            inserts.append(len(parameters) if executemany else 1)
+
+    with study_app.app.app_context():
+        engine = study_app.db.engine
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            report = study_app.import_assignment_rows(user, iter(lines), "csv", batch_size=2)
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+    assert report == {"imported": 5, "failed": 0, "errors": []}
+    assert inserts == [2, 2, 1]
+
+
+def test_exports_round_trip(study_app, logged_in_client, user):
+    """
+    Verifies the CSV export re-imports to the same assignments and the ICS export is a calendar.
+    """
+    with study_app.app.app_context():
+        study_app.import_assignment_rows(user, io.StringIO(CSV_TEXT), "csv")
+
+    exported = logged_in_client.get("/assignments/export.csv")
+    assert exported.mimetype == "text/csv"
+    assert "attachment" in exported.headers["Content-Disposition"]
+    rows = [values for _, values in assignment_io.iter_rows(io.StringIO(exported.get_data(as_text=True)), "csv")]
+    assert [(r["title"], r["description"], r["priority"]) for r in rows] == [
+        ("Essay", "Five pages, double spaced", "high"), ("Quiz", "", "medium")
+    ]
+
+    calendar = logged_in_client.get("/assignments/export.ics").get_data(as_text=True)
+    assert calendar.startswith("BEGIN:VCALENDAR") and calendar.count("BEGIN:VTODO") == 2
+    assert "SUMMARY:Essay" in calendar and "DESCRIPTION:Five pages\\, double spaced" in calendar
+    assert logged_in_client.get("/assignments/export.xml").status_code == 404
@@ -0,0 +1,86 @@
+"""
+File: test_jobs.py
+Description:
+    Unit tests for the background AI job queue.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from jobs import JobQueue, QueueFullError
+
+
+def _add_assignment(study_app, user_id):
+    with study_app.app.app_context():
+        assignment = study_app.Assignment(
+            title="Lab Report", due_date=datetime.now() + timedelta(days=2), user_id=user_id
+        )
+        study_app.db.session.add(assignment)
+        study_app.db.session.commit()
+        return assignment.id
+
+
+def test_queue_rejects_work_beyond_its_bound():
+    """
+    Verifies submit fails fast once max_pending jobs are in flight.
+    """
+    queue = JobQueue(max_workers=1, max_pending=1)
+    release = threading.Event()
+    future = queue.submit(release.wait)
+    with pytest.raises(QueueFullError):
+        queue.submit(lambda: None)
+    release.set()
+    future.result(timeout=5)
+    queue.submit(lambda: None).result(timeout=5)
+    queue.shutdown()
+
+
+def test_study_plan_job_runs_in_background(study_app, logged_in_client, user):
+    """
+    Verifies the route returns at once and the result page shows the saved plan.
+    """
+    assignment_id = _add_assignment(study_app, user)
+
+    response = logged_in_client.post("/ai-study-plan", data={"assignment_ids": [str(assignment_id)]})
+    assert response.status_code == 302
+    job_url = response.headers["Location"]
+
+    deadline = time.time() + 10
+    while logged_in_client.get(job_url + "/status").json["status"] not in ("finished", "failed"):
+        assert time.time() < deadline
+        time.sleep(0.05)
+
+    page = logged_in_client.get(job_url)
+    assert b"Work on Lab Report" in page.data
+    with study_app.app.app_context():
+        plan = study_app.StudyPlan.query.one()
+        assert [a.id for a in plan.assignments] == [assignment_id]
+
+
+def test_summary_job_in_eager_mode(study_app, logged_in_client, user):
+    """
+    Verifies summary jobs store their HTML on the job row.
+    """
+    study_app.job_queue.eager = True
+    try:
+        response = logged_in_client.post("/ai-summary", data={"notes": "Photosynthesis notes"})
+        status = logged_in_client.get(response.headers["Location"] + "/status").json
+        assert status["status"] == "finished"
+        assert b"Suggested Approach" in logged_in_client.get(status["result_url"]).data
+    finally:
+        study_app.job_queue.eager = False
+
+
+def test_other_users_cannot_see_a_job(study_app, logged_in_client, user):
+    """
+    Verifies job pages are scoped to their owner.
+    """
+    with study_app.app.app_context():
+        job = study_app.GenerationJob(kind="summary", params="{}", user_id=user + 1)
+        study_app.db.session.add(job)
+        study_app.db.session.commit()
+        job_id = job.id
+    assert logged_in_client.get(f"/jobs/{job_id}/status").status_code == 404
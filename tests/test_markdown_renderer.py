@@ -0,0 +1,48 @@
+"""
+File: test_markdown_renderer.py
+Description:
+    Unit tests for the single-pass markdown renderer.
+"""
+
+from markdown_renderer import MarkdownRenderer, render_markdown
+
+SAMPLE = """# Plan
+## This Week
+### Monday
+**Start early** on <the essay> & outline
+- Read chapter 4
+* Take notes
+1. Draft intro
+2. Draft body
+Wrap up"""
+
+
+def test_headers_are_balanced_and_text_escaped():
+    """
+    Verifies every header closes itself and model text cannot inject HTML.
+    """
+    html = render_markdown(SAMPLE)
+    assert "<h2>Plan</h2>" in html
+    assert "<h3>This Week</h3>" in html
+    assert "<h4>Monday</h4>" in html
+    assert "<p><strong>Start early</strong> on &lt;the essay&gt; &amp; outline</p>" in html
+
+
+def test_lists_switch_and_close():
+    """
+    Verifies a bullet list followed by a numbered list produces two closed lists.
+    """
+    html = render_markdown(SAMPLE)
+    assert "<ul>\n<li>Read chapter 4</li>\n<li>Take notes</li>\n</ul>\n<ol>" in html
+    assert "<li>Draft body</li>\n</ol>\n<p>Wrap up</p>" in html
+
+
+def test_incremental_feed_matches_whole_document():
+    """
+    Verifies feeding tiny chunks gives the same HTML as rendering at once.
+    """
+    renderer = MarkdownRenderer()
+    chunks = [renderer.feed(SAMPLE[i:i + 3]) for i in range(0, len(SAMPLE), 3)]
+    chunks.append(renderer.close())
+    assert "".join(chunks) == render_markdown(SAMPLE)
+    assert chunks[0] == ""
@@ -0,0 +1,88 @@
+"""
+File: test_metrics.py
+Description:
+    Unit tests for per-request instrumentation and the /metrics endpoint.
+"""
+
+import os
+import re
+import time
+
+from request_metrics import MetricsRegistry
+
+
+def _sample(text, name, **labels):
+    """
+    Returns the value of one series in a Prometheus text payload.
+    """
+    for line in text.splitlines():
+        match = re.match(r"(\w+)(?:\{(.*)\})? (\S+)$", line)
+        if match and match.group(1) == name:
+            found = dict(re.findall(r'(\w+)="((?:[^"\\]|\\.)*)"', match.group(2) or ""))
+            if found == {k: str(v) for k, v in labels.items()}:
+                return float(match.group(3))
+    return None
+
+
+def test_requests_are_counted_per_endpoint(study_app, logged_in_client):
+    """
+    Verifies status, latency, SQL and cache lookups are recorded per endpoint.
+    """
+    study_app.metrics_registry.reset()
+    logged_in_client.get("/dashboard")
+    logged_in_client.get("/dashboard")
+    logged_in_client.get("/no-such-page")
+
+    text = logged_in_client.get("/metrics").get_data(as_text=True)
+    prefix = "study_assistant_"
+    assert _sample(text, prefix + "http_requests_total", endpoint="dashboard", method="GET", status=200) == 2
+    assert _sample(text, prefix + "http_requests_total", endpoint="unmatched", method="GET", status=404) == 1
+    assert _sample(text, prefix + "http_request_duration_seconds_count", endpoint="dashboard") == 2
+    assert _sample(text, prefix + "http_request_duration_seconds_bucket", endpoint="dashboard", le="+Inf") == 2
+    assert _sample(text, prefix + "sql_statements_total", endpoint="dashboard") >= 2
+    assert _sample(text, prefix + "cache_lookups_total", endpoint="dashboard", cache="fragment", result="miss") == 1
+    assert _sample(text, prefix + "cache_lookups_total", endpoint="dashboard", cache="fragment", result="hit") == 1
+    assert _sample(text, prefix + "cache_lookups_total", endpoint="dashboard", cache="user", result="hit") == 1
+
+
+def test_ai_calls_are_timed(study_app, logged_in_client, monkeypatch):
+    """
+    Verifies AI latency lands in the histogram and on the calling request.
+    """
+    monkeypatch.setattr(study_app.job_queue, "eager", True)
+    logged_in_client.post("/ai-summary", data={"notes": "Photosynthesis turns light into sugar."})
+
+    text = logged_in_client.get("/metrics").get_data(as_text=True)
+    assert _sample(text, "study_assistant_ai_call_duration_seconds_count", mode="generate", outcome="ok") == 1
+    assert _sample(text, "study_assistant_request_ai_calls_total", endpoint="ai_summary") == 1
+
+
+def test_slow_sampled_requests_are_profiled(tmp_path):
+    """
+    Verifies sampled requests over the threshold leave a .prof file and fast ones do not.
+    """
+    registry = MetricsRegistry(profile_sample_rate=1.0, profile_threshold_ms=20, profile_dir=str(tmp_path),
+                               rng=lambda: 0.0)
+    registry.start_request()
+    registry.finish_request("fast", "GET")
+    registry.start_request()
+    time.sleep(0.03)
+    registry.finish_request("slow/page", "GET")
+
+    files = os.listdir(tmp_path)
+    assert len(files) == 1 and "slow_page" in files[0] and files[0].endswith(".prof")
+    assert registry.profiles_written == 1
+
+
+def test_labels_are_escaped_and_background_sql_is_separate():
+    """
+    Verifies label values are escaped and SQL outside a request is labelled as background.
+    """
+    registry = MetricsRegistry()
+    registry.observe_sql(0.002)
+    registry.start_request()
+    registry.finish_request('say "hi"\\', "GET")
+
+    text = registry.render()
+    assert 'endpoint="say \\"hi\\"\\\\"' in text
+    assert _sample(text, "study_assistant_sql_statements_total", endpoint="(background)") == 1
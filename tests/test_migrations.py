@@ -0,0 +1,122 @@
+"""
+File: test_migrations.py
+Description:
+    Unit tests for schema migrations and hot-query index usage.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event, inspect, text
+
+import migrations
+
+
+def test_upgrade_adds_indexes_to_existing_database(tmp_path):
+    """
+    Verifies a database created before the indexes existed gets them.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE assignment (id INTEGER PRIMARY KEY, user_id INTEGER, "
+                                "due_date DATETIME, status VARCHAR(20), priority VARCHAR(20))"))
+        connection.execute(text("CREATE TABLE study_plan (id INTEGER PRIMARY KEY, content TEXT, "
+                                "user_id INTEGER, created_at DATETIME)"))
+
+    version = migrations.upgrade(engine)
+
+    assert version == migrations.MIGRATIONS[-1][0]
+    names = {index["name"] for index in inspect(engine).get_indexes("assignment")}
+    assert {"ix_assignment_user_due", "ix_assignment_user_status_due"} <= names
+    assert migrations.upgrade(engine) == version
+
+
+def test_upgrade_indexes_ai_cache_expiry(tmp_path):
+    """
+    Verifies an AI cache table created before the expiry index gets it.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE ai_response_cache (key VARCHAR(64) PRIMARY KEY, value TEXT, "
+                                "created_at FLOAT, expires_at FLOAT)"))
+        connection.execute(text("CREATE TABLE schema_version (version INTEGER NOT NULL)"))
+        connection.execute(text("INSERT INTO schema_version (version) VALUES (4)"))
+
+    migrations.upgrade(engine)
+
+    names = {index["name"] for index in inspect(engine).get_indexes("ai_response_cache")}
+    assert "ix_ai_response_cache_expires_at" in names
+
+
+def test_upgrade_moves_plan_assignment_strings_into_link_table(tmp_path):
+    """
+    Verifies comma-joined StudyPlan.assignment_ids become link rows, skipping bad ids.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE assignment (id INTEGER PRIMARY KEY, user_id INTEGER, "
+                                "due_date DATETIME, status VARCHAR(20), priority VARCHAR(20))"))
+        connection.execute(text("CREATE TABLE study_plan (id INTEGER PRIMARY KEY, content TEXT, "
+                                "assignment_ids VARCHAR(500), user_id INTEGER, created_at DATETIME)"))
+        connection.execute(text("INSERT INTO assignment (id, user_id) VALUES (1, 1), (2, 1), (3, 2)"))
+        # 3 belongs to another user and 9 no longer exists
+        connection.execute(text("INSERT INTO study_plan (id, content, assignment_ids, user_id) "
+                                "VALUES (1, 'a', '1,2', 1), (2, 'b', '2, 3,9,', 1), (3, 'c', NULL, 1)"))
+
+    migrations.upgrade(engine)
+
+    with engine.connect() as connection:
+        links = connection.execute(text(
+            "SELECT study_plan_id, assignment_id FROM study_plan_assignment ORDER BY 1, 2"
+        )).fetchall()
+        stale = connection.execute(text("SELECT DISTINCT is_stale FROM study_plan")).scalars().all()
+        excerpts = connection.execute(text("SELECT excerpt FROM study_plan ORDER BY id")).scalars().all()
+    assert [tuple(link) for link in links] == [(1, 1), (1, 2), (2, 2)]
+    assert stale == [0]
+    assert excerpts == ["a", "b", "c"]
+
+
+def _capture_selects(engine):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    return statements, lambda: event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.mark.parametrize("url", [
+    "/dashboard",
+    "/assignments",
+    "/assignments?priority=high",
+    "/assignments?status=pending",
+    "/ai-study-plan",
+    "/ai-summary",
+    "/progress",
+])
+def test_hot_routes_use_indexes(study_app, logged_in_client, user, url):
+    """
+    Runs EXPLAIN QUERY PLAN on every SELECT a route issues and fails on full table scans.
+    """
+    with study_app.app.app_context():
+        study_app.db.session.add(study_app.Assignment(
+            title="Essay", due_date=datetime.now() - timedelta(days=1), user_id=user
+        ))
+        study_app.db.session.commit()
+        engine = study_app.db.engine
+
+    statements, stop = _capture_selects(engine)
+    try:
+        assert logged_in_client.get(url).status_code == 200
+    finally:
+        stop()
+
+    assert statements
+    with engine.connect() as connection:
+        for statement, parameters in statements:
+            plan = connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).fetchall()
+            details = [row[-1] for row in plan]
+            scans = [d for d in details if d.startswith("SCAN") and ("assignment" in d or "study_plan" in d)]
+            assert not scans, f"{url} scans a table: {statement}\n{details}"
@@ -0,0 +1,50 @@
+"""
+File: test_overdue.py
+Description:
+    Unit tests for the set-based overdue sweeper.
+"""
+
+from datetime import datetime, timedelta
+
+
+def _add(study_app, user_id, title, days, status="pending"):
+    assignment = study_app.Assignment(
+        title=title,
+        due_date=datetime.now() + timedelta(days=days),
+        status=status,
+        user_id=user_id
+    )
+    study_app.db.session.add(assignment)
+    study_app.db.session.commit()
+    return assignment.id
+
+
+def test_sweep_flags_only_unfinished_past_due(study_app, user):
+    """
+    Verifies the sweep marks past-due pending work and leaves the rest alone.
+    """
+    with study_app.app.app_context():
+        late = _add(study_app, user, "Late", -2)
+        done = _add(study_app, user, "Done", -2, status="completed")
+        upcoming = _add(study_app, user, "Upcoming", 3)
+
+        assert study_app.sweep_overdue_assignments(user) == 1
+
+        statuses = {a.id: a.status for a in study_app.Assignment.query.all()}
+        assert statuses == {late: "overdue", done: "completed", upcoming: "pending"}
+
+
+def test_sweep_runs_once_per_interval(study_app, user):
+    """
+    Verifies the lazy sweep is throttled until it is reset.
+    """
+    study_app._overdue_swept_at.clear()
+    with study_app.app.app_context():
+        _add(study_app, user, "Late", -1)
+        assert study_app.sweep_overdue_if_due(user) == 1
+
+        _add(study_app, user, "Also late", -1)
+        assert study_app.sweep_overdue_if_due(user) == 0
+
+        study_app.reset_overdue_sweep(user)
+        assert study_app.sweep_overdue_if_due(user) == 1
@@ -0,0 +1,55 @@
+"""
+File: test_pagination.py
+Description:
+    Unit tests for keyset pagination of the assignments list.
+"""
+
+from datetime import datetime, timedelta
+
+
+def _seed(study_app, user_id, count, priority="medium"):
+    base = datetime(2030, 1, 1)
+    with study_app.app.app_context():
+        for i in range(count):
+            # pairs of assignments share a due date to exercise the id tie-breaker
+            study_app.db.session.add(study_app.Assignment(
+                title=f"Task {i}",
+                due_date=base + timedelta(days=i // 2),
+                priority=priority,
+                user_id=user_id
+            ))
+        study_app.db.session.commit()
+
+
+def test_pages_cover_every_assignment_once(study_app, user):
+    """
+    Walks every page and verifies nothing is skipped or repeated.
+    """
+    _seed(study_app, user, 11)
+    seen, cursor = [], None
+    with study_app.app.app_context():
+        base_query = study_app.Assignment.query.filter_by(user_id=user)
+        while True:
+            page, cursor = study_app.paginate_assignments(base_query, cursor, 4)
+            seen.extend(a.title for a in page)
+            if not cursor:
+                break
+    assert seen == [f"Task {i}" for i in range(11)]
+
+
+def test_assignments_page_links_to_next_page(study_app, logged_in_client, user):
+    """
+    Verifies the page renders a next link that keeps the filters.
+    """
+    study_app.app.config["ASSIGNMENTS_PER_PAGE"] = 2
+    try:
+        _seed(study_app, user, 3, priority="high")
+        first = logged_in_client.get("/assignments?priority=high")
+        assert b"Task 1" in first.data and b"Task 2" not in first.data
+        assert b"Next Page" in first.data
+
+        second = logged_in_client.get("/assignments?priority=high&after=2030-01-01T00:00:00_2")
+        assert b"Task 2" in second.data and b"Task 0" not in second.data
+        assert b"Next Page" not in second.data
+    finally:
+        study_app.app.config["ASSIGNMENTS_PER_PAGE"] = 25
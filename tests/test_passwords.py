@@ -0,0 +1,55 @@
+"""
+File: test_passwords.py
+Description:
+    Unit tests for configurable password hashing and rehash-on-login.
+"""
+
+from werkzeug.security import generate_password_hash
+
+from passwords import PasswordHasher
+
+
+def test_needs_rehash_tracks_method_and_salt():
+    """
+    Verifies hashes made with other parameters are flagged for upgrade.
+    """
+    hasher = PasswordHasher(method="pbkdf2:sha256:1000", salt_length=8)
+    current = hasher.hash("secret")
+
+    assert hasher.verify(current, "secret") and not hasher.verify(current, "wrong")
+    assert not hasher.needs_rehash(current)
+    assert hasher.needs_rehash(generate_password_hash("secret", "pbkdf2:sha256:500", 8))
+    assert hasher.needs_rehash(generate_password_hash("secret", "pbkdf2:sha256:1000", 16))
+
+
+def test_process_pool_hashes_off_the_calling_thread():
+    """
+    Verifies pooled hashing gives the same results as inline hashing.
+    """
+    hasher = PasswordHasher(method="pbkdf2:sha256:1000", pool_size=1)
+    try:
+        pwhash = hasher.hash("secret")
+        assert hasher.verify(pwhash, "secret")
+        assert not hasher.verify(pwhash, "wrong")
+    finally:
+        hasher.shutdown()
+
+
+def test_login_upgrades_an_outdated_hash(study_app, client):
+    """
+    Verifies a successful login rehashes with the configured parameters.
+    """
+    with study_app.app.app_context():
+        user = study_app.User(username="old", email="old@example.com",
+                              password_hash=generate_password_hash("password123", "pbkdf2:sha256:1000"))
+        study_app.db.session.add(user)
+        study_app.db.session.commit()
+        user_id = user.id
+
+    response = client.post("/login", data={"username": "old", "password": "password123"})
+
+    assert response.status_code == 302
+    with study_app.app.app_context():
+        upgraded = study_app.db.session.get(study_app.User, user_id).password_hash
+    assert not study_app.password_hasher.needs_rehash(upgraded)
+    assert study_app.password_hasher.verify(upgraded, "password123")
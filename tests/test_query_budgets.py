@@ -0,0 +1,182 @@
+"""
+File: test_query_budgets.py
+Description:
+    Unit tests for query budgets: the budget facility itself, and every
+    route in app.py staying within its declared budget on a data set of
+    realistic size with cold caches.
+"""
+
+import io
+import json
+import logging
+from datetime import datetime, timedelta
+
+import pytest
+
+from query_budget import QueryBudgetExceeded
+
+# (method, url, form data, anonymous); "{name}" placeholders come from the realistic_data fixture
+ROUTE_CASES = [
+    ("GET", "/", None, True),
+    ("GET", "/", None, False),
+    ("GET", "/register", None, True),
+    ("POST", "/register", {"username": "newcomer", "email": "new@example.com", "password": "secret123"}, True),
+    ("GET", "/login", None, True),
+    ("POST", "/login", {"username": "student", "password": "password123"}, True),
+    ("GET", "/logout", None, False),
+    ("GET", "/dashboard", None, False),
+    ("GET", "/assignments", None, False),
+    ("GET", "/assignments?priority=high&status=pending", None, False),
+    ("GET", "/api/assignments", None, False),
+    ("GET", "/assignment/add", None, False),
+    ("POST", "/assignment/add", {"title": "Lab", "due_date": "2030-01-15", "priority": "high"}, False),
+    ("GET", "/assignments/import", None, False),
+    ("POST", "/assignments/import", "csv", False),
+    ("POST", "/assignments/import", "csv batches", False),
+    ("GET", "/assignments/export.csv", None, False),
+    ("GET", "/assignment/edit/{assignment_id}", None, False),
+    ("POST", "/assignment/edit/{assignment_id}",
+     {"title": "Edited", "description": "", "due_date": "2030-02-01", "priority": "low"}, False),
+    ("POST", "/assignment/complete/{assignment_id}", None, False),
+    ("POST", "/assignment/delete/{assignment_id}", None, False),
+    ("GET", "/ai-study-plan", None, False),
+    ("POST", "/ai-study-plan", {"assignment_ids": "{plan_assignment_ids}"}, False),
+    ("GET", "/study-plans/{plan_id}", None, False),
+    ("POST", "/study-plans/{plan_id}/refresh", None, False),
+    ("GET", "/ai-summary", None, False),
+    ("POST", "/ai-summary", {"assignment_id": "{assignment_id}", "notes": ""}, False),
+    ("GET", "/jobs/{summary_job_id}", None, False),
+    ("GET", "/jobs/{plan_job_id}", None, False),
+    ("GET", "/jobs/{plan_job_id}/stream", None, False),
+    ("GET", "/jobs/{summary_job_id}/status", None, False),
+    ("GET", "/progress", None, False),
+    ("POST", "/api/study-plans/batch", "batch", True),
+    ("GET", "/ai/status", None, True),
+    ("GET", "/cache/status", None, True),
+    ("GET", "/metrics", None, True),
+]
+
+
+@pytest.fixture
+def realistic_data(study_app, user):
+    """
+    Gives the test user 200 assignments (some past due), three linked
+    study plans and finished jobs, next to another user's data.
+    """
+    db = study_app.db
+    now = datetime.now()
+    with study_app.app.app_context():
+        other = study_app.User(username="other", email="other@example.com", password_hash="x")
+        db.session.add(other)
+        db.session.flush()
+        for owner, count in ((user, 200), (other.id, 50)):
+            db.session.add_all(
+                study_app.Assignment(title=f"Assignment {n}", description="Read and take notes",
+                                     due_date=now + timedelta(days=n % 40 - 10),
+                                     priority=("low", "medium", "high")[n % 3],
+                                     status="completed" if n % 5 == 0 else "pending", user_id=owner)
+                for n in range(count)
+            )
+        db.session.flush()
+        pending = study_app.Assignment.query.filter_by(user_id=user, status="pending").order_by(
+            study_app.Assignment.due_date.desc()
+        ).limit(15).all()
+        plans = [study_app.StudyPlan(content=f"<h2>Plan {n}</h2><p>Steps</p>", user_id=user,
+                                     assignments=pending[n * 5:n * 5 + 5]) for n in range(3)]
+        db.session.add_all(plans)
+        db.session.flush()
+        summary_job = study_app.GenerationJob(kind="summary", status="finished", user_id=user,
+                                              params=json.dumps({"assignment_id": pending[0].id, "notes": ""}),
+                                              result="<p>Summary</p>")
+        plan_job = study_app.GenerationJob(kind="study_plan", status="finished", user_id=user,
+                                           study_plan_id=plans[0].id,
+                                           params=json.dumps({"assignment_ids": [a.id for a in pending[:5]]}))
+        db.session.add_all([summary_job, plan_job])
+        db.session.commit()
+        return {
+            "assignment_id": pending[0].id,
+            "plan_assignment_ids": [a.id for a in pending[:5]],
+            "plan_id": plans[0].id,
+            "summary_job_id": summary_job.id,
+            "plan_job_id": plan_job.id,
+            "user_id": user,
+        }
+
+
+def _fill(value, ids):
+    if value == "{plan_assignment_ids}":
+        return [str(i) for i in ids["plan_assignment_ids"]]
+    return value.format(**ids) if isinstance(value, str) else value
+
+
+@pytest.mark.parametrize("method, url, form, anonymous", ROUTE_CASES,
+                         ids=[f"{m} {u}{' (anonymous)' if a else ''}" for m, u, _, a in ROUTE_CASES])
+def test_route_stays_within_query_budget(study_app, realistic_data, monkeypatch, method, url, form, anonymous):
+    """
+    Verifies each route's first (cold cache) request fits its declared budget.
+    """
+    # generation jobs would run on other threads; only the request itself is budgeted
+    monkeypatch.setattr(study_app.job_queue, "submit", lambda *args: None)
+    monkeypatch.setitem(study_app.app.config, "BATCH_API_TOKEN", "token")
+
+    client = study_app.app.test_client()
+    if not anonymous:
+        client.post("/login", data={"username": "student", "password": "password123"})
+    study_app.user_cache.clear()
+    study_app.fragment_cache.clear()
+    study_app.reset_overdue_sweep(realistic_data["user_id"])
+
+    kwargs = {}
+    if form == "csv":
+        upload = io.BytesIO(b"title,due_date\nEssay,2030-03-01\nQuiz,2030-03-02\n")
+        kwargs["data"] = {"file": (upload, "upload.csv")}
+    elif form == "csv batches":
+        # more rows than IMPORT_BATCH_SIZE, so the import runs several INSERTs
+        rows = "".join(f"Reading {n},2030-04-01\n" for n in range(3 * study_app.app.config["IMPORT_BATCH_SIZE"] + 100))
+        kwargs["data"] = {"file": (io.BytesIO(("title,due_date\n" + rows).encode()), "upload.csv")}
+    elif form == "batch":
+        kwargs["json"] = {"items": [{"user_id": realistic_data["user_id"],
+                                     "assignment_ids": realistic_data["plan_assignment_ids"]}]}
+        kwargs["headers"] = {"Authorization": "Bearer token"}
+    elif form is not None:
+        kwargs["data"] = {key: _fill(value, realistic_data) for key, value in form.items()}
+
+    # QueryBudgetExceeded propagates out of the test client while testing
+    response = client.open(url.format(**realistic_data), method=method, **kwargs)
+    response.get_data()
+    assert response.status_code < 400
+
+
+def test_every_route_declares_a_budget(study_app):
+    """
+    Verifies no view is added without a query budget.
+    """
+    missing = [endpoint for endpoint, view in study_app.app.view_functions.items()
+               if endpoint != "static" and not hasattr(view, "query_budget")]
+    assert missing == []
+
+
+def test_budget_raises_or_logs_when_exceeded(study_app, user, caplog):
+    """
+    Verifies going over a budget raises with the statements listed, or logs in log mode.
+    """
+    User = study_app.User
+    with study_app.app.app_context():
+        with pytest.raises(QueryBudgetExceeded) as raised:
+            with study_app.query_tracker.budget(1, "two lookups"):
+                User.query.filter_by(username="student").first()
+                User.query.filter_by(email="student@example.com").first()
+        assert len(raised.value.statements) == 2 and "two lookups ran 2 queries" in str(raised.value)
+
+        with study_app.query_tracker.budget(2) as budget:
+            User.query.filter_by(id=user).first()
+        assert budget.count == 1
+
+        study_app.app.config["QUERY_BUDGET_MODE"] = "log"
+        try:
+            with caplog.at_level(logging.WARNING, logger="query_budget"):
+                with study_app.query_tracker.budget(0, "logged"):
+                    User.query.filter_by(id=user).first()
+        finally:
+            study_app.app.config["QUERY_BUDGET_MODE"] = ""
+    assert "logged ran 1 queries (budget 0)" in caplog.text
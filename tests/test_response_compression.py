@@ -0,0 +1,104 @@
+"""
+File: test_response_compression.py
+Description:
+    Unit tests for gzip response compression: size and type limits,
+    per-chunk flushing of streamed bodies, and ETag revalidation.
+"""
+
+import gzip
+import zlib
+
+import pytest
+from flask import Flask, Response, jsonify
+
+from response_compression import ResponseCompressor
+
+PAGE = "<li>Read chapter four and take notes</li>\n" * 100
+
+
+@pytest.fixture
+def compressed_app():
+    app = Flask(__name__)
+    ResponseCompressor(app, min_size=500)
+
+    @app.route("/page")
+    def page():
+        return PAGE
+
+    @app.route("/small")
+    def small():
+        return jsonify(ok=True)
+
+    @app.route("/binary")
+    def binary():
+        return Response(PAGE, mimetype="application/octet-stream")
+
+    @app.route("/events")
+    def events():
+        return Response((f"data: event {n}\n\n" for n in range(3)), mimetype="text/event-stream")
+
+    return app
+
+
+def test_compresses_allowed_types_above_min_size(compressed_app):
+    """
+    Verifies large HTML is gzipped when accepted, while small, binary and non-accepting requests are left alone.
+    """
+    client = compressed_app.test_client()
+    response = client.get("/page", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert gzip.decompress(response.get_data()).decode() == PAGE
+    assert int(response.headers["Content-Length"]) < len(PAGE) / 5
+
+    assert "Content-Encoding" not in client.get("/page").headers
+    assert "Content-Encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+    assert "Content-Encoding" not in client.get("/binary", headers={"Accept-Encoding": "gzip"}).headers
+
+
+def test_streamed_chunks_are_flushed_individually(compressed_app):
+    """
+    Verifies each event of a stream can be decoded as soon as its chunk arrives.
+    """
+    response = compressed_app.test_client().get("/events", headers={"Accept-Encoding": "gzip"}, buffered=False)
+    assert response.headers["Content-Encoding"] == "gzip" and "Content-Length" not in response.headers
+
+    decoder = zlib.decompressobj(31)
+    decoded = [decoder.decompress(chunk).decode() for chunk in response.response]
+    response.close()
+    assert decoded[:3] == [f"data: event {n}\n\n" for n in range(3)]
+    assert decoder.eof
+
+
+def test_api_etag_revalidates_when_compressed(study_app, logged_in_client, monkeypatch):
+    """
+    Verifies a compressed API response carries a strong, encoding-specific ETag that still earns a 304.
+    """
+    monkeypatch.setattr(study_app.response_compressor, "min_size", 0)
+    headers = {"Accept-Encoding": "gzip, br"}
+    response = logged_in_client.get("/api/assignments", headers=headers)
+    assert response.headers["Content-Encoding"] in ("gzip", "br")
+    etag = response.headers["ETag"]
+    assert not etag.startswith("W/") and etag.endswith(f'-{response.headers["Content-Encoding"]}"')
+
+    cached = logged_in_client.get("/api/assignments", headers=dict(headers, **{"If-None-Match": etag}))
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+
+    # a tag received without compression still matches
+    plain = logged_in_client.get("/api/assignments").headers["ETag"]
+    assert logged_in_client.get("/api/assignments", headers=dict(headers, **{"If-None-Match": plain})).status_code == 304
+
+
+def test_small_api_response_keeps_its_etag_on_revalidation(study_app, logged_in_client):
+    """
+    Verifies an uncompressed small body and its 304 carry the same ETag.
+    """
+    headers = {"Accept-Encoding": "gzip"}
+    response = logged_in_client.get("/api/assignments", headers=headers)
+    assert "Content-Encoding" not in response.headers
+    assert len(response.get_data()) < study_app.response_compressor.min_size
+
+    cached = logged_in_client.get("/api/assignments", headers=dict(headers, **{"If-None-Match": response.headers["ETag"]}))
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == response.headers["ETag"]
@@ -0,0 +1,79 @@
+"""
+File: test_static_assets.py
+Description:
+    Unit tests for the fingerprinted, precompressed static build and how
+    it is served.
+"""
+
+import gzip
+
+import pytest
+from flask import Flask, render_template_string
+
+from static_assets import StaticAssets, build
+
+CSS = b"body { color: #333; }\n" * 200
+
+
+@pytest.fixture
+def static_app(tmp_path):
+    static_dir = tmp_path / "static"
+    (static_dir / "css").mkdir(parents=True)
+    (static_dir / "css" / "style.css").write_bytes(CSS)
+    (static_dir / "logo.png").write_bytes(b"\x89PNG not really")
+    app = Flask(__name__, static_folder=str(static_dir))
+    return app, static_dir
+
+
+def test_build_writes_hashed_and_gzipped_copies(static_app):
+    """
+    Verifies the build names files by content and only precompresses text formats.
+    """
+    app, static_dir = static_app
+    files = build(str(static_dir))["files"]
+
+    css, png = files["css/style.css"], files["logo.png"]
+    assert css["path"] == f"css/style.{css['hash']}.css" and "gzip" in css["encodings"]
+    assert gzip.decompress((static_dir / "dist" / (css["path"] + ".gz")).read_bytes()) == CSS
+    assert png["encodings"] == []
+    # rebuilding identical content gives identical names
+    assert build(str(static_dir))["files"]["css/style.css"]["path"] == css["path"]
+
+
+def test_url_for_and_serving_use_the_build(static_app):
+    """
+    Verifies url_for emits the fingerprinted URL, served immutable and gzipped when accepted.
+    """
+    app, static_dir = static_app
+    path = build(str(static_dir))["files"]["css/style.css"]["path"]
+    StaticAssets(app)
+
+    with app.test_request_context():
+        url = render_template_string("{{ url_for('static', filename='css/style.css') }}")
+    assert url == f"/static/dist/{path}"
+
+    client = app.test_client()
+    response = client.get(url, headers={"Accept-Encoding": "gzip, deflate"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.mimetype == "text/css"
+    assert "immutable" in response.headers["Cache-Control"] and "max-age=31536000" in response.headers["Cache-Control"]
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert gzip.decompress(response.get_data()) == CSS
+
+    response = client.get(url, headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in response.headers and response.get_data() == CSS
+
+
+def test_files_changed_after_the_build_keep_plain_urls(static_app):
+    """
+    Verifies an edited file falls back to its unfingerprinted URL instead of serving the stale build.
+    """
+    app, static_dir = static_app
+    build(str(static_dir))
+    (static_dir / "css" / "style.css").write_bytes(CSS + b"h1 { margin: 0; }\n")
+    assets = StaticAssets(app)
+
+    assert "css/style.css" not in assets.urls
+    with app.test_request_context():
+        assert render_template_string("{{ url_for('static', filename='css/style.css') }}") == "/static/css/style.css"
+    assert app.test_client().get("/static/css/style.css").status_code == 200
@@ -0,0 +1,63 @@
+"""
+File: test_stats.py
+Description:
+    Unit tests for the SQL-computed assignment statistics.
+"""
+
+from datetime import datetime, timedelta
+
+
+def _add_assignments(study_app, user_id, rows):
+    with study_app.app.app_context():
+        for status, priority in rows:
+            study_app.db.session.add(study_app.Assignment(
+                title=f"{status} {priority}",
+                due_date=datetime.now() + timedelta(days=5),
+                priority=priority,
+                status=status,
+                user_id=user_id
+            ))
+        study_app.db.session.commit()
+
+
+def test_assignment_stats_grouped_counts(study_app, user):
+    """
+    Verifies status and priority counts from the grouped query.
+    """
+    _add_assignments(study_app, user, [
+        ("completed", "high"),
+        ("completed", "low"),
+        ("pending", "high"),
+        ("overdue", "medium"),
+    ])
+    with study_app.app.app_context():
+        stats = study_app.get_assignment_stats(user)
+
+    assert stats["total"] == 4
+    assert stats["completed"] == 2
+    assert stats["pending"] == 1
+    assert stats["overdue"] == 1
+    assert stats["high_priority"] == 2
+    assert stats["medium_priority"] == 1
+    assert stats["low_priority"] == 1
+    assert stats["completion_rate"] == 50.0
+
+
+def test_assignment_stats_empty(study_app, user):
+    """
+    Verifies a user without assignments gets zeroed stats.
+    """
+    with study_app.app.app_context():
+        stats = study_app.get_assignment_stats(user)
+    assert stats["total"] == 0
+    assert stats["completion_rate"] == 0
+
+
+def test_progress_page_renders_stats(study_app, logged_in_client, user):
+    """
+    Verifies the progress page renders the aggregated numbers.
+    """
+    _add_assignments(study_app, user, [("completed", "high"), ("pending", "low")])
+    response = logged_in_client.get("/progress")
+    assert response.status_code == 200
+    assert b"50.0%" in response.data
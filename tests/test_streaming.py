@@ -0,0 +1,79 @@
+"""
+File: test_streaming.py
+Description:
+    Unit tests for streamed AI output (inference client and SSE route).
+"""
+
+import json
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from ai_client import InferenceClient
+
+
+def _parse_events(body):
+    events = []
+    for block in body.decode().strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_client_yields_streamed_tokens():
+    """
+    Verifies server-sent token events are decoded and special tokens skipped.
+    """
+    tokens = [{"text": "Study", "special": False}, {"text": " hard", "special": False},
+              {"text": "</s>", "special": True}]
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+            for token in tokens:
+                self.wfile.write(f"data: {json.dumps({'token': token})}\n\n".encode())
+                self.wfile.flush()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        client = InferenceClient(f"http://127.0.0.1:{server.server_port}/model")
+        assert list(client.stream({"inputs": "hi"})) == ["Study", " hard"]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_stream_route_sends_chunks_and_saves_plan(study_app, logged_in_client, user, monkeypatch):
+    """
+    Verifies the SSE route streams rendered blocks and persists the final plan.
+    """
+    monkeypatch.setitem(study_app.app.config, "AI_STREAMING", True)
+    with study_app.app.app_context():
+        assignment = study_app.Assignment(title="Quiz Prep", due_date=datetime.now() + timedelta(days=3), user_id=user)
+        study_app.db.session.add(assignment)
+        study_app.db.session.commit()
+        assignment_id = assignment.id
+
+    job_url = logged_in_client.post("/ai-study-plan", data={"assignment_ids": [str(assignment_id)]}).headers["Location"]
+    assert b"EventSource" in logged_in_client.get(job_url).data
+
+    response = logged_in_client.get(job_url + "/stream")
+    assert response.mimetype == "text/event-stream"
+    events = _parse_events(response.data)
+
+    chunks = [data["html"] for name, data in events if name == "chunk"]
+    assert len(chunks) > 1
+    assert events[-1][0] == "done"
+    with study_app.app.app_context():
+        plan = study_app.StudyPlan.query.one()
+        assert "Work on Quiz Prep" in plan.content
+
+    # the job has already been run, so a second stream just waits
+    assert _parse_events(logged_in_client.get(job_url + "/stream").data)[0][0] == "waiting"
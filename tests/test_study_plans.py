@@ -0,0 +1,140 @@
+"""
+File: test_study_plans.py
+Description:
+    Unit tests for study plan staleness, incremental refresh and
+    deferred content loading.
+"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+
+def _make_plans(study_app, user_id):
+    """
+    Two assignments and two plans: plan A uses both, plan B only the second.
+    """
+    with study_app.app.app_context():
+        first, second = (
+            study_app.Assignment(title=title, due_date=datetime.now() + timedelta(days=days), user_id=user_id)
+            for title, days in (("Essay", 3), ("Lab", 5))
+        )
+        plan_a = study_app.StudyPlan(content="<p>A</p>", user_id=user_id, assignments=[first, second])
+        plan_b = study_app.StudyPlan(content="<p>B</p>", user_id=user_id, assignments=[second])
+        study_app.db.session.add_all([plan_a, plan_b])
+        study_app.db.session.commit()
+        return first.id, second.id, plan_a.id, plan_b.id
+
+
+def _stale(study_app):
+    with study_app.app.app_context():
+        return {plan.id for plan in study_app.StudyPlan.query.filter_by(is_stale=True)}
+
+
+def test_only_plans_using_an_edited_assignment_go_stale(study_app, logged_in_client, user):
+    """
+    Verifies editing marks just the referencing plans and ignores no-op edits.
+    """
+    first_id, _, plan_a, _ = _make_plans(study_app, user)
+    due_day = (datetime.now() + timedelta(days=3)).replace(hour=0, minute=0, second=0, microsecond=0)
+    with study_app.app.app_context():
+        # the form only carries the day, so start from a midnight due date
+        study_app.db.session.get(study_app.Assignment, first_id).due_date = due_day
+        study_app.db.session.commit()
+    form = {"title": "Essay", "description": "new notes only",
+            "due_date": due_day.strftime("%Y-%m-%d"), "priority": "medium"}
+
+    # a description-only edit leaves the plan's inputs alone
+    logged_in_client.post(f"/assignment/edit/{first_id}", data=form)
+    with study_app.app.app_context():
+        assert study_app.db.session.get(study_app.Assignment, first_id).description == "new notes only"
+    assert _stale(study_app) == set()
+
+    logged_in_client.post(f"/assignment/edit/{first_id}", data=dict(form, priority="high"))
+    assert _stale(study_app) == {plan_a}
+
+
+def test_completing_and_deleting_mark_referencing_plans(study_app, logged_in_client, user):
+    """
+    Verifies completion and deletion mark every plan that used the assignment.
+    """
+    first_id, second_id, plan_a, plan_b = _make_plans(study_app, user)
+
+    logged_in_client.post(f"/assignment/complete/{first_id}")
+    assert _stale(study_app) == {plan_a}
+
+    logged_in_client.post(f"/assignment/delete/{second_id}")
+    assert _stale(study_app) == {plan_a, plan_b}
+    with study_app.app.app_context():
+        assert [a.id for a in study_app.db.session.get(study_app.StudyPlan, plan_a).assignments] == [first_id]
+
+
+def test_refresh_rewrites_the_stale_plan_in_place(study_app, logged_in_client, user, monkeypatch):
+    """
+    Verifies a refresh regenerates one plan from its open assignments without creating another.
+    """
+    monkeypatch.setattr(study_app.job_queue, "eager", True)
+    first_id, second_id, plan_a, plan_b = _make_plans(study_app, user)
+    logged_in_client.post(f"/assignment/complete/{first_id}")
+
+    response = logged_in_client.post(f"/study-plans/{plan_a}/refresh")
+
+    assert response.status_code == 302
+    assert "/jobs/" in response.headers["Location"]
+    with study_app.app.app_context():
+        plan = study_app.db.session.get(study_app.StudyPlan, plan_a)
+        assert not plan.is_stale
+        assert plan.content != "<p>A</p>"
+        assert [a.id for a in plan.assignments] == [second_id]
+        assert study_app.db.session.get(study_app.StudyPlan, plan_b).content == "<p>B</p>"
+        assert study_app.StudyPlan.query.count() == 2
+
+
+def test_excerpt_is_stored_as_plain_text_on_write(study_app, user):
+    """
+    Verifies setting content fills a tag-stripped, truncated excerpt.
+    """
+    with study_app.app.app_context():
+        plan = study_app.StudyPlan(content="<h2>Plan</h2><p>Read &amp; review " + "x" * 300 + "</p>", user_id=user)
+        assert plan.excerpt.startswith("Plan Read & review xxx")
+        assert len(plan.excerpt) == 203 and plan.excerpt.endswith("...")
+
+        plan.content = "<p>short</p>"
+        assert plan.excerpt == "short"
+
+
+def test_progress_lists_plans_without_loading_content(study_app, logged_in_client, user):
+    """
+    Verifies the progress page shows excerpts and never selects the content column.
+    """
+    _, _, plan_a, _ = _make_plans(study_app, user)
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with study_app.app.app_context():
+        engine = study_app.db.engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        page = logged_in_client.get("/progress")
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert f"/study-plans/{plan_a}".encode() in page.data
+    assert not [s for s in statements if "study_plan.content" in s]
+
+    detail = logged_in_client.get(f"/study-plans/{plan_a}")
+    assert b"<p>A</p>" in detail.data and b"Essay" in detail.data
+
+
+def test_study_plan_detail_is_scoped_to_its_owner(study_app, logged_in_client, user):
+    """
+    Verifies other users get a 404 for someone else's plan.
+    """
+    with study_app.app.app_context():
+        plan = study_app.StudyPlan(content="<p>private</p>", user_id=user + 1)
+        study_app.db.session.add(plan)
+        study_app.db.session.commit()
+        plan_id = plan.id
+    assert logged_in_client.get(f"/study-plans/{plan_id}").status_code == 404
@@ -0,0 +1,91 @@
+"""
+File: test_user_cache.py
+Description:
+    Unit tests for the Flask-Login identity cache.
+"""
+
+from sqlalchemy import event
+
+from identity_cache import IdentityCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_the_ttl():
+    """
+    Verifies a value is reused within the TTL and reloaded after it.
+    """
+    clock = FakeClock()
+    cache = IdentityCache(ttl=30, clock=clock)
+    loads = []
+
+    def load(key):
+        loads.append(key)
+        return f"user {key}"
+
+    assert cache.get(1, load) == cache.get(1, load) == "user 1"
+    clock.now = 31
+    cache.get(1, load)
+    assert loads == [1, 1]
+    assert cache.stats()["hits"] == 1
+
+
+def test_missing_users_are_not_cached_and_size_is_bounded():
+    """
+    Verifies None is never remembered and the LRU drops the oldest entry.
+    """
+    cache = IdentityCache(ttl=30, max_items=2)
+    assert cache.get(1, lambda key: None) is None
+    for key in (1, 2, 3):
+        cache.get(key, str)
+    assert cache.stats()["items"] == 2
+    assert cache.get(1, lambda key: "reloaded") == "reloaded"
+
+
+def _count_user_selects(study_app, func):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        # identity loads select the whole row (the data version lookup only one column)
+        if statement.lstrip().upper().startswith("SELECT") and "user.username" in statement:
+            statements.append(statement)
+
+    with study_app.app.app_context():
+        engine = study_app.db.engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        func()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return len(statements)
+
+
+def test_authenticated_requests_reuse_the_cached_user(study_app, logged_in_client, user):
+    """
+    Verifies only the first request after login reads the user row.
+    """
+    def visit():
+        for _ in range(3):
+            assert logged_in_client.get("/dashboard").status_code == 200
+
+    study_app.user_cache.clear()
+    assert _count_user_selects(study_app, visit) == 1
+    assert b"student" in logged_in_client.get("/dashboard").data
+
+
+def test_updating_a_user_invalidates_the_cache(study_app, logged_in_client, user):
+    """
+    Verifies a change made through the ORM is visible on the next request.
+    """
+    logged_in_client.get("/dashboard")
+    with study_app.app.app_context():
+        study_app.db.session.get(study_app.User, user).username = "renamed"
+        study_app.db.session.commit()
+
+    assert b"renamed" in logged_in_client.get("/dashboard").data
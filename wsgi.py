@@ -0,0 +1,33 @@
+"""
+File: wsgi.py
+Description:
+    WSGI entry point for the single-file application in app.py.
+    The app/ package shadows app.py on a normal import, so the module
+    is loaded by path and registered under the name ``study_app``.
+"""
+
+import importlib.util
+import os
+import sys
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+
+def load_study_app():
+    """
+    Loads app.py once per process.
+
+    Returns:
+        module: The app.py module (Flask app, db, models, routes)
+    """
+    module = sys.modules.get("study_app")
+    if module is None:
+        spec = importlib.util.spec_from_file_location("study_app", APP_PATH)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["study_app"] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+study_app = load_study_app()
+app = study_app.app